@@ -4,6 +4,7 @@ from __future__ import annotations
 from typing import Any
 
 from autofw.api_client import APIClient
+from autofw.utils.async_api_client import AsyncAPIClient
 
 
 class EchoService:
@@ -33,3 +34,18 @@ class EchoService:
         同样要记得 return。
         """
         return self.client.post("/post", json=json_body)
+
+
+class AsyncEchoService:
+    """
+    EchoService 的 asyncio 版本：接口一样，只是方法都要 await。
+    """
+
+    def __init__(self, client: AsyncAPIClient) -> None:
+        self.client = client
+
+    async def get_with_params(self, params: dict[str, Any]):
+        return await self.client.get("/get", params=params)
+
+    async def post_json(self, json_body: dict[str, Any]):
+        return await self.client.post("/post", json=json_body)
@@ -1,11 +1,50 @@
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
 from typing import Any
 
 from autofw.api_client import APIClient
+from autofw.utils.async_api_client import AsyncAPIClient
 from autofw.utils.db import PG
 
+# ------------------ DB 副作用：同步 / 异步 service 共用同一份 SQL ------------------ #
+
+def _fetch_user(pg: PG, username: str) -> dict[str, Any] | None:
+    return pg.fetchone(
+        "SELECT username, email, status FROM users WHERE username=%s;",
+        (username,),
+    )
+
+
+def _upsert_user(pg: PG, username: str, email: str, status: str) -> dict[str, Any] | None:
+    # simulate persistence side effect
+    pg.execute(
+        """
+        INSERT INTO users(username, email, status)
+        values (%s, %s, %s)
+        ON CONFLICT (username)
+        DO UPDATE SET
+            email = EXCLUDED.email,
+            status = EXCLUDED.status,
+            update_at = NOW();
+        """,
+        (username, email, status),
+    )
+    return _fetch_user(pg, username)
+
+
+def _update_user_status(pg: PG, username: str, new_status: str) -> dict[str, Any] | None:
+    pg.execute(
+        """
+        UPDATE users
+        SET status=%s, update_at=NOW()
+        WHERE username=%s;
+        """,
+        (new_status, username),
+    )
+    return _fetch_user(pg, username)
+
 
 @dataclass
 class UserService:
@@ -61,24 +100,7 @@ class UserService:
         if resp.status_code != 200:
             raise AssertionError(f"create_user failed, status={resp.status_code}")
 
-        # simulate persistence side effect
-        self.pg.execute(
-            """
-            INSERT INTO users(username, email, status)
-            values (%s, %s, %s)
-            ON CONFLICT (username)
-            DO UPDATE SET
-                email = EXCLUDED.email,
-                status = EXCLUDED.status,
-                update_at = NOW();
-            """,
-            (username, email, status),
-        )
-
-        row = self.pg.fetchone(
-            "SELECT username, email, status FROM users WHERE username=%s;",
-            (username,),
-        )
+        row = _upsert_user(self.pg, username, email, status)
         return resp, row
 
     def get_user(
@@ -97,10 +119,7 @@ class UserService:
         if resp.status_code != 200:
             raise AssertionError(f"get_user failed, status={resp.status_code}")
 
-        row = self.pg.fetchone(
-            "SELECT username,email,status from users WHERE username=%s;",
-            (username,),
-        )
+        row = _fetch_user(self.pg, username)
         return resp, row
 
     def update_user_status(
@@ -126,17 +145,101 @@ class UserService:
                 f"update_user_status failed, status={resp.status_code}"
             )
 
-        self.pg.execute(
-            """
-            UPDATE users
-            SET status=%s, update_at=NOW()
-            WHERE username=%s;
-            """,
-            (new_status, username),
+        row = _update_user_status(self.pg, username, new_status)
+        return resp, row
+
+
+@dataclass
+class AsyncUserService:
+    """
+    UserService 的 asyncio 版本：
+
+    - HTTP 走 AsyncAPIClient（await，不占线程）
+    - token 通过请求级 headers 传入，直接复用同一个连接池
+    - PG 仍是同步 psycopg2：和 UserService 共用同一组 _upsert_user / _fetch_user 等函数，
+      放到 asyncio.to_thread 里跑，避免卡住事件循环，SQL 也只有一份
+    """
+
+    client: AsyncAPIClient
+    pg: PG
+
+    async def login(self, username: str, password: str) -> str:
+        resp = await self.client.post(
+            "/post",
+            json={"username": username, "password": password},
         )
+        if resp.status_code != 200:
+            raise AssertionError(f"login failed, status={resp.status_code}")
 
-        row = self.pg.fetchone(
-            "SELECT username, email, status FROM users WHERE username=%s;",
-            (username,),
+        return f"demo-token-{username}"
+
+    def _auth_headers(self, token: str) -> dict[str, str]:
+        return {"Authorization": f"Bearer {token}"}
+
+    async def create_user(
+            self,
+            token: str,
+            *,
+            username: str,
+            email: str,
+            status: str = "active",
+    ) -> tuple[Any, dict[str, Any] | None]:
+        resp = await self.client.post(
+            "/post",
+            json={
+                "action": "create_user",
+                "username": username,
+                "email": email,
+                "status": status,
+            },
+            headers=self._auth_headers(token),
         )
+
+        if resp.status_code != 200:
+            raise AssertionError(f"create_user failed, status={resp.status_code}")
+
+        row = await asyncio.to_thread(_upsert_user, self.pg, username, email, status)
+        return resp, row
+
+    async def get_user(
+            self,
+            token: str,
+            *,
+            username: str
+    ) -> tuple[Any, dict[str, Any] | None]:
+        resp = await self.client.get(
+            "/get",
+            params={"action": "get_user", "username": username},
+            headers=self._auth_headers(token),
+        )
+
+        if resp.status_code != 200:
+            raise AssertionError(f"get_user failed, status={resp.status_code}")
+
+        row = await asyncio.to_thread(_fetch_user, self.pg, username)
+        return resp, row
+
+    async def update_user_status(
+            self,
+            token: str,
+            *,
+            username: str,
+            new_status: str,
+    ) -> tuple[Any, dict[str, Any] | None]:
+        resp = await self.client.post(
+            "/post",
+            json={
+                "action": "update_user_status",
+                "username": username,
+                "status": new_status,
+            },
+            headers=self._auth_headers(token),
+        )
+
+        if resp.status_code != 200:
+            raise AssertionError(
+                f"update_user_status failed, status={resp.status_code}"
+            )
+
+        row = await asyncio.to_thread(_update_user_status, self.pg, username, new_status)
         return resp, row
@@ -2,14 +2,32 @@
 
 from __future__ import annotations
 
+import logging
 import time
 import uuid
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Protocol
+from urllib.parse import urlsplit
 
 import requests
 
+from autofw.utils.cassette import Cassette, CassetteAdapter, CassetteMissError
+from autofw.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from autofw.utils.dns_cache import DNSCache
+from autofw.utils.h2_adapter import HTTP2Adapter
+from autofw.utils.hedging import HedgePolicy
+from autofw.utils.http_pool import PooledHTTPAdapter
+from autofw.utils.json_codec import CodecSession, JSONCodec, get_codec
 from autofw.utils.logger_helper import get_logger  # ✅ 建议用绝对导入
+from autofw.utils.memo_response import memoize
+from autofw.utils.metrics import MetricsRegistry
+from autofw.utils.rate_limiter import RateLimiter
+from autofw.utils.response_cache import ResponseCache
+from autofw.utils.retry_policy import JITTER_MODES, RetryBudget, compute_backoff, parse_retry_after
+from autofw.utils.streaming import StreamedResponse
+from autofw.utils.timing import RequestTiming, begin_timing, end_timing
 
 logger = get_logger("autofw.api_client")  # ✅ 全局 logger
 
@@ -19,6 +37,67 @@ logger = get_logger("autofw.api_client")  # ✅ 全局 logger
 #     return base * (2 ** (attempt - 1))
 
 
+@dataclass
+class BatchResult:
+    """
+    map()/gather() 的单条结果：失败不抛异常，而是放在 error 里当“值”返回。
+    """
+
+    spec: Mapping[str, Any]
+    response: Any = None
+    error: BaseException | None = None
+    elapsed_ms: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class _LazyKwargs:
+    """
+    [REQ] 日志里的 kwargs：真正格式化时才做脱敏 + repr + 截断。
+    日志级别不够 / handler 过滤掉时，这些开销一分都不花。
+    """
+
+    __slots__ = ("kwargs", "redact", "limit")
+
+    def __init__(self, kwargs: dict[str, Any], redact: Any, limit: int) -> None:
+        self.kwargs = kwargs
+        self.redact = redact
+        self.limit = limit
+
+    def __str__(self) -> str:
+        text = repr({**self.kwargs, "headers": self.redact(self.kwargs.get("headers") or {})})
+        if self.limit > 0 and len(text) > self.limit:
+            return f"{text[:self.limit]}...<truncated {len(text) - self.limit} chars>"
+        return text
+
+
+LOG_MODES = ("full", "compact", "off")
+# http1: requests/urllib3 连接池；http2: HTTP/2（https 走 ALPN 协商）；h2c: 明文 HTTP/2（prior knowledge）
+TRANSPORTS = ("http1", "http2", "h2c")
+
+
+class Sender(Protocol):
+    """单次请求的发送方：和 requests.Session.request 同签名（Session 本身就满足）。内存实现见 mock_transport"""
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response: ...
+
+
+def _close_quietly(fut: Any) -> None:
+    """对冲输掉的那份请求：结束后把响应关掉，连接还回池子"""
+    if not fut.cancelled() and fut.exception() is None:
+        fut.result().close()
+
+
+def _split_spec(spec: Mapping[str, Any]) -> tuple[str, str, dict[str, Any]]:
+    """把 {"method": ..., "path": ..., 其余 kwargs} 拆成 _request 的参数"""
+    kwargs = dict(spec)
+    method = str(kwargs.pop("method", "GET")).upper()
+    path = kwargs.pop("path")
+    return method, path, kwargs
+
+
 @dataclass
 class APIClient:
     """
@@ -27,7 +106,7 @@ class APIClient:
     - 负责拼接 base_url + path
     - 统一设置 timeout
     - 封装 get / post
-    - 支持 with_headers 克隆一个带额外 headers 的客户端
+    - 支持 with_headers 派生一个带额外 headers 的客户端（共享连接池）
     """
 
     base_url: str  # 例如: "https://postman-echo.com"
@@ -42,8 +121,62 @@ class APIClient:
         requests.exceptions.ConnectionError,
     )
 
-    session: requests.Session = field(default_factory=requests.Session)
-    ...
+    # 重试升级：jitter（none / full / decorrelated）+ 退避上限
+    jitter: str = "none"
+    backoff_max: float = 30.0
+    # 429/503 带 Retry-After 时按服务端要求等待（最多等 retry_after_max 秒）
+    retry_after_statuses: tuple[int, ...] = (429, 503)
+    retry_after_max: float = 60.0
+    # 客户端级重试预算（None = 不限制）；with_headers 派生出来的 client 共用同一个预算
+    retry_budget: RetryBudget | None = None
+    # 按 host 熔断（None = 不熔断）；打开后直接抛 CircuitOpenError，不再等超时
+    circuit_breaker: CircuitBreaker | None = None
+    # 客户端限速（None = 不限速）；每次 attempt 前先拿名额，等待时间记在 resp.throttled_ms
+    rate_limiter: RateLimiter | None = None
+    # GET 对冲请求（None = 不对冲）：主请求超过 delay 还没回来就再发一份，谁先成功用谁
+    hedge: HedgePolicy | None = None
+    # 每个 attempt 结束后回调一次分阶段耗时（dns/connect/tls/ttfb/download），给指标收集用
+    timing_hook: Callable[[RequestTiming], None] | None = None
+    # 延迟直方图 + 计数；None（默认）= 不记。传 get_registry() 记到进程级 registry（session 结束写 reports/metrics.*）
+    metrics: MetricsRegistry | None = None
+
+    # 连接池：每个 host 最多保留 pool_maxsize 条连接；pool_block=True 时池子用完就排队等
+    pool_connections: int = 10
+    pool_maxsize: int = 10
+    pool_block: bool = False
+    # 建连用的 DNS 缓存（None = 每次新建连接都解析）；多个 client 可以共用 get_dns_cache()
+    dns_cache: DNSCache | None = None
+    # 传输层：http2 / h2c 时一个 host 的并发请求在同一条连接上多路复用（pool_maxsize = 最多连接数）
+    transport: str = "http1"
+    # 录制 / 回放（见 autofw.utils.cassette）；None = 直接打真实网络
+    cassette: Cassette | None = None
+
+    # CodecSession = requests.Session + json= 请求体走 json_codec 编码
+    session: requests.Session = field(default_factory=CodecSession)
+    # 单次请求交给谁发（None = self.session）；mock 用例传 MockTransport，不经过 requests 的 adapter
+    sender: Sender | None = None
+    # 退避 / 限速等待用的 sleep（None = time.sleep）；mock 用例传 VirtualClock().sleep
+    sleep: Callable[[float], None] | None = None
+
+    # with_headers 派生出来的 client 用：每次请求叠加到 headers 上，不改 session
+    extra_headers: dict[str, str] = field(default_factory=dict)
+
+    # GET 响应缓存：默认 None = 不缓存；需要时传 ResponseCache(...) 打开
+    cache: ResponseCache | None = None
+
+    # 请求日志：
+    # - full: [REQ] + [RESP] 两行（默认，排查问题用）
+    # - compact: 每个请求只在结束时打一行（压测 / 大批量用）
+    # - off: 不打 INFO 级请求日志（重试 / 错误的 WARNING 仍然保留）
+    log_mode: str = "full"
+    log_body_max: int = 1024  # [REQ] 行里 kwargs 最多打多少字符，<=0 不截断
+
+    # stream() 默认的响应体上限（字节），None = 不限制
+    stream_max_bytes: int | None = 64 * 1024 * 1024
+
+    # json= 请求体编码 + resp.json() 解析用的编解码器（有 orjson 默认用 orjson）
+    # 请求体编码发生在 CodecSession.prepare_request 里；自己传普通 requests.Session 时只加速解析
+    json_codec: JSONCodec = field(default_factory=get_codec)
 
     # 默认请求头（可以按需扩展）
     default_headers: dict[str, str] = field(
@@ -60,6 +193,13 @@ class APIClient:
         - 关闭 requests 的环境代理读取
         - 给 session 设置默认请求头
         """
+        if self.log_mode not in LOG_MODES:
+            raise ValueError(f"log_mode must be one of {LOG_MODES}, got {self.log_mode!r}")
+        if self.jitter not in JITTER_MODES:
+            raise ValueError(f"jitter must be one of {JITTER_MODES}, got {self.jitter!r}")
+        if self.transport not in TRANSPORTS:
+            raise ValueError(f"transport must be one of {TRANSPORTS}, got {self.transport!r}")
+
         # 1）规范 base_url
         if self.base_url.endswith("/"):
             self.base_url = self.base_url[:-1]
@@ -72,6 +212,33 @@ class APIClient:
         # 3）设置默认头
         self.session.headers.update(self.default_headers)
 
+        # 4）挂上带统计的连接池适配器（或 HTTP/2 adapter）
+        #    共享 session 的 client（with_headers / network_client）不重复挂，避免把现有连接池扔掉；
+        #    http1 只替换 requests 自带的默认 HTTPAdapter，别人挂好的（HTTP/2、自定义 adapter）原样保留
+        #    有 sender 时请求根本不经过 session，不用挂
+        if self.sender is None and self.transport != "http1":
+            if not isinstance(self._transport_adapter(), HTTP2Adapter):
+                self._mount_transport(
+                    HTTP2Adapter(max_connections=self.pool_maxsize, prior_knowledge=self.transport == "h2c"))
+        elif self.sender is None and type(self._transport_adapter()) is requests.adapters.HTTPAdapter:
+            self._mount_transport(PooledHTTPAdapter(
+                pool_connections=self.pool_connections,
+                pool_maxsize=self.pool_maxsize,
+                pool_block=self.pool_block,
+                dns_cache=self.dns_cache,
+            ))
+
+        # 5）录制 / 回放：在传输层 adapter 外面再包一层（已经包过的不重复包）
+        if self.cassette is not None and self.sender is None:
+            for prefix in ("https://", "http://"):
+                current = self.session.get_adapter(prefix)
+                if not isinstance(current, CassetteAdapter):
+                    self.session.mount(prefix, CassetteAdapter(self.cassette, current))
+
+        # 6）请求体编码用同一个 codec（共享 session 的 client 以最后设置的为准）
+        if isinstance(self.session, CodecSession):
+            self.session.json_codec = self.json_codec
+
         # retry = Retry(
         #     total=3,
         #     connect=3,
@@ -111,14 +278,72 @@ class APIClient:
                 safe[k] = "***REDACTED***"
         return safe
 
-    def _sleep_seconds(self, attempt: int, backoff: float) -> float:
+    def _sleep_seconds(self, attempt: int, backoff: float, prev_sleep: float = 0.0) -> float:
         """
         退避策略：指数退避（可面试解释）
         第 1 次重试 sleep backoff
         第 2 次重试 sleep backoff * 2
         ...
+        jitter=full / decorrelated 时在此基础上加随机，最多 backoff_max 秒
         """
-        return backoff * (2 ** (attempt - 1))
+        return compute_backoff(attempt, backoff, jitter=self.jitter, prev_sleep=prev_sleep, cap=self.backoff_max)
+
+    def _retry_after_seconds(self, resp: requests.Response) -> float | None:
+        """429/503 的 Retry-After（秒），没有 / 解析不了返回 None"""
+        if resp.status_code not in self.retry_after_statuses:
+            return None
+        seconds = parse_retry_after(resp.headers.get("Retry-After"))
+        if seconds is None:
+            return None
+        return min(seconds, self.retry_after_max)
+
+    def _allow_retry(self, req_id: str, method: str, url: str) -> bool:
+        """重试前先问预算要令牌；预算用完就不再重试"""
+        if self.retry_budget is None or self.retry_budget.try_spend():
+            return True
+        logger.warning("[RETRY-DENIED %s] %s %s retry budget exhausted", req_id, method.upper(), url)
+        return False
+
+    def _send(self, method: str, url: str, host: str, **kwargs: Any) -> requests.Response:
+        """真正发一次请求（单次 attempt）；开了熔断就顺便把结果记到熔断器里"""
+        send = self.session.request if self.sender is None else self.sender.request
+        breaker = self.circuit_breaker
+        if breaker is None:
+            return send(method, url, **kwargs)
+        try:
+            resp = send(method, url, **kwargs)
+        except BaseException as e:
+            # 只有传输层错误算 host 失败；CassetteMissError / NoRouteError / KeyboardInterrupt 等不算
+            if isinstance(e, requests.RequestException) and not isinstance(e, CassetteMissError):
+                breaker.record(host, success=False)
+            else:
+                breaker.release(host)
+            raise
+        breaker.record(host, success=resp.status_code not in breaker.failure_statuses)
+        return resp
+
+    def _timed_send(self, method: str, url: str, host: str, timing: RequestTiming, **kwargs: Any) -> requests.Response:
+        """_send + 分阶段计时：连接层往 timing 里写时间点，这里收尾并交给 timing_hook"""
+        start = time.perf_counter()
+        try:
+            resp = self._send(method, url, host, **kwargs)
+        except BaseException as e:
+            timing.error = type(e).__name__
+            end_timing(timing, start)
+            self._emit_timing(timing)
+            raise
+        timing.status = resp.status_code
+        end_timing(timing, start)
+        self._emit_timing(timing)
+        return resp
+
+    def _emit_timing(self, timing: RequestTiming) -> None:
+        if self.timing_hook is None:
+            return
+        try:
+            self.timing_hook(timing)
+        except Exception:  # noqa: BLE001  指标回调出错不能影响请求本身
+            logger.warning("timing_hook failed for %s %s", timing.method, timing.url, exc_info=True)
 
     # ✅ Day19 核心：统一请求入口
     def _request(self,
@@ -141,66 +366,235 @@ class APIClient:
         _retry_exceptions = self.retry_exceptions if retry_exceptions is None else retry_exceptions
         _timeout = self.timeout if timeout is None else timeout
 
-        # 日志（脱敏 headers）
-        safe_headers = self._redact_headers(kwargs.get("headers") or {})
-        logger.info("[REQ %s] %s %s kwargs=%s", req_id, method, url, {**kwargs, "headers": safe_headers})
+        # with_headers 叠加的头：请求级传入的 headers 优先
+        if self.extra_headers:
+            kwargs["headers"] = {**self.extra_headers, **(kwargs.get("headers") or {})}
+
+        # 日志：先按级别 + log_mode 判断要不要打，kwargs 的脱敏/格式化延迟到真正输出时
+        info_on = self.log_mode != "off" and logger.isEnabledFor(logging.INFO)
+        log_full = info_on and self.log_mode == "full"
+        log_compact = info_on and self.log_mode == "compact"
+        if log_full:
+            logger.info("[REQ %s] %s %s kwargs=%s", req_id, method, url,
+                        _LazyKwargs(kwargs, self._redact_headers, self.log_body_max))
+        req_start = time.perf_counter()
 
         # # 统一 timeout：不让外面随便覆盖（你也可以允许覆盖，看你习惯）
         # kwargs.pop("timeout", None)
 
         max_attempts = 1 + max(0, int(_retries))  # 首次 + retries 次
         last_exc: BaseException | None = None
+        prev_sleep = 0.0
+
+        if self.retry_budget is not None:
+            self.retry_budget.record_request()
+
+        breaker = self.circuit_breaker
+        limiter = self.rate_limiter
+        split = urlsplit(url) if (breaker is not None or limiter is not None) else None
+        host = split.netloc if split is not None else ""
+        throttled_s = 0.0
+        timings: list[RequestTiming] = []
+
+        metrics = self.metrics
+        # 每次请求时再取 time.sleep：monkeypatch(time, "sleep") 的老用例照样生效
+        sleep = self.sleep or time.sleep
+        attempt = 0
+        try:
+            for attempt in range(1, max_attempts + 1):
+                # logger.info("[REQ %s] %s %s attempt=%s/%s kwargs=%s",
+                #             req_id, method.upper(), url, attempt, max_attempts,
+                #             {k: kwargs.get(k) for k in ("params", "json", "data")})
+
+                if breaker is not None:
+                    try:
+                        breaker.before_call(host)
+                    except CircuitOpenError as e:
+                        logger.warning("[CIRCUIT-OPEN %s] %s %s %s", req_id, method.upper(), url, e)
+                        raise
+
+                if limiter is not None:
+                    wait_s = limiter.reserve(split.path)
+                    if wait_s > 0:
+                        throttled_s += wait_s
+                        sleep(wait_s)
+
+                start = time.perf_counter()
+                timing = begin_timing(method, url, attempt)
+                timings.append(timing)
+                try:
+                    resp = self._timed_send(method, url, host, timing, timeout=_timeout, **kwargs)
+                    if log_full:
+                        logger.info("[RESP %s] %s %s status=%s elapsed_ms=%s", req_id, method, url, resp.status_code,
+                                    int(timing.total_ms))
+
+                    # 响应到手：判断是否需要按状态码重试
+                    if (resp.status_code in _retry_statuses and attempt < max_attempts
+                            and self._allow_retry(req_id, method, url)):
+                        retry_after = self._retry_after_seconds(resp)
+                        sleep_s = self._sleep_seconds(attempt, _backoff, prev_sleep) if retry_after is None else retry_after
+                        prev_sleep = sleep_s
+                        logger.warning("[RETRY %s] %s %s status=%s attempt=%s/%s sleep=%.2fs", req_id, method.upper(),
+                                       url, resp.status_code, attempt, max_attempts, sleep_s)
+                        # 丢弃的响应要关掉：stream=True 时不关连接就回不了池子
+                        resp.close()
+                        sleep(sleep_s)
+                        continue
+
+                    if limiter is not None:
+                        resp.throttled_ms = round(throttled_s * 1000, 3)
+                    # json() / text 只解码一次；peek(n) 给报错信息用
+                    resp = memoize(resp, self.json_codec)
+                    # 每个 attempt 的分阶段耗时；resp.timing 是最后（也就是这次响应）那一次
+                    resp.timings = timings
+                    resp.timing = timing
+                    if log_compact:
+                        logger.info("[REQ %s] %s %s status=%s attempts=%s elapsed_ms=%s", req_id, method, url,
+                                    resp.status_code, attempt, int((time.perf_counter() - req_start) * 1000))
+                    if metrics is not None:
+                        metrics.record(method, url, resp.status_code, time.perf_counter() - req_start, attempts=attempt)
+                    return resp
+
+                except _retry_exceptions as e:
+                    last_exc = e
+                    elapsed_ms = int((time.perf_counter() - start) * 1000)
+                    logger.warning("[ERR %s] %s %s exc=%s elapsed_ms=%s", req_id, method, url, type(e).__name__, elapsed_ms)
+
+                    if attempt >= max_attempts:
+                        logger.exception("[FAIL %s] %s %s retries_exhausted after %s attempts: %s", req_id, method.upper(), url, max_attempts, e)
+                        raise
+                    if not self._allow_retry(req_id, method, url):
+                        raise
+
+                    sleep_s = self._sleep_seconds(attempt, _backoff, prev_sleep)
+                    prev_sleep = sleep_s
+                    logger.info("[RETRY %s] %s exc=%s attempt=%s/%s sleep=%.2fs", req_id, method.upper(), type(e).__name__, attempt, max_attempts, sleep_s)
+                    sleep(sleep_s)
+
+            # 理论上不会走到这里
+            if last_exc:
+                raise last_exc
+            raise RuntimeError("_request() failed unexpectedly, retry loop exit")
+        except BaseException as e:
+            if metrics is not None:
+                metrics.record(method, url, type(e).__name__, time.perf_counter() - req_start,
+                               attempts=max(1, attempt), error=True)
+            raise
 
-        for attempt in range(1, max_attempts + 1):
-            # logger.info("[REQ %s] %s %s attempt=%s/%s kwargs=%s",
-            #             req_id, method.upper(), url, attempt, max_attempts,
-            #             {k: kwargs.get(k) for k in ("params", "json", "data")})
+    def get(
+            self,
+            path: str,
+            params: dict[str, Any] | None = None,
+            *,
+            use_cache: bool | None = None,
+            hedge: bool | None = None,
+            **kwargs: Any
+    ) -> requests.Response:
+        """
+        use_cache:
+        - None（默认）: client 配了 cache 就用，没配就直接请求
+        - False: 本次强制不走缓存（需要最新数据的用例用这个）
+        - True: 本次必须走缓存（client 没配 cache 会报错）
 
-            start = time.perf_counter()
-            try:
-                resp = self.session.request(method, url, timeout=_timeout, **kwargs)
-                elapsed_ms = int((time.perf_counter() - start) * 1000)
-                logger.info("[RESP %s] %s %s status=%s elapsed_ms=%s", req_id, method, url, resp.status_code,
-                            elapsed_ms)
-
-                # 响应到手：判断是否需要按状态码重试
-                if resp.status_code in _retry_statuses and attempt < max_attempts:
-                    sleep_s = self._sleep_seconds(attempt, _backoff)
-                    logger.warning("[RETRY %s] %S status=%s attempt=%s/%s sleep=%.2fs", req_id, method.upper(),
-                                   resp.status_code,
-                                   attempt, max_attempts,
-                                   sleep_s)
-                    time.sleep(sleep_s)
-                    continue
+        hedge: 同理，None 跟随 client 的 hedge 配置，False 本次不对冲，True 本次必须对冲
+        """
+        if hedge and self.hedge is None:
+            raise ValueError("hedge=True but this APIClient has no HedgePolicy configured")
+        use_hedge = hedge is not False and self.hedge is not None
 
-                logger.info("[RESP %s] %s %s status=%s", req_id, method.upper(), url, resp.status_code)
-                return resp
+        if use_cache is False or (use_cache is None and self.cache is None):
+            return self._get_uncached(path, params, use_hedge, **kwargs)
+        if self.cache is None:
+            raise ValueError("use_cache=True but this APIClient has no cache configured")
+        return self._cached_get(self.cache, path, params, use_hedge, **kwargs)
 
-            except _retry_exceptions as e:
-                last_exc = e
-                elapsed_ms = int((time.perf_counter() - start) * 1000)
-                logger.warning("[ERR %s] %s %s exc=%s elapsed_ms=%s", req_id, method, url, type(e).__name__, elapsed_ms)
+    def _get_uncached(
+            self,
+            path: str,
+            params: dict[str, Any] | None,
+            use_hedge: bool,
+            **kwargs: Any
+    ) -> requests.Response:
+        if use_hedge and self.hedge is not None:
+            return self._hedged_request(self.hedge, "GET", path, params=params, **kwargs)
+        return self._request("GET", path, params=params, **kwargs)
 
-                if attempt >= max_attempts:
-                    logger.exception("[FAIL %s] %s %s retries_exhausted after %s attempts: %s", req_id, method.upper(), url, max_attempts, e)
-                    raise
+    def _hedged_request(self, policy: HedgePolicy, method: str, path: str, **kwargs: Any) -> requests.Response:
+        """
+        主请求先发；delay 内没回来且预算允许，就再发一份对冲请求。
+        谁先成功返回谁，输掉的那份在后台跑完后关闭（释放连接）。
+        """
+        policy.record_request()
+        delay = policy.current_delay()
+        start = time.perf_counter()
+
+        if delay is None:
+            resp = self._request(method, path, **kwargs)
+            policy.record_latency(time.perf_counter() - start)
+            return resp
+
+        primary = policy.executor().submit(self._request, method, path, **kwargs)
+        # 主请求的真实耗时一律记下来（包括被对冲“打败”的情况），p95 才不会越估越小
+        primary.add_done_callback(lambda _f: policy.record_latency(time.perf_counter() - start))
+
+        done, _ = wait([primary], timeout=delay)
+        if done or not policy.try_hedge():
+            return primary.result()
+
+        logger.info("[HEDGE] %s %s primary slower than %.3fs, firing hedge", method, path, delay)
+        # 对冲请求走单独的线程池：主请求池被慢请求占满时也能立刻发出去
+        backup = policy.backup_executor().submit(self._request, method, path, **kwargs)
+        pending = {primary, backup}
+        last_exc: BaseException | None = None
 
-                sleep_s = self._sleep_seconds(attempt, _backoff)
-                logger.info("[RETRY %s] %s exc=%s attempt=%s/%s sleep=%.2fs", req_id, method.upper(), type(e).__name__, attempt, max_attempts, sleep_s)
-                time.sleep(sleep_s)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                exc = fut.exception()
+                if exc is not None:
+                    last_exc = exc
+                    continue
+                if fut is backup:
+                    policy.record_won()
+                for loser in pending:
+                    loser.add_done_callback(_close_quietly)
+                return fut.result()
 
-        # 理论上不会走到这里
         if last_exc:
             raise last_exc
-        raise RuntimeError("_request() failed unexpectedly, retry loop exit")
+        raise RuntimeError("_hedged_request() failed unexpectedly")
 
-    def get(
+    def _cached_get(
             self,
+            cache: ResponseCache,
             path: str,
-            params: dict[str, Any] | None = None,
+            params: dict[str, Any] | None,
+            use_hedge: bool,
             **kwargs: Any
     ) -> requests.Response:
-        return self._request("GET", path, params=params, **kwargs)
+        call_headers = kwargs.get("headers") or {}
+        vary_source = {**self.session.headers, **self.extra_headers, **call_headers}
+        key = cache.make_key("GET", self._full_url(path), params, vary_source)
+
+        entry, fresh = cache.lookup(key)
+        if entry is not None and fresh:
+            logger.info("[CACHE HIT] GET %s", key[1])
+            return entry.response
+
+        if entry is not None:
+            # 过期但有 ETag / Last-Modified：发条件请求
+            kwargs["headers"] = {**call_headers, **entry.validators()}
+
+        resp = self._get_uncached(path, params, use_hedge, **kwargs)
+
+        if resp.status_code == 304 and entry is not None:
+            refreshed = cache.refresh(key)
+            if refreshed is not None:
+                return refreshed.response
+            return entry.response
+
+        cache.store(key, resp)
+        return resp
 
     def post(
             self,
@@ -211,9 +605,67 @@ class APIClient:
     ) -> requests.Response:
         return self._request("POST", path, json=json, data=data, **kwargs)
 
+    def stream(
+            self,
+            method: str,
+            path: str,
+            *,
+            max_bytes: int | None = None,
+            chunk_size: int = 64 * 1024,
+            **kwargs: Any
+    ) -> StreamedResponse:
+        """
+        流式请求：响应头到了就返回，body 由调用方用 iter_bytes / iter_items 边读边处理。
+
+        - 重试 / 熔断 / 限速照常（只看状态码和连接错误，不读 body）
+        - 不走 cache / hedge
+        - max_bytes: 本次的响应体上限，不传用 client.stream_max_bytes
+        - 用完要 close()，推荐 with client.stream(...) as s:
+        """
+        resp = self._request(method.upper(), path, stream=True, **kwargs)
+        limit = self.stream_max_bytes if max_bytes is None else max_bytes
+        return StreamedResponse(resp, max_bytes=limit, chunk_size=chunk_size, codec=self.json_codec)
+
+    def map(
+            self,
+            specs: Iterable[Mapping[str, Any]],
+            *,
+            concurrency: int = 8,
+    ) -> list[BatchResult]:
+        """
+        并发批量请求，结果顺序和 specs 一一对应。
+
+        每个 spec 形如：
+            {"method": "GET", "path": "/get", "params": {...}, "retries": 0, "timeout": 5}
+        除 method/path 外的 key 原样传给 _request，所以请求级覆盖
+        （retries / backoff / retry_statuses / retry_exceptions / timeout）照样生效。
+
+        - concurrency: 同时在飞的请求数（线程池大小）；
+          建议不超过 pool_maxsize，否则多出来的连接用完会被丢弃
+        - 单条失败（异常）不会打断整批，放在 BatchResult.error 里返回
+        """
+        spec_list = list(specs)
+        if not spec_list:
+            return []
+
+        def _run(spec: Mapping[str, Any]) -> BatchResult:
+            start = time.perf_counter()
+            try:
+                method, path, kwargs = _split_spec(spec)
+                resp = self._request(method, path, **kwargs)
+                return BatchResult(spec=spec, response=resp,
+                                   elapsed_ms=int((time.perf_counter() - start) * 1000))
+            except Exception as e:  # noqa: BLE001  失败当成值返回
+                return BatchResult(spec=spec, error=e,
+                                   elapsed_ms=int((time.perf_counter() - start) * 1000))
+
+        workers = max(1, min(int(concurrency), len(spec_list)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="apiclient-map") as ex:
+            return list(ex.map(_run, spec_list))
+
     def with_headers(self, headers: dict[str, str]) -> APIClient:
         """
-        返回一个“克隆客户端”，在当前 client 的配置基础上，
+        返回一个“派生客户端”，在当前 client 的配置基础上，
         追加一些 headers，但不污染原来的 session.headers。
 
         用法示例：
@@ -221,21 +673,10 @@ class APIClient:
             resp = auth_client.get("/get")
 
         这里会：
-        - 新建一个 Session
-        - 合并 default_headers + 原 session.headers + 新传入的 headers
-        - 返回一个新的 APIClient 实例
+        - 复用当前 client 的 Session（同一个连接池，keep-alive 连接可以继续用）
+        - 额外 headers 放在 extra_headers 里，每次请求时叠加，不写进 session.headers
+        - 返回一个新的 APIClient 实例（创建成本很低，可以每个业务步骤都调）
         """
-        new_session = requests.Session()
-        new_session.trust_env = False  # 克隆出来的 client 也关闭代理
-
-        # 合并头信息（后面的覆盖前面的）
-        merged_headers: dict[str, str] = {}
-        merged_headers.update(self.default_headers)  # 默认头
-        merged_headers.update(self.session.headers)  # 当前 client 的头
-        merged_headers.update(headers)  # 新追加的头
-
-        new_session.headers.update(merged_headers)
-
         return APIClient(
             base_url=self.base_url,
             timeout=self.timeout,
@@ -243,5 +684,90 @@ class APIClient:
             backoff=self.backoff,
             retry_statuses=self.retry_statuses,
             retry_exceptions=self.retry_exceptions,
-            session=new_session,
+            jitter=self.jitter,
+            backoff_max=self.backoff_max,
+            retry_after_statuses=self.retry_after_statuses,
+            retry_after_max=self.retry_after_max,
+            retry_budget=self.retry_budget,
+            circuit_breaker=self.circuit_breaker,
+            rate_limiter=self.rate_limiter,
+            hedge=self.hedge,
+            timing_hook=self.timing_hook,
+            metrics=self.metrics,
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block,
+            dns_cache=self.dns_cache,
+            transport=self.transport,
+            cassette=self.cassette,
+            session=self.session,
+            sender=self.sender,
+            sleep=self.sleep,
+            default_headers=self.default_headers,
+            extra_headers={**self.extra_headers, **headers},
+            cache=self.cache,
+            log_mode=self.log_mode,
+            log_body_max=self.log_body_max,
+            stream_max_bytes=self.stream_max_bytes,
+            json_codec=self.json_codec,
         )
+
+    def warmup(self, connections: int = 1, timeout: float | None = None) -> int:
+        """
+        提前对 base_url 建好 connections 条 keep-alive 连接（DNS + TCP + TLS 都在这里做完），
+        第一个用例不用再付建连的开销，计时不再被首个请求拉偏。
+
+        - 最多 pool_maxsize 条（多出来的放不回池子）；返回实际新建的连接数
+        - 只对 http1 连接池生效；HTTP/2、有 sender、cassette replay 时直接返回 0
+        - 建连失败只记 WARNING 不抛：环境不通时让用例自己按原来的方式报错
+        """
+        adapter = self._transport_adapter() if self.sender is None else None
+        if not isinstance(adapter, PooledHTTPAdapter):
+            return 0
+        if self.cassette is not None and self.cassette.mode == "replay":
+            return 0
+        n = max(0, min(int(connections), self.pool_maxsize))
+        if n == 0:
+            return 0
+
+        request = requests.Request("GET", self.base_url + "/").prepare()
+        start = time.perf_counter()
+        try:
+            opened = adapter.warm(request, n, timeout=self.timeout if timeout is None else timeout,
+                                  verify=self.session.verify)
+        except Exception as e:  # noqa: BLE001  预热是锦上添花，失败不影响后面的请求
+            logger.warning("[WARMUP] %s failed: %s: %s", self.base_url, type(e).__name__, e)
+            return 0
+        logger.info("[WARMUP] %s opened=%s elapsed_ms=%s", self.base_url, opened,
+                    int((time.perf_counter() - start) * 1000))
+        return opened
+
+    def _mount_transport(self, adapter: Any) -> None:
+        """换传输层 adapter；外面已经包了 CassetteAdapter 的只换里面那层，录制 / 回放不丢"""
+        for prefix in ("https://", "http://"):
+            current = self.session.get_adapter(prefix)
+            if isinstance(current, CassetteAdapter):
+                current.inner = adapter
+            else:
+                self.session.mount(prefix, adapter)
+
+    def _transport_adapter(self) -> Any:
+        """session 上真正负责发请求的 adapter（透过 CassetteAdapter 那一层）"""
+        adapter = self.session.get_adapter("https://")
+        return adapter.inner if isinstance(adapter, CassetteAdapter) else adapter
+
+    def connection_stats(self) -> dict[str, Any]:
+        """
+        连接池统计（共享同一个 Session 的 client 看到的是同一份数据）：
+
+        - requests: 从连接池取连接的次数
+        - connections_opened: 新建 TCP 连接的次数
+        - connections_reused: 复用 keep-alive 连接的次数
+        - connections_discarded: 池子满了 / 出错后被关闭丢弃的连接数
+        - connections_warmed: warmup() 提前建好的连接数
+        - pool_wait_ms_total / pool_wait_ms_max: 等待可用连接的耗时（pool_block=True 时才会明显）
+        """
+        adapter = self._transport_adapter()
+        if not isinstance(adapter, PooledHTTPAdapter):
+            return {}
+        return adapter.stats.snapshot()
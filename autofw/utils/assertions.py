@@ -1,16 +1,29 @@
 """
 autofw/utils/assertions.py
 
-这里放的是：在接口自动化里可以复用的“断言工具函数”。
-
-目前有两个：
-1. assert_status_code  —— 统一断言 HTTP 状态码
-2. assert_dict_contains —— 断言“实际结果至少包含期望子集”（支持嵌套 dict）
+这里放的是：在接口自动化里可以复用的“断言工具函数”，按用途分几组：
+
+- 基础：assert_status_code（HTTP 状态码）/ assert_dict_contains（实际结果至少包含期望子集，
+  支持嵌套 dict / 列表模式，见 autofw.utils.subset）/ assert_list_length（列表长度）
+- 路径（点号路径 + 通配 / 切片 / 过滤，见 autofw.utils.json_path）：
+  assert_json_value / assert_each_value / assert_path_count
+- JSON Schema（schema 放 data/schemas/，编译结果有缓存，见 autofw.utils.json_schema）：
+  assert_json_schema
+- 列式（大列表记录，NumPy 可选，见 autofw.utils.columns）：assert_column_unique / assert_column_sorted /
+  assert_column_in_range / assert_column_in / assert_column_aggregate，失败时列出前 N 个不满足的行号
+- 流式响应（StreamedResponse）：assert_each_item_contains / assert_any_item_contains / assert_stream_length，
+  一边读一边断言
+
+这些函数第一个失败就抛 AssertionError；想把一个用例的所有期望都查完再一起报，
+用 autofw.utils.soft_assertions（SoftAssertions / check_case）。
 """
 
 from __future__ import annotations
 
+import math
+import os
 from collections.abc import (  # Any 表示“任意类型”，方便做通用工具
+    Iterable,
     Mapping,  # Mapping 是“映射类型”接口，dict 就实现了 Mapping
     Sequence,
     Sized,
@@ -19,6 +32,12 @@ from typing import Any
 
 from requests import Response  # requests.Response，用于类型标注
 
+from autofw.utils.columns import ColumnSet, as_column_set
+from autofw.utils.json_path import compile_path
+from autofw.utils.json_schema import load_schema
+from autofw.utils.memo_response import body_snippet
+from autofw.utils.subset import find_mismatches
+
 
 def assert_status_code(resp: Response, expected_status: int) -> None:
     """
@@ -35,13 +54,12 @@ def assert_status_code(resp: Response, expected_status: int) -> None:
     actual_status = resp.status_code
 
     if actual_status != expected_status:
-        # 尝试拿一小段 body，方便排查
+        # 拿一小段 body 方便排查：只解码前 200 个字符，不把整个大响应解码一遍
         try:
-            content = resp.text
+            snippet = body_snippet(resp, 200)
         except Exception:
-            content = "<no text>"
+            snippet = "<no text>"
 
-        snippet = (content or "")[:200]
         raise AssertionError(
             f"状态码不匹配：actual={actual_status}, expected={expected_status}, "
             f"actual={actual_status}, body_snippet={snippet!r}"
@@ -51,12 +69,15 @@ def assert_status_code(resp: Response, expected_status: int) -> None:
 def _assert_dict_contains(
         actual: Mapping[str, Any],
         expected: Mapping[str, Any],
-        path: str = "") -> None:
+        path: str = "",
+        list_mode: str = "equal",
+        max_failures: int = 1) -> None:
     """
-    递归判断 actual 是否“包含” expected_subset 这个子集。
+    判断 actual 是否“包含” expected_subset 这个子集。
 
     - key 必须存在
-    - 如果 value 是 dict，则递归检查
+    - 如果 value 是 dict，则继续往里检查（子集）
+    - list 按 list_mode 比较（见 autofw.utils.subset）
     - 否则做相等判断
     断言“actual 至少包含 expected_subset 中的所有键值对”。
 
@@ -72,11 +93,14 @@ def _assert_dict_contains(
         比如：
         actual = {"json": {"username": "day10_user", "password": "123"}}
         expected_subset = {"json": {"username": "day10_user"}}
-      也会通过（对 json 这个子 dict 再递归比较）
+      也会通过（对 json 这个子 dict 再往里比较）
+    - 用显式栈而不是递归：嵌套再深也不会 RecursionError；报错里的值会截断
 
     参数：
     - actual: 实际返回体（通常是 resp.json() 得到的 dict）
     - expected_subset: 期望“子集”，只写自己关心的那部分内容
+    - list_mode: equal（默认，列表完全相等）/ ordered / prefix / contains
+    - max_failures: 最多收集几处不一致再报错（默认 1 = 第一处就报）
     """
 
     # 1. 类型检查 —— 提前发现把奇怪的类型传进来的问题
@@ -87,108 +111,55 @@ def _assert_dict_contains(
         f"expected_subset 必须是 dict / Mapping，当前类型: {type(expected)}"
     )
 
-    # 2. 遍历“期望子集”中的所有 key / value
-    for key, expected_value in expected.items():
-        current_path = f"{path}.{key}" if path else key
-
-        # 2.1 先确保 key 至少在 actual 里存在
-        if key not in actual:
-            raise AssertionError(
-                f"Key {current_path} missing in actual dict")
-
-        # 2.2 拿到 actual 中对应 key 的真实值
-        actual_value = actual[key]
-
-        # 2.3 如果“期望值”和“实际值”都是 dict / Mapping，
-        #     那么说明这是一个“嵌套结构”，递归继续往里比较
-        if isinstance(expected_value, dict) and isinstance(actual_value, dict):
-            # 递归：继续比较子 dict
-            _assert_dict_contains(actual_value, expected_value, current_path)
-        else:
-            if actual_value != expected_value:
-                # 2.4 否则就是普通值（字符串、数字、布尔等），直接判断相等
-                raise AssertionError(
-                    f"Value mismatch at {current_path}: "
-                    f"actual={actual_value!r}, expected={expected_value!r}"
-                )
+    # 2. 逐层比较，找到 max_failures 处不一致就停
+    mismatches = find_mismatches(
+        actual, expected, list_mode=list_mode, max_mismatches=max_failures, path=path,
+    )
+    if len(mismatches) == 1:
+        raise AssertionError(mismatches[0].message)
+    if mismatches:
+        lines = "\n".join(f"  - {m.message}" for m in mismatches)
+        raise AssertionError(f"{len(mismatches)} mismatches (showing up to {max_failures}):\n{lines}")
 
 
 def assert_dict_contains(
         actual: Mapping[str, Any],
-        expected_subset: Mapping[str, Any]) -> None:
+        expected_subset: Mapping[str, Any],
+        *,
+        list_mode: str = "equal",
+        max_failures: int = 1) -> None:
     """
     断言 actual 字典“包含” expected_subset 描述的子集。
+
+    - list_mode: 列表怎么比较（equal / ordered / prefix / contains）
+    - max_failures: >1 时一次报出多处不一致
     """
-    _assert_dict_contains(actual, expected_subset, path="")
+    _assert_dict_contains(actual, expected_subset, path="",
+                          list_mode=list_mode, max_failures=max_failures)
 
 
 # ================= Day14 新增：路径断言 + 列表长度断言 ================= #
 
 def _get_by_path(data: Any, path: str) -> Any:
     """
-     从嵌套的 dict / list 结构中，通过“点号路径”取值。
-
-     约定：
-     - 用 '.' 分隔层级，比如: "json.user.id"
-     - 如果某一层是 list，可以用数字做下标，比如: "items.0.id"
-
-     示例：
-         body = {
-             "json": {
-                 "user": {"id": 10086, "name": "Quintai-Li"},
-                 "tags": ["api", "test"],
-             },
-             "items": [
-                 {"id": 1},
-                 {"id": 2},
-             ],
-         }
-
-         _get_by_path(body, "json.user.id")   -> 10086
-         _get_by_path(body, "items.1.id")     -> 2
-     """
-    current: Any = data
-
-    for part in path.split("."):
-        # dict 分支
-        if isinstance(current, Mapping):
-            if part not in current:
-                msg = (
-                    f"Path {path!r} not found: missing key {part!r}",
-                    f"current={current!r}"
-                )
-                # ❗ 这里只传一个字符串，不要传两个参数
-                raise AssertionError(msg)
-
-            # ❗ 关键：每一层都要往下“走”一步
-            current = current[part]
-
-        # list / tuple分支（非字符串）
-        elif isinstance(current, Sequence) and not isinstance(current, (str, bytes, bytearray)):
-            if not part.isdigit():
-                msg = (
-                    f"Path {path!r} expects list index at {path!r},"
-                    f"but got non-digit segment. current={current!r}"
-                )
-                raise AssertionError(msg)
-
-            idx = int(part)
-            try:
-                current = current[idx]
-            except IndexError:
-                msg = (
-                    f"Path {path!r}: index {idx} out of range for sequence"
-                    f"of length {len(current)}; current={current!r}"
-                )
-                raise AssertionError(msg) from None
-        else:
-            msg = (
-                f"Path {path!r}: not found: cannot descend into "
-                f"{type(current).__name__!r}, value={current!r}"
-            )
-            raise AssertionError(msg) from None
+    从嵌套的 dict / list 结构中，通过“点号路径”取值。
 
-    return current
+    约定：
+    - 用 '.' 分隔层级，比如: "json.user.id"
+    - 如果某一层是 list，可以用数字做下标，比如: "items.0.id"
+    - 还支持通配 / 切片 / 过滤（items.*.id、items[0:3]、items[?status=="active"].id），
+      这类路径返回的是列表；完整语法见 autofw.utils.json_path
+    - 单独一段 * 是通配（名叫 "*" 的 key 写 ["*"]），空路径抛 ValueError
+
+    路径只解析一次（compile_path 有缓存），同一个路径对很多 body 求值不会重复解析。
+    走不下去时抛 AssertionError，信息里带出错的位置。
+
+    示例：
+        _get_by_path(body, "json.user.id")   -> 10086
+        _get_by_path(body, "items.1.id")     -> 2
+        _get_by_path(body, "items.*.id")     -> [1, 2]
+    """
+    return compile_path(path).get(data)
 
 
 def assert_json_value(
@@ -202,6 +173,7 @@ def assert_json_value(
     示例：
         assert_json_value(body, "json.user.id", 10086)
         assert_json_value(body, "items.0.id", 1)
+        assert_json_value(body, "items.*.id", [1, 2])   # 通配路径：和列表比较
     """
     actual = _get_by_path(body, path)
 
@@ -213,6 +185,43 @@ def assert_json_value(
         raise AssertionError(msg)
 
 
+def assert_each_value(
+        body: Any,
+        path: str,
+        expected: Any,
+        min_count: int = 1,
+) -> int:
+    """
+    断言路径匹配到的每个值都等于 expected（expected 是 callable 时：每个值调用后为真），
+    返回匹配到的个数。路径一般带通配 / 过滤：
+
+        assert_each_value(body, "items.*.status", "active")
+        assert_each_value(body, "items.*.price", lambda v: v > 0)
+
+    整个列表只求值一次；失败时报告第一个不满足的下标和值。
+    """
+    compiled = compile_path(path)
+    actual = compiled.get(body)
+    values = actual if not compiled.is_singular else [actual]
+    check = expected if callable(expected) else (lambda v: v == expected)
+    for idx, value in enumerate(values):
+        if not check(value):
+            shown = getattr(expected, "__name__", "<predicate>") if callable(expected) else repr(expected)
+            raise AssertionError(
+                f"Value mismatch at path {path!r} (match #{idx}): actual={value!r}, expected={shown}"
+            )
+    if len(values) < min_count:
+        raise AssertionError(f"Path {path!r} matched {len(values)} values, expected at least {min_count}")
+    return len(values)
+
+
+def assert_path_count(body: Any, path: str, expected_count: int) -> None:
+    """断言路径匹配到的值的个数（宽松匹配：走不下去的分支不算），比如过滤后的元素个数"""
+    actual = len(compile_path(path).find(body))
+    if actual != expected_count:
+        raise AssertionError(f"Path {path!r} matched {actual} values, expected {expected_count}")
+
+
 def assert_list_length(
         seq: Sized,
         expected_length: int,
@@ -232,3 +241,178 @@ def assert_list_length(
             f"actual={actual}, value={seq!r}"
         )
         raise AssertionError(msg or default_msg)
+
+
+def assert_json_schema(
+        body: Any,
+        schema_ref: str | os.PathLike[str] | Mapping[str, Any],
+        *,
+        shallow: bool = False,
+        max_errors: int = 10,
+) -> None:
+    """
+    断言 body 符合 JSON Schema（见 autofw.utils.json_schema）：
+
+        assert_json_schema(resp.json(), "echo_post.json")                 # data/schemas/echo_post.json
+        assert_json_schema(resp.json(), "echo_post.json", shallow=True)   # 只查顶层结构，更快
+
+    schema 文件按路径 + mtime 缓存编译结果，回归跑几千次也只解析 / 编译一次。
+    失败时列出最多 max_errors 处不符合的位置。
+    """
+    validator = load_schema(schema_ref, shallow=shallow)
+    errors = validator.errors(body, max_errors=max_errors)
+    if errors:
+        lines = "\n".join(f"  - {e}" for e in errors)
+        more = " (truncated)" if len(errors) >= max_errors else ""
+        raise AssertionError(f"JSON schema {validator.source!r} mismatch{more}:\n{lines}")
+
+
+# ================= 流式断言：边消费边断言，不把整个列表读进内存 ================= #
+
+def _iter_items(items: Any) -> Iterable[Any]:
+    """StreamedResponse 直接传进来也行（按 Content-Type 自动选 NDJSON / JSON 数组）"""
+    iter_items = getattr(items, "iter_items", None)
+    return iter_items() if callable(iter_items) else items
+
+
+def assert_each_item_contains(
+        items: Iterable[Mapping[str, Any]],
+        expected_subset: Mapping[str, Any],
+        min_count: int = 1,
+) -> int:
+    """
+    断言每个元素都包含 expected_subset（规则同 assert_dict_contains），返回元素个数。
+
+    - items: 任意可迭代对象，通常是 StreamedResponse.iter_items()
+    - min_count: 至少要有多少个元素（默认 1，防止空流“全部通过”）
+    """
+    count = 0
+    for idx, item in enumerate(_iter_items(items)):
+        _assert_dict_contains(item, expected_subset, path=f"[{idx}]")
+        count += 1
+    if count < min_count:
+        raise AssertionError(f"Stream too short: expected at least {min_count} items, got {count}")
+    return count
+
+
+def assert_any_item_contains(
+        items: Iterable[Mapping[str, Any]],
+        expected_subset: Mapping[str, Any],
+) -> int:
+    """断言至少一个元素包含 expected_subset；找到就停止消费，返回它的下标"""
+    count = 0
+    for idx, item in enumerate(_iter_items(items)):
+        count += 1
+        if not isinstance(item, Mapping):
+            continue
+        try:
+            _assert_dict_contains(item, expected_subset)
+        except AssertionError:
+            continue
+        return idx
+    raise AssertionError(f"No item contains {expected_subset!r} (checked {count} items)")
+
+
+def assert_stream_length(items: Iterable[Any], expected_length: int) -> None:
+    """assert_list_length 的流式版本：只计数，不保留元素"""
+    actual = sum(1 for _ in _iter_items(items))
+    if actual != expected_length:
+        raise AssertionError(f"Stream length mismatch: expected={expected_length}, actual={actual}")
+
+
+# ================= 列式断言：一个字段抽成一列，整列一次性检查 ================= #
+
+# 失败信息里最多列出多少个出问题的行
+MAX_REPORTED_ROWS = 10
+
+Records = Sequence[Mapping[str, Any]] | ColumnSet
+
+
+def _fail_rows(field: str, what: str, rows: list[int], values: list[Any], total: int, max_report: int) -> None:
+    shown = rows[:max_report]
+    raise AssertionError(
+        f"Column {field!r}: {len(rows)} of {total} rows {what}; "
+        f"first rows={shown} values={[values[i] for i in shown]!r}"
+    )
+
+
+def assert_column_unique(records: Records, field: str, max_report: int = MAX_REPORTED_ROWS) -> None:
+    """字段值没有重复（报告的是第二次及以后出现的行）"""
+    col = as_column_set(records).column(field)
+    rows = col.duplicates()
+    if rows:
+        _fail_rows(field, "are duplicates", rows, col.values, len(col), max_report)
+
+
+def assert_column_sorted(
+        records: Records,
+        field: str,
+        *,
+        descending: bool = False,
+        strict: bool = False,
+        max_report: int = MAX_REPORTED_ROWS,
+) -> None:
+    """
+    按 field 有序（默认升序、允许相等；strict=True 不允许相等）。
+    ISO 8601 时间字符串（created_at）按字符串比较就是时间顺序。
+    """
+    col = as_column_set(records).column(field)
+    rows = col.order_violations(descending=descending, strict=strict)
+    if rows:
+        order = ("strictly " if strict else "") + ("descending" if descending else "ascending")
+        _fail_rows(field, f"break {order} order (compared with previous row)", rows, col.values, len(col), max_report)
+
+
+def assert_column_in_range(
+        records: Records,
+        field: str,
+        min_value: Any = None,
+        max_value: Any = None,
+        max_report: int = MAX_REPORTED_ROWS,
+) -> None:
+    """min_value <= 值 <= max_value（None = 不限）；NaN、None 等不可比较的值算不满足"""
+    col = as_column_set(records).column(field)
+    rows = col.out_of_range(min_value, max_value)
+    if rows:
+        _fail_rows(field, f"outside [{min_value!r}, {max_value!r}]", rows, col.values, len(col), max_report)
+
+
+def assert_column_in(
+        records: Records,
+        field: str,
+        allowed: Iterable[Any],
+        max_report: int = MAX_REPORTED_ROWS,
+) -> None:
+    """
+    每个值都在 allowed 里。“全部 status 都是 active”：
+
+        assert_column_in(items, "status", {"active"})
+    """
+    allowed = list(allowed)
+    col = as_column_set(records).column(field)
+    rows = col.not_in(allowed)
+    if rows:
+        _fail_rows(field, f"not in {allowed!r}", rows, col.values, len(col), max_report)
+
+
+def assert_column_aggregate(
+        records: Records,
+        field: str,
+        func: str,
+        expected: Any,
+        *,
+        rel_tol: float = 1e-9,
+        abs_tol: float = 0.0,
+) -> Any:
+    """
+    func: sum / min / max / mean / count；数字按 math.isclose(rel_tol, abs_tol) 比较，返回实际值。
+
+        assert_column_aggregate(items, "amount", "sum", body["total_amount"], abs_tol=0.01)
+    """
+    col = as_column_set(records).column(field)
+    actual = col.aggregate(func)
+    numeric = isinstance(actual, (int, float)) and isinstance(expected, (int, float))
+    if not (math.isclose(actual, expected, rel_tol=rel_tol, abs_tol=abs_tol) if numeric else actual == expected):
+        raise AssertionError(f"Column {field!r}: {func}={actual!r}, expected={expected!r} "
+                             f"(rel_tol={rel_tol}, abs_tol={abs_tol})")
+    return actual
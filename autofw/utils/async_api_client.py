@@ -0,0 +1,308 @@
+# autofw/utils/async_api_client.py
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import uuid
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+
+from autofw.utils.api_client import LOG_MODES, BatchResult, _LazyKwargs, _split_spec
+from autofw.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from autofw.utils.logger_helper import get_logger
+from autofw.utils.metrics import MetricsRegistry
+from autofw.utils.rate_limiter import RateLimiter
+from autofw.utils.retry_policy import JITTER_MODES, RetryBudget, compute_backoff, parse_retry_after
+
+logger = get_logger("autofw.async_api_client")
+
+
+@dataclass
+class AsyncAPIClient:
+    """
+    APIClient 的 asyncio 版本（底层用 httpx.AsyncClient）：
+
+    - 和 APIClient 一样的 _request 契约：
+      retries / backoff / retry_statuses / retry_exceptions / timeout 都支持请求级覆盖
+    - 一样的 [REQ]/[RESP]/[RETRY]/[ERR] 日志 + headers 脱敏
+    - 退避用 asyncio.sleep，不占线程；一个进程可以同时挂几百个请求
+
+    用法示例：
+        async with AsyncAPIClient(base_url="https://postman-echo.com") as client:
+            resps = await asyncio.gather(*(client.get("/get") for _ in range(100)))
+    """
+
+    base_url: str
+    timeout: float = 20
+
+    retries: int = 2
+    backoff: float = 0.5
+    retry_statuses: tuple[int, ...] = (429, 500, 502, 503, 504)
+    # 对齐 requests 的 Timeout + ConnectionError：连不上 / 读写断了 / 对端协议层直接断开都重试
+    retry_exceptions: tuple[type[BaseException], ...] = (
+        httpx.TimeoutException,
+        httpx.NetworkError,
+        httpx.RemoteProtocolError,
+        httpx.ProxyError,
+    )
+
+    # jitter / Retry-After / 重试预算，含义同 APIClient
+    jitter: str = "none"
+    backoff_max: float = 30.0
+    retry_after_statuses: tuple[int, ...] = (429, 503)
+    retry_after_max: float = 60.0
+    retry_budget: RetryBudget | None = None
+    circuit_breaker: CircuitBreaker | None = None
+    rate_limiter: RateLimiter | None = None
+    metrics: MetricsRegistry | None = None
+
+    session: httpx.AsyncClient = field(
+        default_factory=lambda: httpx.AsyncClient(trust_env=False)
+    )
+
+    default_headers: dict[str, str] = field(
+        default_factory=lambda: {
+            "User-Agent": "APIClient/1.0",
+            "Accept": "application/json, */*;q=0.8",
+        }
+    )
+
+    # 请求日志：full / compact / off，含义同 APIClient
+    log_mode: str = "full"
+    log_body_max: int = 1024
+
+    def __post_init__(self) -> None:
+        if self.log_mode not in LOG_MODES:
+            raise ValueError(f"log_mode must be one of {LOG_MODES}, got {self.log_mode!r}")
+        if self.jitter not in JITTER_MODES:
+            raise ValueError(f"jitter must be one of {JITTER_MODES}, got {self.jitter!r}")
+        if self.base_url.endswith("/"):
+            self.base_url = self.base_url[:-1]
+        self.session.headers.update(self.default_headers)
+
+    async def __aenter__(self) -> AsyncAPIClient:
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """关闭底层 httpx.AsyncClient（释放连接池）"""
+        await self.session.aclose()
+
+    # ------------------ 内部工具方法（和 APIClient 保持一致） ------------------ #
+
+    def _full_url(self, path: str) -> str:
+        if path.startswith("http://") or path.startswith("https://"):
+            return path
+        return self.base_url.rstrip("/") + "/" + path.lstrip("/")
+
+    def _new_req_id(self) -> str:
+        return uuid.uuid4().hex[:8]
+
+    def _redact_headers(self, headers: dict[str, Any]) -> dict[str, Any]:
+        if not headers:
+            return {}
+        safe = dict(headers)
+        for k in list(safe.keys()):
+            if k.lower() in ("authorization", "x-api-key", "token"):
+                safe[k] = "***REDACTED***"
+        return safe
+
+    def _sleep_seconds(self, attempt: int, backoff: float, prev_sleep: float = 0.0) -> float:
+        return compute_backoff(attempt, backoff, jitter=self.jitter, prev_sleep=prev_sleep, cap=self.backoff_max)
+
+    def _retry_after_seconds(self, resp: httpx.Response) -> float | None:
+        if resp.status_code not in self.retry_after_statuses:
+            return None
+        seconds = parse_retry_after(resp.headers.get("Retry-After"))
+        if seconds is None:
+            return None
+        return min(seconds, self.retry_after_max)
+
+    def _allow_retry(self, req_id: str, method: str, url: str) -> bool:
+        if self.retry_budget is None or self.retry_budget.try_spend():
+            return True
+        logger.warning("[RETRY-DENIED %s] %s %s retry budget exhausted", req_id, method.upper(), url)
+        return False
+
+    async def _send(self, method: str, url: str, host: str, **kwargs: Any) -> httpx.Response:
+        # httpx 默认不跟随重定向，requests 默认跟随：保持和 APIClient 一致（请求级可以传 follow_redirects=False）
+        kwargs.setdefault("follow_redirects", True)
+        breaker = self.circuit_breaker
+        if breaker is None:
+            return await self.session.request(method, url, **kwargs)
+        try:
+            resp = await self.session.request(method, url, **kwargs)
+        except BaseException as e:
+            # 只有传输层错误算 host 失败（同 APIClient._send）
+            if isinstance(e, httpx.TransportError):
+                breaker.record(host, success=False)
+            else:
+                breaker.release(host)
+            raise
+        breaker.record(host, success=resp.status_code not in breaker.failure_statuses)
+        return resp
+
+    # ------------------ 统一请求入口 ------------------ #
+
+    async def _request(self,
+                       method: str,
+                       path: str,
+                       *,
+                       retries: int | None = None,
+                       backoff: float | None = None,
+                       retry_statuses: tuple[int, ...] | None = None,
+                       retry_exceptions: tuple[type[BaseException], ...] | None = None,
+                       timeout: float | None = None,
+                       **kwargs: Any,
+                       ) -> httpx.Response:
+        url = self._full_url(path)
+        req_id = self._new_req_id()
+
+        _retries = self.retries if retries is None else retries
+        _backoff = self.backoff if backoff is None else backoff
+        _retry_statuses = self.retry_statuses if retry_statuses is None else retry_statuses
+        _retry_exceptions = self.retry_exceptions if retry_exceptions is None else retry_exceptions
+        _timeout = self.timeout if timeout is None else timeout
+
+        info_on = self.log_mode != "off" and logger.isEnabledFor(logging.INFO)
+        log_full = info_on and self.log_mode == "full"
+        log_compact = info_on and self.log_mode == "compact"
+        if log_full:
+            logger.info("[REQ %s] %s %s kwargs=%s", req_id, method, url,
+                        _LazyKwargs(kwargs, self._redact_headers, self.log_body_max))
+        req_start = time.perf_counter()
+
+        max_attempts = 1 + max(0, int(_retries))
+        last_exc: BaseException | None = None
+        prev_sleep = 0.0
+
+        if self.retry_budget is not None:
+            self.retry_budget.record_request()
+
+        breaker = self.circuit_breaker
+        limiter = self.rate_limiter
+        split = urlsplit(url) if (breaker is not None or limiter is not None) else None
+        host = split.netloc if split is not None else ""
+        throttled_s = 0.0
+
+        metrics = self.metrics
+        attempt = 0
+        try:
+            for attempt in range(1, max_attempts + 1):
+                if breaker is not None:
+                    try:
+                        breaker.before_call(host)
+                    except CircuitOpenError as e:
+                        logger.warning("[CIRCUIT-OPEN %s] %s %s %s", req_id, method.upper(), url, e)
+                        raise
+
+                if limiter is not None:
+                    # reserve 只在锁里算等待时间，等待本身用 asyncio.sleep，不卡事件循环
+                    wait_s = limiter.reserve(split.path)
+                    if wait_s > 0:
+                        throttled_s += wait_s
+                        await asyncio.sleep(wait_s)
+
+                start = time.perf_counter()
+                try:
+                    resp = await self._send(method, url, host, timeout=_timeout, **kwargs)
+                    if log_full:
+                        elapsed_ms = int((time.perf_counter() - start) * 1000)
+                        logger.info("[RESP %s] %s %s status=%s elapsed_ms=%s", req_id, method, url, resp.status_code,
+                                    elapsed_ms)
+
+                    if (resp.status_code in _retry_statuses and attempt < max_attempts
+                            and self._allow_retry(req_id, method, url)):
+                        retry_after = self._retry_after_seconds(resp)
+                        sleep_s = self._sleep_seconds(attempt, _backoff, prev_sleep) if retry_after is None else retry_after
+                        prev_sleep = sleep_s
+                        logger.warning("[RETRY %s] %s status=%s attempt=%s/%s sleep=%.2fs", req_id, method.upper(),
+                                       resp.status_code, attempt, max_attempts, sleep_s)
+                        await asyncio.sleep(sleep_s)
+                        continue
+
+                    if limiter is not None:
+                        resp.throttled_ms = round(throttled_s * 1000, 3)
+                    if log_compact:
+                        logger.info("[REQ %s] %s %s status=%s attempts=%s elapsed_ms=%s", req_id, method, url,
+                                    resp.status_code, attempt, int((time.perf_counter() - req_start) * 1000))
+                    if metrics is not None:
+                        metrics.record(method, url, resp.status_code, time.perf_counter() - req_start, attempts=attempt)
+                    return resp
+
+                except _retry_exceptions as e:
+                    last_exc = e
+                    elapsed_ms = int((time.perf_counter() - start) * 1000)
+                    logger.warning("[ERR %s] %s %s exc=%s elapsed_ms=%s", req_id, method, url, type(e).__name__, elapsed_ms)
+
+                    if attempt >= max_attempts:
+                        logger.error("[FAIL %s] %s %s retries_exhausted after %s attempts: %s", req_id, method.upper(),
+                                     url, max_attempts, e)
+                        raise
+                    if not self._allow_retry(req_id, method, url):
+                        raise
+
+                    sleep_s = self._sleep_seconds(attempt, _backoff, prev_sleep)
+                    prev_sleep = sleep_s
+                    logger.info("[RETRY %s] %s exc=%s attempt=%s/%s sleep=%.2fs", req_id, method.upper(),
+                                type(e).__name__, attempt, max_attempts, sleep_s)
+                    await asyncio.sleep(sleep_s)
+
+            if last_exc:
+                raise last_exc
+            raise RuntimeError("_request() failed unexpectedly, retry loop exit")
+        except BaseException as e:
+            if metrics is not None:
+                metrics.record(method, url, type(e).__name__, time.perf_counter() - req_start,
+                               attempts=max(1, attempt), error=True)
+            raise
+
+    async def get(
+            self,
+            path: str,
+            params: dict[str, Any] | None = None,
+            **kwargs: Any
+    ) -> httpx.Response:
+        return await self._request("GET", path, params=params, **kwargs)
+
+    async def post(
+            self,
+            path: str,
+            json: dict[str, Any] | None = None,
+            data: Any = None,
+            **kwargs: Any
+    ) -> httpx.Response:
+        return await self._request("POST", path, json=json, data=data, **kwargs)
+
+    async def gather(
+            self,
+            specs: Iterable[Mapping[str, Any]],
+            *,
+            concurrency: int = 100,
+    ) -> list[BatchResult]:
+        """
+        APIClient.map 的 asyncio 版本：用 Semaphore 限制同时在飞的请求数，
+        结果顺序和 specs 一致，单条失败放在 BatchResult.error 里。
+        """
+        sem = asyncio.Semaphore(max(1, int(concurrency)))
+
+        async def _run(spec: Mapping[str, Any]) -> BatchResult:
+            async with sem:
+                start = time.perf_counter()
+                try:
+                    method, path, kwargs = _split_spec(spec)
+                    resp = await self._request(method, path, **kwargs)
+                    return BatchResult(spec=spec, response=resp,
+                                       elapsed_ms=int((time.perf_counter() - start) * 1000))
+                except Exception as e:  # noqa: BLE001
+                    return BatchResult(spec=spec, error=e,
+                                       elapsed_ms=int((time.perf_counter() - start) * 1000))
+
+        return list(await asyncio.gather(*(_run(spec) for spec in specs)))
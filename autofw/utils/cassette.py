@@ -0,0 +1,279 @@
+# autofw/utils/cassette.py
+"""
+录制 / 回放（record / replay）：把真实 HTTP 交互存进 cassette 文件，之后离线回放。
+
+- Cassette: 磁盘上一个 JSONL 文件，一行一次交互；加载时按请求指纹建 dict 索引，查找 O(1)
+- CassetteAdapter: 挂在 requests.Session 上，包住原来的 adapter（连接池 / HTTP/2）
+    - replay: 只回放，找不到就抛 CassetteMissError（不会偷偷打网络）
+    - record: 清空文件重新录，所有请求都真实发出并记录
+    - auto:   能回放就回放，找不到的真实发出并追加录制
+- 指纹 = method + URL（query 参数排序）+ body（JSON 会规范化，key 顺序不影响）
+  headers 不参与匹配（token 每次都不一样），也不会写进 cassette
+- 同一个指纹录到多次：按录制顺序依次回放，用完后一直回放最后一次
+- replay_latency: 回放时按录制耗时 * 这个系数 sleep（0 = 不等，1 = 原速）
+
+用法（conftest 里已经接好）：
+    AUTOFW_CASSETTE=record make network    # 联网录一次
+    AUTOFW_CASSETTE=replay make network    # 之后离线秒级回放
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from autofw.utils import json_codec
+from autofw.utils.h2_adapter import OriginalResponse
+
+CASSETTE_MODES = ("replay", "record", "auto")
+
+# 录制时不保存的响应头：body 存的是解压后的内容，长度由回放时重新计算
+_DROP_RESPONSE_HEADERS = frozenset({"content-encoding", "transfer-encoding", "content-length", "connection", "keep-alive"})
+
+
+class CassetteMissError(requests.exceptions.RequestException):
+    """replay 模式下请求没录过（不是 ConnectionError，不会被重试）"""
+
+    def __init__(self, method: str, url: str, fingerprint: str) -> None:
+        super().__init__(f"no recorded response for {method} {url} (fingerprint={fingerprint}); "
+                         f"record it with AUTOFW_CASSETTE=record")
+        self.fingerprint = fingerprint
+
+
+@dataclass
+class Interaction:
+    fingerprint: str
+    method: str
+    url: str
+    status: int
+    reason: str
+    headers: list[tuple[str, str]]
+    body: bytes
+    elapsed_ms: float
+
+    def to_line(self) -> bytes:
+        record: dict[str, Any] = {
+            "fp": self.fingerprint,
+            "method": self.method,
+            "url": self.url,
+            "status": self.status,
+            "reason": self.reason,
+            "headers": self.headers,
+            "elapsed_ms": self.elapsed_ms,
+        }
+        try:
+            record["body"] = self.body.decode("utf-8")
+        except UnicodeDecodeError:
+            record["b64"] = base64.b64encode(self.body).decode("ascii")
+        return json_codec.dumps(record) + b"\n"
+
+    @classmethod
+    def from_line(cls, line: bytes) -> Interaction:
+        record = json_codec.loads(line)
+        body = base64.b64decode(record["b64"]) if "b64" in record else record.get("body", "").encode("utf-8")
+        return cls(
+            fingerprint=record["fp"],
+            method=record["method"],
+            url=record["url"],
+            status=record["status"],
+            reason=record.get("reason", ""),
+            headers=[(k, v) for k, v in record.get("headers", [])],
+            body=body,
+            elapsed_ms=record.get("elapsed_ms", 0.0),
+        )
+
+
+class Cassette:
+    def __init__(
+            self,
+            path: str | Path,
+            mode: str = "auto",
+            replay_latency: float = 0.0,
+            match_body: bool = True,
+            ignore_params: Iterable[str] = (),
+    ) -> None:
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"cassette mode must be one of {CASSETTE_MODES}, got {mode!r}")
+        self.path = Path(path)
+        self.mode = mode
+        self.replay_latency = replay_latency
+        self.match_body = match_body
+        self.ignore_params = frozenset(ignore_params)
+
+        self._index: dict[str, list[Interaction]] = {}
+        self._cursor: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._loaded = False
+
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+
+    # ------------------ 指纹 ------------------ #
+
+    def fingerprint(self, request: requests.PreparedRequest) -> str:
+        method = (request.method or "GET").upper()
+        parts = urlsplit(request.url or "")
+        query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                       if k not in self.ignore_params)
+        url = urlunsplit((parts.scheme, parts.netloc, parts.path or "/", urlencode(query), ""))
+
+        h = hashlib.sha1(f"{method} {url}".encode())
+        if self.match_body and request.body:
+            h.update(b"\n")
+            h.update(_canonical_body(request.body))
+        return h.hexdigest()[:20]
+
+    # ------------------ 存取 ------------------ #
+
+    def _load_locked(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        if self.mode == "record":
+            # 重新录：旧内容作废
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_bytes(b"")
+            return
+        if not self.path.exists():
+            return
+        with self.path.open("rb") as f:
+            for line in f:
+                if line.strip():
+                    item = Interaction.from_line(line)
+                    self._index.setdefault(item.fingerprint, []).append(item)
+
+    def lookup(self, fingerprint: str) -> Interaction | None:
+        """record 模式永远返回 None；其它模式按录制顺序依次回放"""
+        with self._lock:
+            self._load_locked()
+            if self.mode == "record":
+                return None
+            items = self._index.get(fingerprint)
+            if not items:
+                self.misses += 1
+                return None
+            i = self._cursor.get(fingerprint, 0)
+            self._cursor[fingerprint] = i + 1
+            self.hits += 1
+            return items[min(i, len(items) - 1)]
+
+    def append(self, item: Interaction) -> None:
+        line = item.to_line()
+        with self._lock:
+            self._load_locked()
+            self._index.setdefault(item.fingerprint, []).append(item)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # 每条都立即落盘：录到一半中断，已经录到的不丢
+            with self.path.open("ab") as f:
+                f.write(line)
+            self.recorded += 1
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._load_locked()
+            return sum(len(v) for v in self._index.values())
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "recorded": self.recorded}
+
+
+def _canonical_body(body: bytes | str) -> bytes:
+    raw = body.encode("utf-8") if isinstance(body, str) else body
+    if not isinstance(raw, (bytes, bytearray)):
+        # 生成器 / 文件之类的流式 body：没法稳定取指纹，只按 method + URL 匹配
+        return b""
+    try:
+        return json.dumps(json.loads(raw), sort_keys=True, separators=(",", ":")).encode("utf-8")
+    except ValueError:
+        return bytes(raw)
+
+
+class _ReplayRaw:
+    """回放响应的 raw：只提供 Set-Cookie 写回 session.cookies 需要的字段"""
+
+    def __init__(self, headers: list[tuple[str, str]]) -> None:
+        self._original_response = OriginalResponse(headers)
+
+    def close(self) -> None:
+        pass
+
+
+class CassetteAdapter(BaseAdapter):
+    """包住原来的 adapter：命中 cassette 就回放，否则交给 inner 真实发出（按 mode 决定是否录制）"""
+
+    def __init__(self, cassette: Cassette, inner: BaseAdapter) -> None:
+        super().__init__()
+        self.cassette = cassette
+        self.inner = inner
+
+    def send(self, request: requests.PreparedRequest, stream: bool = False, **kwargs: Any) -> requests.Response:
+        cassette = self.cassette
+        fp = cassette.fingerprint(request)
+        item = cassette.lookup(fp)
+        if item is not None:
+            if cassette.replay_latency > 0:
+                time.sleep(item.elapsed_ms / 1000 * cassette.replay_latency)
+            return self._build_response(request, item)
+        if cassette.mode == "replay":
+            raise CassetteMissError(request.method or "GET", request.url or "", fp)
+
+        start = time.perf_counter()
+        resp = self.inner.send(request, stream=stream, **kwargs)
+        headers = _response_header_pairs(resp)
+        body = resp.content  # stream=True 也读完：要存下来
+        elapsed_ms = round((time.perf_counter() - start) * 1000, 3)
+        cassette.append(Interaction(
+            fingerprint=fp,
+            method=(request.method or "GET").upper(),
+            url=request.url or "",
+            status=resp.status_code,
+            reason=resp.reason or "",
+            headers=headers,
+            body=body,
+            elapsed_ms=elapsed_ms,
+        ))
+        return resp
+
+    def _build_response(self, request: requests.PreparedRequest, item: Interaction) -> requests.Response:
+        resp = requests.Response()
+        resp.status_code = item.status
+        resp.reason = item.reason
+        resp.headers = CaseInsensitiveDict()
+        for key, value in item.headers:
+            # 同名头按 HTTP 习惯用逗号合并（Set-Cookie 另外从 raw 里逐条读）
+            resp.headers[key] = f"{resp.headers[key]}, {value}" if key in resp.headers else value
+        resp.headers["Content-Length"] = str(len(item.body))
+        resp.encoding = get_encoding_from_headers(resp.headers)
+        resp.url = request.url or ""
+        resp.request = request
+        resp.connection = self
+        resp.raw = _ReplayRaw(item.headers)
+        resp._content = item.body
+        resp._content_consumed = True
+        resp.replayed = True
+        return resp
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+def _response_header_pairs(resp: requests.Response) -> list[tuple[str, str]]:
+    original = getattr(resp.raw, "_original_response", None)
+    msg = getattr(original, "msg", None)
+    pairs = list(msg.items()) if msg is not None else list(resp.headers.items())
+    return [(k, v) for k, v in pairs if k.lower() not in _DROP_RESPONSE_HEADERS]
@@ -0,0 +1,144 @@
+# autofw/utils/circuit_breaker.py
+"""
+按 host 的熔断器：
+
+- closed: 正常放行，滑动窗口里统计最近 window 次调用的失败率
+- open: 失败率 >= failure_rate（且样本数 >= min_calls）后打开，cooldown 秒内直接抛 CircuitOpenError
+- half_open: cooldown 过后放 half_open_max_calls 个探测请求，成功 -> closed，失败 -> 重新 open
+
+目的：环境整个挂掉时，不再每个请求都白等 timeout * (retries+1)，几秒内就能整体失败 / 跳过。
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import requests
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """熔断打开时快速失败抛出的异常（不是 ConnectionError，默认不会被重试）"""
+
+    def __init__(self, host: str, retry_in: float) -> None:
+        super().__init__(f"circuit open for host {host!r}, retry in {retry_in:.1f}s")
+        self.host = host
+        self.retry_in = retry_in
+
+
+@dataclass
+class _HostCircuit:
+    window: deque[bool]
+    state: str = CLOSED
+    opened_at: float = 0.0
+    half_open_in_flight: int = 0
+
+
+class CircuitBreaker:
+    """线程安全；一个实例管所有 host，各 host 状态互不影响"""
+
+    def __init__(
+            self,
+            failure_rate: float = 0.5,
+            window: int = 20,
+            min_calls: int = 5,
+            cooldown: float = 30.0,
+            half_open_max_calls: int = 1,
+            failure_statuses: tuple[int, ...] = (500, 502, 503, 504),
+            clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_rate = failure_rate
+        self.window = window
+        self.min_calls = min_calls
+        self.cooldown = cooldown
+        self.half_open_max_calls = half_open_max_calls
+        self.failure_statuses = failure_statuses  # 这些状态码也算一次失败
+        self.clock = clock
+
+        self._hosts: dict[str, _HostCircuit] = {}
+        self._lock = threading.Lock()
+
+    def _circuit(self, host: str) -> _HostCircuit:
+        circuit = self._hosts.get(host)
+        if circuit is None:
+            circuit = _HostCircuit(window=deque(maxlen=self.window))
+            self._hosts[host] = circuit
+        return circuit
+
+    def _refresh(self, circuit: _HostCircuit) -> None:
+        if circuit.state == OPEN and self.clock() - circuit.opened_at >= self.cooldown:
+            circuit.state = HALF_OPEN
+            circuit.half_open_in_flight = 0
+
+    def _open(self, circuit: _HostCircuit) -> None:
+        circuit.state = OPEN
+        circuit.opened_at = self.clock()
+        circuit.half_open_in_flight = 0
+
+    def before_call(self, host: str) -> None:
+        """发请求前调用：open（或 half_open 探测名额已满）时抛 CircuitOpenError"""
+        with self._lock:
+            circuit = self._circuit(host)
+            self._refresh(circuit)
+            if circuit.state == CLOSED:
+                return
+            if circuit.state == HALF_OPEN and circuit.half_open_in_flight < self.half_open_max_calls:
+                circuit.half_open_in_flight += 1
+                return
+            retry_in = max(0.0, self.cooldown - (self.clock() - circuit.opened_at))
+        raise CircuitOpenError(host, retry_in)
+
+    def record(self, host: str, success: bool) -> None:
+        """请求结束后调用：记录一次成功 / 失败，必要时切换状态"""
+        with self._lock:
+            circuit = self._circuit(host)
+            if circuit.state == HALF_OPEN:
+                if success:
+                    circuit.state = CLOSED
+                    circuit.window.clear()
+                else:
+                    self._open(circuit)
+                return
+            if circuit.state == OPEN:
+                return
+
+            circuit.window.append(success)
+            calls = len(circuit.window)
+            failures = calls - sum(circuit.window)
+            if calls >= self.min_calls and failures / calls >= self.failure_rate:
+                self._open(circuit)
+
+    def release(self, host: str) -> None:
+        """
+        请求没有结果可记（用例自己的异常 / 回放缺录制 / KeyboardInterrupt 等，不代表 host 挂了）：
+        不计入成功失败，只把 half_open 的探测名额还回去
+        """
+        with self._lock:
+            circuit = self._hosts.get(host)
+            if circuit is not None and circuit.state == HALF_OPEN and circuit.half_open_in_flight > 0:
+                circuit.half_open_in_flight -= 1
+
+    def state(self, host: str) -> str:
+        with self._lock:
+            circuit = self._hosts.get(host)
+            if circuit is None:
+                return CLOSED
+            self._refresh(circuit)
+            return circuit.state
+
+    def is_open(self, host: str) -> bool:
+        return self.state(host) == OPEN
+
+    def reset(self, host: str | None = None) -> None:
+        with self._lock:
+            if host is None:
+                self._hosts.clear()
+            else:
+                self._hosts.pop(host, None)
@@ -0,0 +1,259 @@
+# autofw/utils/columns.py
+"""
+列式断言的底层：把“记录列表”（list[dict]）里的某个字段抽成一列，批量做检查。
+
+- 装了 NumPy：数字 / 字符串列转成 ndarray，唯一性 / 有序 / 范围 / 集合成员 / 聚合都是向量化运算
+- 没装 NumPy：数字列存成 array.array（紧凑，不是一堆 Python int 对象），检查用一次遍历完成
+- 环境变量 AUTOFW_COLUMN_BACKEND=numpy|array 可以强制指定（对比 / 排查用）
+
+每个检查返回“不满足条件的行号”列表（从 0 开始，升序），断言函数只负责拼错误信息。
+断言函数在 autofw.utils.assertions（assert_column_*）；同一批记录要查多列时先建一个
+ColumnSet，每列只抽取一次。
+
+字段名支持点号路径（user.id），按 autofw.utils.json_path 的语法相对每条记录取值。
+"""
+
+from __future__ import annotations
+
+import math
+import os
+from array import array
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any
+
+from autofw.utils.json_path import compile_path
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - 取决于环境
+    np = None
+
+BACKENDS = ("numpy", "array")
+AGGREGATES = ("sum", "min", "max", "mean", "count")
+
+_MISSING: Any = object()
+
+
+def get_backend(name: str | None = None) -> str:
+    """name: numpy / array；None = 看 AUTOFW_COLUMN_BACKEND，再不行自动选（有 NumPy 就用）"""
+    name = (name or os.environ.get("AUTOFW_COLUMN_BACKEND") or "").strip().lower()
+    if name and name not in BACKENDS:
+        raise ValueError(f"Invalid column backend: {name!r}, expected one of {BACKENDS}")
+    if name == "numpy" and np is None:
+        raise ValueError("column backend 'numpy' requested but numpy is not installed")
+    if name == "array" or np is None:
+        return "array"
+    return "numpy"
+
+
+def _kind(values: list[Any]) -> str:
+    types = set(map(type, values))
+    if not types or types == {int}:
+        return "int"
+    if types == {bool}:
+        return "bool"
+    if types <= {int, float}:
+        return "float"
+    if types == {str}:
+        return "str"
+    return "object"
+
+
+class Column:
+    """
+    - values: 原始 Python 值（报错时展示用）
+    - kind: int / float / bool / str / object（混合类型、None 等都算 object，走逐个比较）
+    - data: 打包后的数据：ndarray / array.array / list
+    """
+
+    def __init__(self, name: str, values: list[Any], backend: str) -> None:
+        self.name = name
+        self.values = values
+        self.backend = backend
+        self.kind = _kind(values)
+        self.data: Any = values
+        self.vectorized = False
+        try:
+            if backend == "numpy" and self.kind != "object":
+                dtype = {"int": np.int64, "float": np.float64, "bool": np.bool_, "str": np.str_}[self.kind]
+                self.data = np.array(values, dtype=dtype)
+                self.vectorized = True
+            elif backend == "array" and self.kind in ("int", "float"):
+                self.data = array("q" if self.kind == "int" else "d", values)
+        except OverflowError:
+            # 超过 int64 的大整数：退回逐个比较
+            self.data = values
+            self.vectorized = False
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    # ------------------ 检查：返回不满足条件的行号 ------------------ #
+
+    def duplicates(self) -> list[int]:
+        """重复值所在的行（第一次出现的那行不算）"""
+        if self.vectorized:
+            order = np.argsort(self.data, kind="stable")
+            ordered = self.data[order]
+            dup = order[1:][ordered[1:] == ordered[:-1]]
+            return sorted(dup.tolist())
+        seen: set[Any] = set()
+        out = []
+        for i, v in enumerate(self.data):
+            key = _hashable(v)
+            if key in seen:
+                out.append(i)
+            else:
+                seen.add(key)
+        return out
+
+    def order_violations(self, descending: bool = False, strict: bool = False) -> list[int]:
+        """和上一行相比顺序不对的行"""
+        data = self.data
+        if self.vectorized:
+            prev, cur = data[:-1], data[1:]
+            if descending:
+                bad = cur >= prev if strict else cur > prev
+            else:
+                bad = cur <= prev if strict else cur < prev
+            if self.kind == "float":
+                # 和逐个比较一致：NaN 跟谁比都不成立，算顺序不对
+                bad = bad | np.isnan(cur) | np.isnan(prev)
+            return (np.flatnonzero(bad) + 1).tolist()
+        out = []
+        for i in range(1, len(data)):
+            prev, cur = data[i - 1], data[i]
+            try:
+                if descending:
+                    ok = cur < prev if strict else cur <= prev
+                else:
+                    ok = cur > prev if strict else cur >= prev
+            except TypeError:
+                ok = False
+            if not ok:
+                out.append(i)
+        return out
+
+    def out_of_range(self, lo: Any = None, hi: Any = None) -> list[int]:
+        """不在 [lo, hi] 里的行（NaN / 不可比较的值也算）"""
+        if self.vectorized and self.kind in ("int", "float"):
+            ok = np.ones(len(self.data), dtype=bool)
+            if lo is not None:
+                ok &= self.data >= lo
+            if hi is not None:
+                ok &= self.data <= hi
+            return np.flatnonzero(~ok).tolist()
+        out = []
+        for i, v in enumerate(self.data):
+            try:
+                ok = (lo is None or v >= lo) and (hi is None or v <= hi)
+            except TypeError:
+                ok = False
+            if not ok:
+                out.append(i)
+        return out
+
+    def not_in(self, allowed: Iterable[Any]) -> list[int]:
+        allowed = list(allowed)
+        if self.vectorized and _same_family(self.kind, allowed):
+            return np.flatnonzero(~np.isin(self.data, np.array(allowed))).tolist()
+        allowed_set = {_hashable(a) for a in allowed}
+        return [i for i, v in enumerate(self.data) if _hashable(v) not in allowed_set]
+
+    def aggregate(self, func: str) -> Any:
+        if func not in AGGREGATES:
+            raise ValueError(f"aggregate must be one of {AGGREGATES}, got {func!r}")
+        if func == "count":
+            return len(self.values)
+        if not self.values:
+            raise AssertionError(f"Column {self.name!r} is empty, cannot compute {func}")
+        if func == "sum" and self.vectorized and self.kind == "int" and not _int64_sum_safe(self.data):
+            # np.sum 在 int64 上溢出会悄悄回绕：可能超界时用 Python int 精确求和
+            return sum(self.values)
+        if self.vectorized and self.kind in ("int", "float"):
+            # .item()：返回 Python 标量，和逐个计算的结果类型一致
+            return getattr(np, func)(self.data).item()
+        # bool / str / object 列用原始 Python 值算，不会漏出 np.bool_ / np.str_
+        data = self.data if self.kind in ("int", "float") else self.values
+        try:
+            if func in ("sum", "mean"):
+                total = math.fsum(data) if self.kind == "float" else sum(data)
+                return total if func == "sum" else total / len(data)
+            return min(data) if func == "min" else max(data)
+        except TypeError:
+            # 字符串求 mean、混合类型求 max 之类
+            raise AssertionError(f"Column {self.name!r} ({self.kind}) does not support {func}") from None
+
+
+def _int64_sum_safe(data: Any) -> bool:
+    """len × 最大绝对值都放得进 int64，np.sum 就不会溢出"""
+    bound = max(int(data.max()), -int(data.min()))
+    return bound * len(data) < 2 ** 63
+
+
+def _same_family(kind: str, allowed: list[Any]) -> bool:
+    """集合成员检查能不能交给 np.isin（类型混了就逐个比较，结果更可控）"""
+    if not allowed:
+        return False
+    if kind in ("int", "float"):
+        return all(type(a) in (int, float) for a in allowed)
+    if kind == "str":
+        return all(type(a) is str for a in allowed)
+    if kind == "bool":
+        return all(type(a) is bool for a in allowed)
+    return False
+
+
+def _hashable(value: Any) -> Any:
+    """dict / list 这种不可哈希的值：转成可比较的 repr 再去重 / 查集合"""
+    try:
+        hash(value)
+    except TypeError:
+        return ("__unhashable__", repr(value))
+    return value
+
+
+class ColumnSet:
+    """
+    一批记录 + 按需抽取的列（每个字段只抽一次）：
+
+        cols = ColumnSet(resp.json()["items"])
+        assert_column_unique(cols, "id")
+        assert_column_sorted(cols, "created_at")
+    """
+
+    def __init__(self, records: Sequence[Mapping[str, Any]], backend: str | None = None) -> None:
+        self.records = records
+        self.backend = get_backend(backend)
+        self._columns: dict[str, Column] = {}
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def column(self, field: str) -> Column:
+        col = self._columns.get(field)
+        if col is None:
+            col = Column(field, self._extract(field), self.backend)
+            self._columns[field] = col
+        return col
+
+    def _extract(self, field: str) -> list[Any]:
+        records = self.records
+        if "." in field or "[" in field:
+            path = compile_path(field)
+            values = [path.first(r, _MISSING) for r in records]
+        else:
+            try:
+                values = [r.get(field, _MISSING) for r in records]
+            except AttributeError:
+                values = [r.get(field, _MISSING) if isinstance(r, Mapping) else _MISSING for r in records]
+        missing = [i for i, v in enumerate(values) if v is _MISSING]
+        if missing:
+            raise AssertionError(
+                f"Column {field!r} missing in {len(missing)} of {len(values)} rows; first rows={missing[:10]}"
+            )
+        return values
+
+
+def as_column_set(records: Sequence[Mapping[str, Any]] | ColumnSet) -> ColumnSet:
+    return records if isinstance(records, ColumnSet) else ColumnSet(records)
@@ -0,0 +1,90 @@
+# autofw/utils/dns_cache.py
+"""
+进程内 DNS 缓存（带 TTL）：同一个 host 在 TTL 内只解析一次，多个 client / 连接池共用。
+
+- PooledHTTPAdapter(dns_cache=...) 建新连接时先查缓存，查不到才 getaddrinfo
+- 解析失败不缓存（下次照常重试解析），错误照常由 urllib3 抛出
+- get_dns_cache(): 进程级共享实例，conftest 的 client 用它（config: dns_cache_ttl）
+
+只缓存建连用的地址列表，TLS 校验 / Host 头仍然用原来的域名。
+"""
+
+from __future__ import annotations
+
+import socket
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+AddrInfo = tuple[Any, ...]
+
+
+class DNSCache:
+    """
+    - ttl: 解析结果缓存多少秒（<=0 = 不缓存，每次都解析）
+    - max_entries: 最多缓存多少个 (host, port)，超出按 LRU 淘汰
+    - resolver / clock: 默认 socket.getaddrinfo / time.monotonic，测试可以替换
+    """
+
+    def __init__(
+            self,
+            ttl: float = 60.0,
+            max_entries: int = 256,
+            resolver: Callable[..., list[AddrInfo]] = socket.getaddrinfo,
+            clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.resolver = resolver
+        self.clock = clock
+        self._entries: OrderedDict[tuple[str, int], tuple[float, list[AddrInfo]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def resolve(self, host: str, port: int) -> list[AddrInfo]:
+        """返回 getaddrinfo(host, port, 0, SOCK_STREAM) 的结果（可能来自缓存）"""
+        key = (host, port)
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        # 解析放在锁外：慢 DNS 不挡住其它 host
+        infos = self.resolver(host, port, 0, socket.SOCK_STREAM)
+        if self.ttl > 0:
+            with self._lock:
+                self._entries[key] = (now + self.ttl, infos)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return infos
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+_shared = DNSCache()
+
+
+def get_dns_cache(ttl: float | None = None) -> DNSCache:
+    """进程级共享的 DNSCache；传 ttl 会顺便更新它的 TTL"""
+    if ttl is not None:
+        _shared.ttl = ttl
+    return _shared
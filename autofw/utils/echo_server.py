@@ -0,0 +1,362 @@
+# autofw/utils/echo_server.py
+"""
+本地 echo 服务：postman-echo 的进程内替身（asyncio，单线程）。
+
+postman-echo.com 走公网，压测只能到个位数 RPS，测的是网络不是我们的 client。
+这里实现常用的几个接口，响应体字段和 postman-echo 一致，EchoService / locust / YAML 用例直接换 base_url 就能用：
+
+- GET  /get                  -> {"args", "headers", "url"}
+- POST /post（PUT /put、PATCH /patch、DELETE /delete 同理）
+                             -> {"args", "data", "files", "form", "headers", "json", "url"}
+- ANY  /status/{code}        -> 对应状态码 + {"status": code}（1xx / 204 / 304 按 HTTP 规定不带 body）
+- ANY  /delay/{n}            -> 等 n 秒（最多 max_delay）再回 {"delay": "n"}
+
+实现：asyncio.Protocol + 手写 HTTP/1.1 解析（keep-alive、pipelining、chunked 请求体），
+单核几千到上万 RPS。只面向测试，不做安全加固。
+
+用法：
+    with EchoServer() as server:              # 后台线程里跑，port=0 自动选端口
+        client = APIClient(base_url=server.base_url)
+    python -m autofw.utils.echo_server --port 8080   # 或 make echo-server
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import threading
+from http import HTTPStatus
+from typing import Any
+from urllib.parse import parse_qsl, urlsplit
+
+from autofw.utils import json_codec
+
+MAX_HEADER_BYTES = 64 * 1024
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+_BODY_METHODS = {"POST": "/post", "PUT": "/put", "PATCH": "/patch", "DELETE": "/delete"}
+_REASONS = {s.value: s.phrase for s in HTTPStatus}
+# 这些状态码按 RFC 9110 不带 body（1xx / 204 也不带 Content-Length）
+_NO_BODY_STATUSES = {204, 304}
+
+
+class _BadRequest(Exception):
+    pass
+
+
+def _multi_dict(pairs: list[tuple[str, str]]) -> dict[str, Any]:
+    """postman-echo 的风格：同名参数出现多次时变成列表"""
+    out: dict[str, Any] = {}
+    for key, value in pairs:
+        if key not in out:
+            out[key] = value
+        elif isinstance(out[key], list):
+            out[key].append(value)
+        else:
+            out[key] = [out[key], value]
+    return out
+
+
+def _parse_chunked(buf: bytearray, start: int) -> tuple[bytes, int] | None:
+    """解析 chunked 请求体；数据还不完整时返回 None"""
+    body = bytearray()
+    pos = start
+    while True:
+        eol = buf.find(b"\r\n", pos)
+        if eol < 0:
+            return None
+        try:
+            size = int(bytes(buf[pos:eol]).split(b";", 1)[0], 16)
+        except ValueError:
+            raise _BadRequest("invalid chunk size") from None
+        pos = eol + 2
+        if size == 0:
+            # 不支持 trailer：最后一个 chunk 后面直接是空行
+            if len(buf) < pos + 2:
+                return None
+            return bytes(body), pos + 2
+        if len(buf) < pos + size + 2:
+            return None
+        body += buf[pos:pos + size]
+        pos += size + 2
+        if len(body) > MAX_BODY_BYTES:
+            raise _BadRequest("body too large")
+
+
+class _Request:
+    __slots__ = ("method", "target", "version", "headers", "body")
+
+    def __init__(self, method: str, target: str, version: str, headers: list[tuple[str, str]], body: bytes) -> None:
+        self.method = method
+        self.target = target
+        self.version = version
+        self.headers = headers
+        self.body = body
+
+    def header(self, name: str, default: str = "") -> str:
+        for key, value in self.headers:
+            if key == name:
+                return value
+        return default
+
+    @property
+    def keep_alive(self) -> bool:
+        conn = self.header("connection").lower()
+        if self.version == "HTTP/1.0":
+            return conn == "keep-alive"
+        return conn != "close"
+
+
+def _parse_request(buf: bytearray) -> tuple[_Request, int] | None:
+    """从 buf 开头解析一个完整请求，返回 (请求, 消耗的字节数)；不完整返回 None"""
+    head_end = buf.find(b"\r\n\r\n")
+    if head_end < 0:
+        if len(buf) > MAX_HEADER_BYTES:
+            raise _BadRequest("header too large")
+        return None
+    lines = bytes(buf[:head_end]).decode("latin-1").split("\r\n")
+    try:
+        method, target, version = lines[0].split(" ", 2)
+    except ValueError:
+        raise _BadRequest(f"bad request line {lines[0]!r}") from None
+    headers = []
+    for line in lines[1:]:
+        key, sep, value = line.partition(":")
+        if not sep:
+            raise _BadRequest(f"bad header line {line!r}")
+        headers.append((key.strip().lower(), value.strip()))
+
+    req = _Request(method.upper(), target, version, headers, b"")
+    start = head_end + 4
+    if "chunked" in req.header("transfer-encoding").lower():
+        parsed = _parse_chunked(buf, start)
+        if parsed is None:
+            return None
+        req.body, end = parsed
+        return req, end
+
+    length_raw = req.header("content-length", "0")
+    if not length_raw.isdigit() or int(length_raw) > MAX_BODY_BYTES:
+        raise _BadRequest(f"bad content-length {length_raw!r}")
+    end = start + int(length_raw)
+    if len(buf) < end:
+        return None
+    req.body = bytes(buf[start:end])
+    return req, end
+
+
+class _EchoProtocol(asyncio.Protocol):
+    """一条连接一个实例；/delay 期间暂停解析后面的请求，保证 pipelining 下响应顺序不乱"""
+
+    def __init__(self, server: EchoServer) -> None:
+        self.server = server
+        self.transport: asyncio.Transport | None = None
+        self.buf = bytearray()
+        self.waiting = False
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport  # type: ignore[assignment]
+        self.server.connections += 1
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self.transport = None
+
+    def data_received(self, data: bytes) -> None:
+        self.buf += data
+        self._process()
+
+    def _process(self) -> None:
+        while not self.waiting and self.transport is not None:
+            try:
+                parsed = _parse_request(self.buf)
+            except _BadRequest as e:
+                self._write(400, {"error": str(e)}, keep_alive=False)
+                return
+            if parsed is None:
+                return
+            req, consumed = parsed
+            del self.buf[:consumed]
+            self.server.requests += 1
+
+            status, body, delay = self.server.route(req)
+            if delay > 0:
+                self.waiting = True
+                asyncio.get_running_loop().call_later(
+                    delay, self._resume, status, body, req.keep_alive, req.method == "HEAD",
+                )
+                return
+            self._write(status, body, req.keep_alive, head_only=req.method == "HEAD")
+
+    def _resume(self, status: int, body: dict[str, Any], keep_alive: bool, head_only: bool) -> None:
+        self.waiting = False
+        self._write(status, body, keep_alive, head_only=head_only)
+        self._process()
+
+    def _write(self, status: int, body: dict[str, Any], keep_alive: bool, head_only: bool = False) -> None:
+        if self.transport is None:
+            return
+        head = f"HTTP/1.1 {status} {_REASONS.get(status, 'Unknown')}\r\n"
+        if status < 200 or status in _NO_BODY_STATUSES:
+            # 1xx / 204 / 304：没有 body，也不发 Content-Length / Content-Type
+            payload = b""
+        else:
+            payload = json_codec.dumps(body)
+            head += (
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(payload)}\r\n"
+            )
+        head += f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        # HEAD：只回头部，Content-Length 照样是 GET 时 body 的长度
+        self.transport.write(head.encode("latin-1") + (b"" if head_only else payload))
+        if not keep_alive:
+            self.transport.close()
+            self.transport = None
+
+
+class EchoServer:
+    """
+    - host / port: port=0 让系统挑一个空闲端口（start() 之后看 self.port / self.base_url）
+    - max_delay: /delay/{n} 最多等多少秒（postman-echo 是 10）
+    - connections / requests: 累计计数，用来断言连接复用
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, max_delay: float = 10.0) -> None:
+        self.host = host
+        self.port = port
+        self.max_delay = max_delay
+        self.connections = 0
+        self.requests = 0
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._server: asyncio.base_events.Server | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    # ------------------ 路由 ------------------ #
+
+    def route(self, req: _Request) -> tuple[int, dict[str, Any], float]:
+        """返回 (状态码, 响应体, 延迟秒数)"""
+        parts = urlsplit(req.target)
+        path = parts.path.rstrip("/") or "/"
+        args = _multi_dict(parse_qsl(parts.query, keep_blank_values=True))
+        host = req.header("host", f"{self.host}:{self.port}")
+        url = f"http://{host}{req.target}"
+
+        if path.startswith("/status/"):
+            code = path[len("/status/"):]
+            if not code.isdigit() or not 100 <= int(code) <= 599:
+                return 400, {"error": f"invalid status code {code!r}"}, 0.0
+            return int(code), {"status": int(code)}, 0.0
+
+        if path.startswith("/delay/"):
+            raw = path[len("/delay/"):]
+            try:
+                seconds = float(raw)
+            except ValueError:
+                return 400, {"error": f"invalid delay {raw!r}"}, 0.0
+            return 200, {"delay": raw}, max(0.0, min(seconds, self.max_delay))
+
+        headers = dict(req.headers)
+        if path == "/get" and req.method in ("GET", "HEAD"):
+            return 200, {"args": args, "headers": headers, "url": url}, 0.0
+
+        if _BODY_METHODS.get(req.method) == path:
+            return 200, {"args": args, **self._echo_body(req), "headers": headers, "url": url}, 0.0
+
+        return 404, {"error": f"no route for {req.method} {path}"}, 0.0
+
+    @staticmethod
+    def _echo_body(req: _Request) -> dict[str, Any]:
+        content_type = req.header("content-type").split(";")[0].strip().lower()
+        text = req.body.decode("utf-8", errors="replace")
+        data: Any = text
+        form: dict[str, Any] = {}
+        parsed_json: Any = None
+        if content_type == "application/json" and req.body:
+            try:
+                parsed_json = json_codec.loads(req.body)
+                data = parsed_json
+            except ValueError:
+                pass
+        elif content_type == "application/x-www-form-urlencoded":
+            form = _multi_dict(parse_qsl(text, keep_blank_values=True))
+            data = ""
+        return {"data": data, "files": {}, "form": form, "json": parsed_json}
+
+    # ------------------ 启停 ------------------ #
+
+    async def serve(self) -> None:
+        """在当前 event loop 里启动监听（不阻塞）"""
+        loop = asyncio.get_running_loop()
+        self._loop = loop
+        self._server = await loop.create_server(lambda: _EchoProtocol(self), self.host, self.port, backlog=1024)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        await self.serve()
+        assert self._server is not None
+        async with self._server:
+            await self._server.serve_forever()
+
+    def start(self) -> EchoServer:
+        """后台线程里起一个独立的 event loop；同步测试 / fixture 用"""
+        ready = threading.Event()
+        errors: list[BaseException] = []
+
+        def _run() -> None:
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            try:
+                loop.run_until_complete(self.serve())
+            except BaseException as e:  # noqa: BLE001 - 交给 start() 抛出
+                errors.append(e)
+                ready.set()
+                loop.close()
+                return
+            ready.set()
+            loop.run_forever()
+            assert self._server is not None
+            self._server.close()
+            loop.run_until_complete(self._server.wait_closed())
+            loop.close()
+
+        self._thread = threading.Thread(target=_run, name="echo-server", daemon=True)
+        self._thread.start()
+        ready.wait()
+        if errors:
+            raise errors[0]
+        return self
+
+    def close(self) -> None:
+        if self._loop is not None and self._thread is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def __enter__(self) -> EchoServer:
+        return self.start()
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="local postman-echo stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--max-delay", type=float, default=10.0)
+    args = parser.parse_args(argv)
+
+    server = EchoServer(args.host, args.port, args.max_delay)
+    print(f"echo server listening on http://{args.host}:{args.port}", flush=True)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+# autofw/utils/h2_adapter.py
+"""
+HTTP/2 传输：挂在 requests.Session 上的 adapter，底层用 httpx（http2=True，需要 h2 包）。
+
+requests / urllib3 只会 HTTP/1.1：一个在飞的请求占一条 TCP 连接，并发 100 就得 100 条连接。
+HTTP/2 一条连接上多路复用很多 stream，连接池层面不再有队头阻塞。
+
+- 只替换“发出去”这一步：APIClient._request 的重试 / 覆盖 / 熔断 / 限速 / 计时逻辑都不变
+- 异常转换成 requests 的异常（ConnectTimeout / ReadTimeout / ConnectionError），retry_exceptions 照常生效
+- Set-Cookie 照样写回 session.cookies；stream=True 照样可以 iter_content
+- prior_knowledge=True：明文 http:// 直接说 HTTP/2（h2c），本地 / sidecar 服务用；
+  否则 https 靠 ALPN 协商，服务端不支持时自动退回 HTTP/1.1
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from http.client import HTTPMessage
+from typing import Any
+
+import httpx
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# HTTP/2 禁止的逐跳头（requests 默认会带 Connection: keep-alive）
+_HOP_BY_HOP = frozenset({"connection", "keep-alive", "proxy-connection", "transfer-encoding", "upgrade", "te"})
+
+
+class OriginalResponse:
+    """
+    requests 从 raw._original_response.msg 里读 Set-Cookie（写回 session.cookies），
+    不是 urllib3 的 raw 时用它补上这一个字段。headers: (key, value) 列表，同名头可以出现多次
+    """
+
+    def __init__(self, headers: Iterable[tuple[str, str]]) -> None:
+        self.msg = HTTPMessage()
+        for key, value in headers:
+            self.msg[key] = value
+
+
+class _HttpxRaw:
+    """充当 requests.Response.raw：iter_content 会调用 stream()，close() 会调用 close()"""
+
+    def __init__(self, resp: httpx.Response) -> None:
+        self._resp = resp
+        self._original_response = OriginalResponse(resp.headers.multi_items())
+
+    def stream(self, chunk_size: int | None = None, decode_content: bool = True) -> Iterator[bytes]:
+        # httpx 的 iter_bytes 已经处理了 gzip / deflate 解压
+        yield from self._resp.iter_bytes(chunk_size)
+
+    def read(self, amt: int | None = None, decode_content: bool = True) -> bytes:
+        return self._resp.read()
+
+    def close(self) -> None:
+        self._resp.close()
+
+    def release_conn(self) -> None:
+        self._resp.close()
+
+
+def _to_httpx_timeout(timeout: Any) -> httpx.Timeout:
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return httpx.Timeout(read, connect=connect)
+    return httpx.Timeout(timeout)
+
+
+class HTTP2Adapter(BaseAdapter):
+    """
+    - max_connections: 每个 client 最多开多少条连接（HTTP/2 下一个 host 通常 1 条就够）
+    - prior_knowledge: True = 明文 http:// 也直接用 HTTP/2（h2c）
+    - verify: TLS 校验，client 级（requests 的请求级 verify 参数这里不生效）
+    """
+
+    def __init__(self, max_connections: int = 10, prior_knowledge: bool = False, verify: bool | str = True) -> None:
+        super().__init__()
+        try:
+            self.client = httpx.Client(
+                http2=True,
+                http1=not prior_knowledge,
+                verify=verify,
+                trust_env=False,
+                limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            )
+        except ImportError as e:
+            raise ImportError("HTTP/2 transport needs the 'h2' package: pip install h2") from e
+
+    def send(
+            self,
+            request: requests.PreparedRequest,
+            stream: bool = False,
+            timeout: Any = None,
+            verify: bool | str = True,
+            cert: Any = None,
+            proxies: Any = None,
+    ) -> requests.Response:
+        headers = [(k, v) for k, v in request.headers.items() if k.lower() not in _HOP_BY_HOP]
+        try:
+            h_req = self.client.build_request(
+                request.method or "GET",
+                request.url or "",
+                headers=headers,
+                content=request.body,
+                timeout=_to_httpx_timeout(timeout),
+            )
+            h_resp = self.client.send(h_req, stream=True)
+            if not stream:
+                h_resp.read()
+        except httpx.ConnectTimeout as e:
+            raise requests.exceptions.ConnectTimeout(e, request=request) from e
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.ReadTimeout(e, request=request) from e
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(e, request=request) from e
+        return self._build_response(request, h_resp, stream)
+
+    def _build_response(self, request: requests.PreparedRequest, h_resp: httpx.Response, stream: bool) -> requests.Response:
+        resp = requests.Response()
+        resp.status_code = h_resp.status_code
+        resp.headers = CaseInsensitiveDict(h_resp.headers)
+        resp.encoding = get_encoding_from_headers(resp.headers)
+        resp.reason = h_resp.reason_phrase
+        resp.url = request.url or ""
+        resp.request = request
+        resp.connection = self
+        resp.raw = _HttpxRaw(h_resp)
+        resp.http_version = h_resp.http_version
+        if not stream:
+            resp._content = h_resp.content
+            resp._content_consumed = True
+            h_resp.close()
+        return resp
+
+    def close(self) -> None:
+        self.client.close()
@@ -0,0 +1,126 @@
+# autofw/utils/hedging.py
+"""
+对冲请求（hedged requests），只用于幂等的 GET：
+
+- 主请求发出后等 delay 秒还没回来，就再发一个一模一样的请求，谁先成功用谁
+- delay 可以固定，也可以用最近主请求耗时的 p95（样本不够时先不对冲）
+- 额外请求量有上限：复用 RetryBudget 的令牌桶，比如 max_extra_ratio=0.05 ≈ 对冲最多占 5%
+- 统计 hedges_fired / hedges_won / hedges_denied
+- 主请求和对冲请求各用一个线程池：主请求把线程占满时（比如 map() 里大批对冲 GET 都卡在慢的主请求上），
+  对冲请求不会排在它们后面
+
+目的：砍掉 p99 长尾，而不是把平均负载翻倍。
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from autofw.utils.retry_policy import RetryBudget
+
+
+class HedgePolicy:
+    def __init__(
+            self,
+            delay: float | None = None,
+            percentile: float = 95.0,
+            min_samples: int = 20,
+            sample_size: int = 512,
+            min_delay: float = 0.01,
+            max_extra_ratio: float = 0.05,
+            min_tokens: float = 5.0,
+            max_workers: int = 32,
+    ) -> None:
+        self.delay = delay
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.max_workers = max_workers
+
+        self._samples: deque[float] = deque(maxlen=sample_size)
+        self._since_recompute = 0
+        self._observed_delay: float | None = None
+        self._budget = RetryBudget(ratio=max_extra_ratio, min_tokens=min_tokens,
+                                   max_tokens=max(min_tokens, 100.0))
+        self._executor: ThreadPoolExecutor | None = None
+        self._backup_executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+        self.requests = 0
+        self.hedges_fired = 0
+        self.hedges_won = 0
+        self.hedges_denied = 0
+
+    # ------------------ 延迟 ------------------ #
+
+    def record_latency(self, seconds: float) -> None:
+        """记录主请求耗时，用来估 p95；每 16 个样本重算一次，避免每个请求都排序"""
+        with self._lock:
+            self._samples.append(seconds)
+            self._since_recompute += 1
+            if self._since_recompute >= 16 or self._observed_delay is None:
+                self._since_recompute = 0
+                self._observed_delay = self._percentile_locked()
+
+    def _percentile_locked(self) -> float | None:
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        idx = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+        return max(self.min_delay, ordered[idx])
+
+    def current_delay(self) -> float | None:
+        """None = 现在不对冲（没配固定 delay 且样本还不够）"""
+        if self.delay is not None:
+            return self.delay
+        with self._lock:
+            return self._observed_delay
+
+    # ------------------ 预算 & 统计 ------------------ #
+
+    def record_request(self) -> None:
+        self._budget.record_request()
+        with self._lock:
+            self.requests += 1
+
+    def try_hedge(self) -> bool:
+        allowed = self._budget.try_spend()
+        with self._lock:
+            if allowed:
+                self.hedges_fired += 1
+            else:
+                self.hedges_denied += 1
+        return allowed
+
+    def record_won(self) -> None:
+        with self._lock:
+            self.hedges_won += 1
+
+    def executor(self) -> ThreadPoolExecutor:
+        """主请求用的线程池"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix="apiclient-hedge")
+            return self._executor
+
+    def backup_executor(self) -> ThreadPoolExecutor:
+        """对冲请求专用的线程池，不和主请求抢线程"""
+        with self._lock:
+            if self._backup_executor is None:
+                self._backup_executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                           thread_name_prefix="apiclient-hedge-backup")
+            return self._backup_executor
+
+    def stats(self) -> dict[str, float | None]:
+        delay = self.current_delay()
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "hedges_fired": self.hedges_fired,
+                "hedges_won": self.hedges_won,
+                "hedges_denied": self.hedges_denied,
+                "delay_ms": None if delay is None else round(delay * 1000, 3),
+            }
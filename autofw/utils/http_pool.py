@@ -0,0 +1,297 @@
+# autofw/utils/http_pool.py
+"""
+APIClient 用的连接池适配器：
+
+- PooledHTTPAdapter：可配置 pool_connections / pool_maxsize / pool_block 的 HTTPAdapter
+- PoolStats：连接池运行时统计（新建 / 复用 / 丢弃 / 等待连接耗时）
+- 连接类顺手记录分阶段耗时（dns / connect / tls / ttfb），写进 autofw.utils.timing 的当前 attempt
+- dns_cache：建连时先查 autofw.utils.dns_cache 的缓存；warm()：提前建好 keep-alive 连接
+
+用来回答两个问题：
+1. keep-alive 连接到底有没有复用上？
+2. 并发起来以后连接池是不是不够用（频繁丢弃 / 排队等连接）？
+"""
+
+from __future__ import annotations
+
+import socket
+import threading
+import time
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.poolmanager import PoolManager
+
+from autofw.utils.dns_cache import DNSCache
+from autofw.utils.timing import current_timing
+
+
+class PoolStats:
+    """线程安全的连接池计数器"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0  # 从池子里取连接的次数（≈ 请求数）
+            self.opened = 0  # 需要新建 TCP 连接的次数
+            self.reused = 0  # 直接复用 keep-alive 连接的次数
+            self.discarded = 0  # 没能放回池子、被关闭丢弃的连接数
+            self.warmed = 0  # warm() 提前建好的连接数（不算在 checkouts / opened 里）
+            self.wait_s_total = 0.0  # 等待可用连接的总耗时
+            self.wait_s_max = 0.0
+
+    def record_checkout(self, *, reused: bool, waited_s: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            if reused:
+                self.reused += 1
+            else:
+                self.opened += 1
+            self.wait_s_total += waited_s
+            if waited_s > self.wait_s_max:
+                self.wait_s_max = waited_s
+
+    def record_discard(self) -> None:
+        with self._lock:
+            self.discarded += 1
+
+    def record_warm(self, n: int) -> None:
+        with self._lock:
+            self.warmed += n
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.checkouts,
+                "connections_opened": self.opened,
+                "connections_reused": self.reused,
+                "connections_discarded": self.discarded,
+                "connections_warmed": self.warmed,
+                "pool_wait_ms_total": round(self.wait_s_total * 1000, 3),
+                "pool_wait_ms_max": round(self.wait_s_max * 1000, 3),
+            }
+
+
+class _TimedConnectionMixin:
+    """
+    记录建连各阶段耗时：
+    - dns: 自己先 getaddrinfo（计时），再按解析出的地址逐个建 TCP 连接（计时）
+    - tls: connect() 总耗时减去 dns + tcp
+    - ttfb: 发请求 / 建完连接（取较晚者）到收到响应头
+    不在 APIClient 请求里（current_timing() 为 None）且没有 dns_cache 时完全走 urllib3 原逻辑。
+    """
+
+    dns_cache: DNSCache | None = None
+
+    def _new_conn(self):
+        timing = current_timing()
+        cache = self.dns_cache
+        if timing is None and cache is None:
+            return super()._new_conn()
+
+        start = time.perf_counter()
+        try:
+            if cache is not None:
+                infos = cache.resolve(self._dns_host, self.port)
+            else:
+                infos = socket.getaddrinfo(self._dns_host, self.port, 0, socket.SOCK_STREAM)
+        except OSError:
+            # 解析失败交给 urllib3，让它抛原来的 NameResolutionError
+            return super()._new_conn()
+        resolved = time.perf_counter()
+        if timing is not None:
+            timing.dns_ms = round((resolved - start) * 1000, 3)
+
+        original = self._dns_host
+        last_exc: BaseException | None = None
+        sock = None
+        try:
+            for *_, sockaddr in infos:
+                self._dns_host = sockaddr[0]
+                try:
+                    sock = super()._new_conn()
+                    break
+                except (NewConnectionError, ConnectTimeoutError) as e:
+                    last_exc = e
+        finally:
+            self._dns_host = original
+        if sock is None:
+            raise last_exc or NewConnectionError(self, "no address resolved")
+
+        if timing is not None:
+            timing.connect_ms = round((time.perf_counter() - resolved) * 1000, 3)
+        return sock
+
+    def connect(self) -> None:
+        timing = current_timing()
+        start = time.perf_counter()
+        super().connect()
+        if timing is not None:
+            now = time.perf_counter()
+            timing.reused = False
+            timing.tls_ms = round(max(0.0, (now - start) * 1000 - timing.dns_ms - timing.connect_ms), 3)
+            timing._connected_at = now
+
+    def request(self, *args: Any, **kwargs: Any) -> None:
+        timing = current_timing()
+        if timing is not None:
+            timing._sent_at = time.perf_counter()
+        super().request(*args, **kwargs)
+
+    def getresponse(self, *args: Any, **kwargs: Any):
+        resp = super().getresponse(*args, **kwargs)
+        timing = current_timing()
+        if timing is not None:
+            now = time.perf_counter()
+            timing._headers_at = now
+            timing.ttfb_ms = round((now - max(timing._sent_at, timing._connected_at)) * 1000, 3)
+        return resp
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _StatsPoolMixin:
+    """挂在 urllib3 连接池上，在取/还连接时记账"""
+
+    stats: PoolStats | None = None
+    dns_cache: DNSCache | None = None
+
+    def _new_conn(self):
+        conn = super()._new_conn()
+        conn.dns_cache = self.dns_cache
+        return conn
+
+    def _get_conn(self, timeout: float | None = None):
+        start = time.perf_counter()
+        conn = super()._get_conn(timeout)
+        waited_s = time.perf_counter() - start
+        # sock 还在 = 拿到的是一条已建立的 keep-alive 连接
+        reused = getattr(conn, "sock", None) is not None
+        if self.stats is not None:
+            self.stats.record_checkout(reused=reused, waited_s=waited_s)
+        timing = current_timing()
+        if timing is not None:
+            timing.pool_wait_ms = round(waited_s * 1000, 3)
+            if reused:
+                timing.reused = True
+        return conn
+
+    def _put_conn(self, conn) -> None:
+        if self.stats is not None:
+            pool = self.pool
+            # conn=None：出错后连接已被关闭；池子满/已关闭：连接会被直接丢弃
+            if conn is None or pool is None or pool.full():
+                self.stats.record_discard()
+        super()._put_conn(conn)
+
+    def prewarm(self, n: int, timeout: float) -> int:
+        """
+        建好 n 条连接（DNS + TCP + TLS）放回池子，之后的请求直接复用。
+        绕开上面的记账，不算在 requests / connections_opened 里；返回实际新建的条数。
+        """
+        n = min(n, self.pool.maxsize) if self.pool is not None else 0
+        conns = []
+        opened = 0
+        try:
+            for _ in range(n):
+                conn = super()._get_conn(timeout)
+                conns.append(conn)
+                if getattr(conn, "sock", None) is None:
+                    conn.timeout = timeout
+                    conn.connect()
+                    opened += 1
+        finally:
+            for conn in conns:
+                super()._put_conn(conn)
+            if self.stats is not None:
+                self.stats.record_warm(opened)
+        return opened
+
+
+class _StatsHTTPConnectionPool(_StatsPoolMixin, HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class _StatsHTTPSConnectionPool(_StatsPoolMixin, HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class _StatsPoolManager(PoolManager):
+    def __init__(self, *args: Any, stats: PoolStats, dns_cache: DNSCache | None = None, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = stats
+        self.dns_cache = dns_cache
+        self.pool_classes_by_scheme = {
+            "http": _StatsHTTPConnectionPool,
+            "https": _StatsHTTPSConnectionPool,
+        }
+
+    def _new_pool(self, scheme, host, port, request_context=None):
+        pool = super()._new_pool(scheme, host, port, request_context=request_context)
+        pool.stats = self.stats
+        pool.dns_cache = self.dns_cache
+        return pool
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    带统计的 HTTPAdapter：
+
+    - pool_connections: 缓存多少个 host 的连接池
+    - pool_maxsize: 每个 host 最多保留多少条连接
+    - pool_block: 池子用完时 True=排队等连接 / False=临时新建（用完多出来的会被丢弃）
+    - dns_cache: 建新连接时用的 DNS 缓存（None = 每次都解析）
+    """
+
+    def __init__(
+            self,
+            pool_connections: int = 10,
+            pool_maxsize: int = 10,
+            pool_block: bool = False,
+            dns_cache: DNSCache | None = None,
+            **kwargs: Any,
+    ) -> None:
+        self.stats = PoolStats()
+        self.dns_cache = dns_cache
+        super().__init__(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            **kwargs,
+        )
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+
+        self.poolmanager = _StatsPoolManager(
+            num_pools=connections,
+            maxsize=maxsize,
+            block=block,
+            stats=self.stats,
+            dns_cache=self.dns_cache,
+            **pool_kwargs,
+        )
+
+    def warm(self, request: requests.PreparedRequest, n: int, timeout: float, verify: bool | str = True) -> int:
+        """给 request 对应的连接池（和真实请求用的是同一个）提前建好 n 条连接"""
+        if hasattr(self, "get_connection_with_tls_context"):
+            pool = self.get_connection_with_tls_context(request, verify)
+        else:
+            # requests < 2.32.2 没有这个方法；老接口按 URL 取同一个池子，证书校验在发请求时才配
+            pool = self.get_connection(request.url)
+        return pool.prewarm(n, timeout)
@@ -0,0 +1,144 @@
+# autofw/utils/json_codec.py
+"""
+JSON 编解码统一入口：装了 orjson 就用 orjson，否则退回标准库 json。
+
+- APIClient：json= 请求体用它编码；响应的 resp.json() 用它解析（见 memo_response.MemoResponse）
+- build_response / 流式 NDJSON 也走这里
+- 环境变量 AUTOFW_JSON_BACKEND=stdlib|orjson 可以强制指定（对比 / 排查用）
+
+两个后端输出一致：UTF-8、不转义中文、紧凑分隔符（没有多余空格）。
+orjson 不支持的类型（Decimal 等）自动退回标准库编码，行为不比原来差。
+NaN / Infinity 不是合法 JSON：两个后端都抛 ValueError（orjson 自己会悄悄写成 null，这里查出来照样抛）；
+经 CodecSession 发送时和原来的 requests 一样是 requests.exceptions.InvalidJSONError。
+
+对比耗时：make bench（perf/bench_json_codec.py）
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+from collections.abc import Mapping
+from typing import Any
+
+import requests
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - 取决于环境
+    orjson = None
+
+BACKENDS = ("orjson", "stdlib")
+
+
+class JSONCodec:
+    """标准库实现；子类替换 dumps / loads"""
+
+    name = "stdlib"
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode("utf-8")
+
+    def loads(self, data: bytes | bytearray | str) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    name = "orjson"
+
+    def dumps(self, obj: Any) -> bytes:
+        try:
+            out = orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # Decimal / 自定义类型等：交给标准库（同样不支持就照常抛 TypeError）
+            return super().dumps(obj)
+        # orjson 把 NaN / Infinity 写成 null；输出里有 null 才去翻一遍原对象
+        if b"null" in out and _has_non_finite(obj):
+            raise ValueError("Out of range float values are not JSON compliant")
+        return out
+
+    def loads(self, data: bytes | bytearray | str) -> Any:
+        return orjson.loads(data)
+
+
+def _has_non_finite(obj: Any) -> bool:
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, float):
+            if not math.isfinite(item):
+                return True
+        elif isinstance(item, Mapping):
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return False
+
+
+def get_codec(name: str | None = None) -> JSONCodec:
+    """
+    name: orjson / stdlib；None = 看 AUTOFW_JSON_BACKEND，再不行自动选（有 orjson 就用）
+    """
+    name = (name or os.environ.get("AUTOFW_JSON_BACKEND") or "").strip().lower()
+    if name and name not in BACKENDS:
+        raise ValueError(f"Invalid JSON backend: {name!r}, expected one of {BACKENDS}")
+    if name == "orjson" and orjson is None:
+        raise ValueError("AUTOFW_JSON_BACKEND=orjson but orjson is not installed")
+    if name == "stdlib" or orjson is None:
+        return _STDLIB
+    return _ORJSON
+
+
+_STDLIB = JSONCodec()
+_ORJSON = OrjsonCodec() if orjson is not None else _STDLIB
+_default = get_codec()
+
+
+def dumps(obj: Any) -> bytes:
+    return _default.dumps(obj)
+
+
+def loads(data: bytes | bytearray | str) -> Any:
+    return _default.loads(data)
+
+
+class CodecSession(requests.Session):
+    """
+    requests.Session + json= 请求体用 codec 编码（requests 自己用的是标准库 json）。
+
+    在 prepare_request 里换掉，所以 mock session.request 的用例看到的仍然是 json= 参数。
+    和 requests 一样：同时传了 data 时以 data 为准。
+    """
+
+    def __init__(self, codec: JSONCodec | None = None) -> None:
+        super().__init__()
+        self.json_codec = codec or _default
+
+    def prepare_request(self, request: requests.Request) -> requests.PreparedRequest:
+        if request.json is not None and not request.data:
+            try:
+                request.data = self.json_codec.dumps(request.json)
+            except ValueError as e:
+                # 和 requests 自己编码 json= 时一样的异常类型
+                raise requests.exceptions.InvalidJSONError(e, request=request) from e
+            request.json = None
+            if not any(k.lower() == "content-type" for k in request.headers or {}):
+                request.headers = {**(request.headers or {}), "Content-Type": "application/json"}
+        return super().prepare_request(request)
+
+
+def response_json(resp: requests.Response, codec: JSONCodec | None = None) -> Any:
+    """
+    resp.json() 的快速版本：直接解析 resp.content（UTF-8 / 没声明编码时）。
+    其它编码 / 解析失败时退回 requests 自己的 Response.json()，报错类型和原来一样
+    （requests.exceptions.JSONDecodeError）。
+    """
+    codec = codec or _default
+    encoding = (resp.encoding or "utf-8").lower().replace("_", "-")
+    if encoding in ("utf-8", "utf8"):
+        try:
+            return codec.loads(resp.content)
+        except ValueError:
+            pass
+    return requests.Response.json(resp)
@@ -0,0 +1,358 @@
+# autofw/utils/json_path.py
+"""
+编译好的 JSON 路径表达式：路径字符串只解析一次（compile_path 带缓存），之后对任意多个 body 求值。
+
+语法（兼容原来 assert_json_value 的点号路径）：
+- json.user.id            dict 的 key；遇到 list 时数字段当下标：items.0.id
+- items.-1.id / items[-1] 负数下标
+- items.*.id / items[*]   通配：list 的每个元素 / dict 的每个 value
+- items[1:3] / items[::2] 切片
+- items[?status=="active"].id   过滤：字段 op 字面量，op 支持 == != > >= < <=
+- items[?tags]            过滤：字段存在且为真；@ 表示元素本身：nums[?@>3]
+- ["a.b"]                 带点号 / 特殊字符的 key 用引号
+
+和原来 assert_json_value 的点号路径（按 "." 切开、每段都当 key）不一样的地方：
+- 单独一段 * 是通配，不再是名叫 "*" 的 key；要取这个 key 写 ["*"]（a*b 这种只是含 * 的段仍是普通 key）
+- 段里的 [ 开始一个方括号表达式，key 里带 [ 的要写成 ["a[0]"]
+- 只有 -?数字 的段在 list 上当下标
+- 空路径（""、"."）直接 ValueError，不会返回整个 body
+
+求值：
+- get(data): 严格模式。单值路径返回那个值；带通配 / 切片 / 过滤的路径返回列表。
+  中间任何一步走不下去就抛 AssertionError，信息里带具体位置（比如 items[3].id）
+- find(data): 宽松模式，走不下去的分支直接跳过，返回所有匹配值的列表
+
+实现：每一步对“当前所有候选值”批量处理（一万个元素的 items.*.id 是两次列表推导，
+不是一万次逐个解析路径）；出错时才用慢路径重新走一遍，算出出错位置。
+"""
+
+from __future__ import annotations
+
+import json
+import operator
+import re
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from functools import lru_cache
+from typing import Any
+
+_STR_TYPES = (str, bytes, bytearray)
+
+_FILTER = re.compile(r"^\s*(?P<field>[^=!<>\s]+)\s*(?:(?P<op>==|!=|>=|<=|>|<)\s*(?P<value>.+?))?\s*$")
+_OPS: dict[str, Callable[[Any, Any], bool]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+}
+
+
+class _Miss(Exception):
+    """严格模式下某一步走不下去（内部用，最后转成 AssertionError）"""
+
+
+def _is_seq(value: Any) -> bool:
+    return isinstance(value, Sequence) and not isinstance(value, _STR_TYPES)
+
+
+def _brief(value: Any, limit: int = 120) -> str:
+    text = repr(value)
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+# ------------------ 路径的每一步 ------------------ #
+
+class _Step(ABC):
+    multi = False
+
+    @abstractmethod
+    def children(self, value: Any) -> Iterator[tuple[str, Any]]:
+        """慢路径：逐个产出 (位置标签, 子值)；严格模式下走不下去抛 _Miss"""
+
+    def apply(self, values: list[Any], strict: bool) -> list[Any]:
+        """快路径：对所有候选值批量求值"""
+        out: list[Any] = []
+        for value in values:
+            try:
+                out.extend(child for _, child in self.children(value))
+            except _Miss:
+                if strict:
+                    raise
+        return out
+
+
+class _Key(_Step):
+    """dict 的 key；当前值是 list 且 key 是整数时按下标取（兼容 items.0.id）"""
+
+    def __init__(self, name: str, quoted: bool = False) -> None:
+        self.name = name
+        self.index = None if quoted else _as_int(name)
+
+    def children(self, value: Any) -> Iterator[tuple[str, Any]]:
+        if isinstance(value, Mapping):
+            if self.name not in value:
+                raise _Miss(f"missing key {self.name!r}; keys={_brief(list(value))}")
+            yield f".{self.name}", value[self.name]
+        elif _is_seq(value):
+            if self.index is None:
+                raise _Miss(f"expects list index, got {self.name!r}; list length={len(value)}")
+            yield from _Index(self.index).children(value)
+        else:
+            raise _Miss(f"cannot descend into {type(value).__name__} {_brief(value)}")
+
+    def apply(self, values: list[Any], strict: bool) -> list[Any]:
+        name = self.name
+        out = []
+        for value in values:
+            # 绝大多数是普通 dict：直接取，不走 isinstance 链
+            if type(value) is dict and name in value:
+                out.append(value[name])
+                continue
+            try:
+                out.extend(child for _, child in self.children(value))
+            except _Miss:
+                if strict:
+                    raise
+        return out
+
+
+class _Index(_Step):
+    def __init__(self, index: int) -> None:
+        self.index = index
+
+    def children(self, value: Any) -> Iterator[tuple[str, Any]]:
+        if not _is_seq(value):
+            raise _Miss(f"index [{self.index}] on {type(value).__name__} {_brief(value)}")
+        try:
+            child = value[self.index]
+        except IndexError:
+            raise _Miss(f"index {self.index} out of range for list of length {len(value)}") from None
+        yield f"[{self.index}]", child
+
+
+class _Wildcard(_Step):
+    multi = True
+
+    def children(self, value: Any) -> Iterator[tuple[str, Any]]:
+        if isinstance(value, Mapping):
+            for key, child in value.items():
+                yield f".{key}", child
+        elif _is_seq(value):
+            for i, child in enumerate(value):
+                yield f"[{i}]", child
+        else:
+            raise _Miss(f"wildcard on {type(value).__name__} {_brief(value)}")
+
+    def apply(self, values: list[Any], strict: bool) -> list[Any]:
+        out: list[Any] = []
+        for value in values:
+            if type(value) is list:
+                out.extend(value)
+            elif type(value) is dict:
+                out.extend(value.values())
+            else:
+                try:
+                    out.extend(child for _, child in self.children(value))
+                except _Miss:
+                    if strict:
+                        raise
+        return out
+
+
+class _Slice(_Step):
+    multi = True
+
+    def __init__(self, start: int | None, stop: int | None, step: int | None) -> None:
+        self.slice = slice(start, stop, step)
+
+    def children(self, value: Any) -> Iterator[tuple[str, Any]]:
+        if not _is_seq(value):
+            raise _Miss(f"slice on {type(value).__name__} {_brief(value)}")
+        for i in range(*self.slice.indices(len(value))):
+            yield f"[{i}]", value[i]
+
+
+class _Filter(_Step):
+    multi = True
+
+    def __init__(self, expr: str) -> None:
+        m = _FILTER.match(expr)
+        if not m:
+            raise ValueError(f"invalid filter expression {expr!r}")
+        field = m.group("field")
+        self.field = None if field == "@" else compile_path(field.removeprefix("@."))
+        self.op = _OPS[m.group("op")] if m.group("op") else None
+        self.value = _literal(m.group("value")) if m.group("value") is not None else None
+
+    def _match(self, item: Any) -> bool:
+        if self.field is None:
+            candidates = [item]
+        else:
+            candidates = self.field.find(item)
+            if not candidates:
+                return False
+        actual = candidates[0]
+        if self.op is None:
+            return bool(actual)
+        try:
+            return bool(self.op(actual, self.value))
+        except TypeError:
+            # None > 3 之类：不可比较就当不匹配
+            return False
+
+    def children(self, value: Any) -> Iterator[tuple[str, Any]]:
+        if isinstance(value, Mapping):
+            pairs: Iterator[tuple[str, Any]] = ((f".{k}", v) for k, v in value.items())
+        elif _is_seq(value):
+            pairs = ((f"[{i}]", v) for i, v in enumerate(value))
+        else:
+            raise _Miss(f"filter on {type(value).__name__} {_brief(value)}")
+        for label, child in pairs:
+            if self._match(child):
+                yield label, child
+
+
+_INT_RE = re.compile(r"-?[0-9]+")
+
+
+def _as_int(text: str) -> int | None:
+    """只认 -?数字；int() 会放过的 "1_000" / " 1" / "+1" 都当普通 key"""
+    if _INT_RE.fullmatch(text) is None:
+        return None
+    return int(text)
+
+
+def _literal(text: str) -> Any:
+    """过滤条件右边的值：JSON 字面量；单引号字符串；其它裸词当字符串"""
+    text = text.strip()
+    if len(text) >= 2 and text[0] == text[-1] == "'":
+        return text[1:-1]
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+# ------------------ 解析 ------------------ #
+
+def _bracket(content: str) -> _Step:
+    content = content.strip()
+    if content == "*":
+        return _Wildcard()
+    if content.startswith("?"):
+        return _Filter(content[1:])
+    if len(content) >= 2 and content[0] == content[-1] and content[0] in "'\"":
+        return _Key(content[1:-1], quoted=True)
+    if ":" in content:
+        parts = [p.strip() for p in content.split(":")]
+        if len(parts) > 3:
+            raise ValueError(f"invalid slice [{content}]")
+        bounds = [_as_int(p) if p else None for p in parts]
+        if any(b is None and p for b, p in zip(bounds, parts, strict=True)):
+            raise ValueError(f"invalid slice [{content}]")
+        bounds += [None] * (3 - len(parts))
+        return _Slice(*bounds)
+    index = _as_int(content)
+    if index is None:
+        raise ValueError(f"invalid bracket [{content}]: expected index, slice, *, ?filter or quoted key")
+    return _Index(index)
+
+
+def _parse(path: str) -> list[_Step]:
+    steps: list[_Step] = []
+    i, n = 0, len(path)
+    name = ""
+    while i < n:
+        ch = path[i]
+        if ch == ".":
+            if name:
+                steps.append(_Wildcard() if name == "*" else _Key(name))
+                name = ""
+            i += 1
+        elif ch == "[":
+            if name:
+                steps.append(_Wildcard() if name == "*" else _Key(name))
+                name = ""
+            # 找配对的 ]，跳过引号里的内容（过滤条件里可能有 ] 或 .）
+            j, quote = i + 1, ""
+            while j < n and (quote or path[j] != "]"):
+                if quote and path[j] == quote:
+                    quote = ""
+                elif not quote and path[j] in "'\"":
+                    quote = path[j]
+                j += 1
+            if j >= n:
+                raise ValueError(f"unclosed '[' in path {path!r}")
+            steps.append(_bracket(path[i + 1:j]))
+            i = j + 1
+        else:
+            name += ch
+            i += 1
+    if name:
+        steps.append(_Wildcard() if name == "*" else _Key(name))
+    if not steps:
+        raise ValueError(f"empty path {path!r}: use at least one key, index or [*]")
+    return steps
+
+
+class JSONPath:
+    """用 compile_path(path) 拿（有缓存），不用直接构造"""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.steps = tuple(_parse(path))
+        self.is_singular = not any(step.multi for step in self.steps)
+
+    def __repr__(self) -> str:
+        return f"JSONPath({self.path!r})"
+
+    def find(self, data: Any) -> list[Any]:
+        values = [data]
+        for step in self.steps:
+            values = step.apply(values, strict=False)
+            if not values:
+                break
+        return values
+
+    def get(self, data: Any) -> Any:
+        values = [data]
+        try:
+            for step in self.steps:
+                values = step.apply(values, strict=True)
+        except _Miss:
+            raise AssertionError(self._explain(data)) from None
+        return values[0] if self.is_singular else values
+
+    def first(self, data: Any, default: Any = None) -> Any:
+        values = self.find(data)
+        return values[0] if values else default
+
+    def _explain(self, data: Any) -> str:
+        """慢路径：带位置重新走一遍，找到第一个走不下去的地方"""
+        frontier: list[tuple[str, Any]] = [("", data)]
+        for step in self.steps:
+            nxt: list[tuple[str, Any]] = []
+            for loc, value in frontier:
+                try:
+                    nxt.extend((loc + label, child) for label, child in step.children(value))
+                except _Miss as e:
+                    where = loc.lstrip(".") or "<root>"
+                    return f"Path {self.path!r} not found at {where}: {e}"
+            frontier = nxt
+        return f"Path {self.path!r} not found"
+
+
+@lru_cache(maxsize=1024)
+def compile_path(path: str) -> JSONPath:
+    """解析路径并缓存；语法错误抛 ValueError"""
+    return JSONPath(path)
+
+
+def get_path(data: Any, path: str) -> Any:
+    return compile_path(path).get(data)
+
+
+def find_path(data: Any, path: str) -> list[Any]:
+    return compile_path(path).find(data)
@@ -0,0 +1,550 @@
+# autofw/utils/json_schema.py
+"""
+JSON Schema 校验：schema 文件只解析 / 编译一次，之后每个响应直接调用编译好的校验函数。
+
+- schema 放在 data/schemas/ 下（.json / .yml / .yaml），用相对路径引用：
+      assert_json_schema(body, "echo_post.json")
+  也可以传绝对路径，或者直接传 dict（内联 schema 不缓存，每次编译）
+- 缓存键 = (文件路径, mtime, shallow, 后端)：文件改了自动重新编译，不用重启进程
+- 装了 jsonschema：完整支持各个 draft（validator_for 按 $schema 选）
+- 没装：用内置编译器，支持常用关键字：
+      type / enum / const / properties / required / additionalProperties / patternProperties /
+      min|maxProperties / items / prefixItems / min|maxItems / uniqueItems /
+      min|maxLength / pattern / minimum / maximum / exclusiveMin|Max（含 draft-4 的布尔写法）/ multipleOf /
+      contains / min|maxContains / additionalItems / propertyNames / dependentRequired / dependentSchemas /
+      dependencies / if / then / else / allOf / anyOf / oneOf / not /
+      文档内的 $ref（#/definitions/...、#/$defs/...；旁边的关键字一起检查）
+  format 和注解类关键字（title / description / default ...）不检查；不支持的校验关键字
+  （unevaluatedProperties / unevaluatedItems / $dynamicRef / $recursiveRef、外部 $ref）编译时直接 ValueError，
+  不会悄悄放过
+- 环境变量 AUTOFW_SCHEMA_BACKEND=jsonschema|builtin 可以强制指定（对比 / 排查用）
+
+shallow=True 是快速模式：只查顶层（类型、required、enum 等）和每个顶层字段的 type，
+嵌套的 schema（items / properties 里更深的部分）一律跳过；总是用内置编译器。只关心“响应大体长这样”的用例用它。
+注意顶层数组上的 uniqueItems / contains / min|maxItems 仍然会扫一遍整个数组，只是不再按 items 逐个元素校验。
+
+断言函数在 autofw.utils.assertions.assert_json_schema。
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import re
+from collections.abc import Callable, Mapping, Sequence
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from autofw.utils.data_loader import DATA_DIR
+
+try:
+    import jsonschema
+except ImportError:  # pragma: no cover - 取决于环境
+    jsonschema = None
+
+BACKENDS = ("jsonschema", "builtin")
+SCHEMA_DIR = DATA_DIR / "schemas"
+
+_STR_TYPES = (str, bytes, bytearray)
+# 内置编译器不实现的校验关键字：遇到就报错，不能当成没写
+_UNSUPPORTED_KEYWORDS = ("unevaluatedProperties", "unevaluatedItems", "$dynamicRef", "$recursiveRef")
+
+# 内部用：路径是链表 (parent, key)，只有出错时才拼成 "items[0].id"
+Loc = tuple[Any, Any] | None
+Check = Callable[[Any, Loc, "_Errors"], None]
+
+
+def get_backend(name: str | None = None) -> str:
+    """name: jsonschema / builtin；None = 看 AUTOFW_SCHEMA_BACKEND，再不行自动选（装了 jsonschema 就用）"""
+    name = (name or os.environ.get("AUTOFW_SCHEMA_BACKEND") or "").strip().lower()
+    if name and name not in BACKENDS:
+        raise ValueError(f"Invalid schema backend: {name!r}, expected one of {BACKENDS}")
+    if name == "jsonschema" and jsonschema is None:
+        raise ValueError("schema backend 'jsonschema' requested but jsonschema is not installed")
+    if name == "builtin" or jsonschema is None:
+        return "builtin"
+    return "jsonschema"
+
+
+def _render(loc: Loc) -> str:
+    parts = []
+    while loc is not None:
+        loc, key = loc
+        parts.append(f"[{key}]" if isinstance(key, int) else f".{key}")
+    return "".join(reversed(parts)).lstrip(".") or "<root>"
+
+
+class _Full(Exception):
+    """错误数到上限，提前结束校验"""
+
+
+class _Errors:
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.items: list[str] = []
+
+    def add(self, loc: Loc, message: str) -> None:
+        self.items.append(f"{_render(loc)}: {message}")
+        if len(self.items) >= self.limit:
+            raise _Full
+
+
+def _passes(check: Check, value: Any, loc: Loc) -> bool:
+    """anyOf / oneOf / not 用：只关心过不过，第一个错误就停"""
+    try:
+        check(value, loc, _Errors(1))
+    except _Full:
+        return False
+    return True
+
+
+def _brief(value: Any, limit: int = 80) -> str:
+    text = repr(value)
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+# ------------------ 内置编译器 ------------------ #
+
+def _is_number(v: Any) -> bool:
+    return isinstance(v, (int, float)) and not isinstance(v, bool)
+
+
+_TYPES: dict[str, Callable[[Any], bool]] = {
+    "object": lambda v: isinstance(v, Mapping),
+    "array": lambda v: isinstance(v, Sequence) and not isinstance(v, _STR_TYPES),
+    "string": lambda v: isinstance(v, str),
+    "integer": lambda v: _is_number(v) and (isinstance(v, int) or float(v).is_integer()),
+    "number": _is_number,
+    "boolean": lambda v: isinstance(v, bool),
+    "null": lambda v: v is None,
+}
+
+
+def _json_type(v: Any) -> str:
+    for name in ("null", "boolean", "integer", "number", "string", "array", "object"):
+        if _TYPES[name](v):
+            return name
+    return type(v).__name__
+
+
+def _equal(a: Any, b: Any) -> bool:
+    """JSON 语义的相等：True 不等于 1"""
+    if isinstance(a, bool) or isinstance(b, bool):
+        return type(a) is type(b) and a == b
+    return a == b
+
+
+def _unique_key(v: Any) -> Any:
+    """uniqueItems 用的可哈希键：JSON 语义相等 <=> 键相等（True 和 1 不同，1 和 1.0 相同，对象不看键顺序）"""
+    if isinstance(v, bool):
+        return "boolean", v
+    if isinstance(v, (int, float)):
+        return "number", v
+    if isinstance(v, Mapping):
+        return "object", frozenset((k, _unique_key(x)) for k, x in v.items())
+    if isinstance(v, (list, tuple)):
+        return "array", tuple(_unique_key(x) for x in v)
+    return type(v).__name__, v
+
+
+class _Compiler:
+    def __init__(self, root: Any, max_depth: int | None) -> None:
+        self.root = root
+        self.max_depth = max_depth
+        self._refs: dict[tuple[str, int], Check] = {}
+
+    def compile(self, schema: Any, depth: int = 0) -> Check:
+        if schema is True or schema == {}:
+            return _noop
+        if schema is False:
+            return lambda v, loc, errs: errs.add(loc, "no value allowed here (schema is false)")
+        if not isinstance(schema, Mapping):
+            raise ValueError(f"invalid schema node: {_brief(schema)}")
+        unsupported = [k for k in _UNSUPPORTED_KEYWORDS if k in schema]
+        if unsupported:
+            raise ValueError(f"schema keyword(s) {unsupported} not supported by the builtin backend; "
+                             f"install jsonschema or drop them")
+
+        if "$ref" in schema:
+            # $ref 旁边的关键字也要查（2019-09 之后的语义；老 draft 会忽略它们，这里宁严勿松）
+            siblings = {k: v for k, v in schema.items() if k != "$ref"}
+            return _chain([self._ref(schema["$ref"], depth), self.compile(siblings, depth)])
+
+        checks: list[Check] = []
+        if "type" in schema:
+            checks.append(_type_check(schema["type"]))
+        if self.max_depth is not None and depth >= self.max_depth:
+            # 快速模式：超过深度只看类型
+            return _chain(checks)
+
+        if "enum" in schema:
+            options = list(schema["enum"])
+            checks.append(lambda v, loc, errs: None if any(_equal(v, o) for o in options)
+                          else errs.add(loc, f"{_brief(v)} is not one of {_brief(options)}"))
+        if "const" in schema:
+            const = schema["const"]
+            checks.append(lambda v, loc, errs: None if _equal(v, const)
+                          else errs.add(loc, f"expected const {_brief(const)}, got {_brief(v)}"))
+
+        checks.extend(self._number(schema))
+        checks.extend(self._string(schema))
+        checks.extend(self._array(schema, depth))
+        checks.extend(self._object(schema, depth))
+        checks.extend(self._combinators(schema, depth))
+        checks.extend(self._conditional(schema, depth))
+        return _chain(checks)
+
+    # -- 各类关键字 --
+
+    def _ref(self, ref: str, depth: int) -> Check:
+        if not ref.startswith("#"):
+            raise ValueError(f"only local $ref ('#/...') is supported by the builtin backend, got {ref!r}")
+        depth_key = depth if self.max_depth is not None else 0
+        key = (ref, depth_key)
+        if key not in self._refs:
+            # 先放占位，递归 schema（树 / 链表）引用自己时不会死循环
+            cell: list[Check] = []
+            self._refs[key] = lambda v, loc, errs: cell[0](v, loc, errs)
+            target: Any = self.root
+            for part in ref[1:].lstrip("/").split("/") if ref != "#" else []:
+                part = part.replace("~1", "/").replace("~0", "~")
+                try:
+                    target = target[int(part) if isinstance(target, list) else part]
+                except (KeyError, IndexError, ValueError):
+                    raise ValueError(f"unresolvable $ref {ref!r}") from None
+            cell.append(self.compile(target, depth))
+        return self._refs[key]
+
+    @staticmethod
+    def _number(schema: Mapping[str, Any]) -> list[Check]:
+        bounds = []
+        for key, exclusive_key, inclusive, exclusive in (
+                ("minimum", "exclusiveMinimum", (lambda v, b: v >= b, ">="), (lambda v, b: v > b, ">")),
+                ("maximum", "exclusiveMaximum", (lambda v, b: v <= b, "<="), (lambda v, b: v < b, "<")),
+        ):
+            bound, flag = schema.get(key), schema.get(exclusive_key)
+            if isinstance(flag, bool):
+                # draft-4：exclusiveMinimum / exclusiveMaximum 是布尔值，把 minimum / maximum 变成开区间
+                if flag and bound is None:
+                    raise ValueError(f"{exclusive_key}: true requires {key}")
+                pairs = [(key, exclusive if flag else inclusive, bound)]
+            else:
+                pairs = [(key, inclusive, bound), (exclusive_key, exclusive, flag)]
+            for name, (op, word), value in pairs:
+                if value is None:
+                    continue
+                if not _is_number(value):
+                    # 不认识的写法直接报错，不能悄悄不查
+                    raise ValueError(f"invalid {name}: {_brief(value)}, expected a number")
+                bounds.append((op, value, word))
+        multiple = schema.get("multipleOf")
+        if not bounds and multiple is None:
+            return []
+
+        def check(v: Any, loc: Loc, errs: _Errors) -> None:
+            if not _is_number(v):
+                return
+            for op, bound, word in bounds:
+                if not op(v, bound):
+                    errs.add(loc, f"{v!r} is not {word} {bound!r}")
+            if multiple is not None:
+                q = v / multiple
+                if not (math.isfinite(q) and math.isclose(q, round(q), abs_tol=1e-9)):
+                    errs.add(loc, f"{v!r} is not a multiple of {multiple!r}")
+        return [check]
+
+    @staticmethod
+    def _string(schema: Mapping[str, Any]) -> list[Check]:
+        min_len, max_len = schema.get("minLength"), schema.get("maxLength")
+        pattern = re.compile(schema["pattern"]) if "pattern" in schema else None
+        if min_len is None and max_len is None and pattern is None:
+            return []
+
+        def check(v: Any, loc: Loc, errs: _Errors) -> None:
+            if not isinstance(v, str):
+                return
+            if min_len is not None and len(v) < min_len:
+                errs.add(loc, f"string length {len(v)} < minLength {min_len}")
+            if max_len is not None and len(v) > max_len:
+                errs.add(loc, f"string length {len(v)} > maxLength {max_len}")
+            if pattern is not None and not pattern.search(v):
+                errs.add(loc, f"{_brief(v)} does not match pattern {pattern.pattern!r}")
+        return [check]
+
+    def _array(self, schema: Mapping[str, Any], depth: int) -> list[Check]:
+        items = schema.get("items")
+        prefix = schema.get("prefixItems")
+        if isinstance(items, list):  # 老 draft 的元组写法
+            prefix, items = items, schema.get("additionalItems")
+        elif items is None and prefix is not None:
+            items = schema.get("additionalItems")
+        item_check = self.compile(items, depth + 1) if items is not None else None
+        prefix_checks = [self.compile(s, depth + 1) for s in prefix or []]
+        min_items, max_items = schema.get("minItems"), schema.get("maxItems")
+        unique = schema.get("uniqueItems", False)
+        contains = self.compile(schema["contains"], depth + 1) if "contains" in schema else None
+        min_contains = schema.get("minContains", 1)
+        max_contains = schema.get("maxContains")
+        if item_check is _noop:
+            item_check = None
+        if (item_check is None and not prefix_checks and min_items is None and max_items is None and not unique
+                and contains is None):
+            return []
+
+        is_array = _TYPES["array"]
+
+        def check(v: Any, loc: Loc, errs: _Errors) -> None:
+            if not is_array(v):
+                return
+            n = len(v)
+            if min_items is not None and n < min_items:
+                errs.add(loc, f"array length {n} < minItems {min_items}")
+            if max_items is not None and n > max_items:
+                errs.add(loc, f"array length {n} > maxItems {max_items}")
+            if unique:
+                # 先按可哈希的键查重（O(n)）；哈希不了的值（非 JSON 类型）才两两比较
+                seen: set[Any] = set()
+                unhashable: list[Any] = []
+                for i, item in enumerate(v):
+                    try:
+                        key = _unique_key(item)
+                        duplicate = key in seen
+                        seen.add(key)
+                    except TypeError:
+                        duplicate = any(_equal(item, s) for s in unhashable)
+                        unhashable.append(item)
+                    if duplicate:
+                        errs.add(loc, f"duplicate item {_brief(item)} at index {i} (uniqueItems)")
+                        break
+            for i, sub in enumerate(prefix_checks[:n]):
+                sub(v[i], (loc, i), errs)
+            if item_check is not None:
+                for i in range(len(prefix_checks), n):
+                    item_check(v[i], (loc, i), errs)
+            if contains is not None:
+                hits = sum(1 for i, item in enumerate(v) if _passes(contains, item, (loc, i)))
+                if hits < min_contains:
+                    errs.add(loc, f"{hits} item(s) match 'contains', expected at least {min_contains}")
+                if max_contains is not None and hits > max_contains:
+                    errs.add(loc, f"{hits} item(s) match 'contains', expected at most {max_contains}")
+        return [check]
+
+    def _object(self, schema: Mapping[str, Any], depth: int) -> list[Check]:
+        props = {k: self.compile(s, depth + 1) for k, s in (schema.get("properties") or {}).items()}
+        prop_items = [(k, c) for k, c in props.items() if c is not _noop]
+        required = list(schema.get("required") or [])
+        patterns = [(re.compile(p), self.compile(s, depth + 1))
+                    for p, s in (schema.get("patternProperties") or {}).items()]
+        additional = schema.get("additionalProperties", True)
+        extra_check = None if additional is True else self.compile(additional, depth + 1)
+        min_props, max_props = schema.get("minProperties"), schema.get("maxProperties")
+        names_check = self.compile(schema["propertyNames"], depth + 1) if "propertyNames" in schema else _noop
+        # dependencies（draft 4-7）：值是列表 = dependentRequired，是 schema = dependentSchemas
+        dep_required = {k: list(v) for k, v in (schema.get("dependentRequired") or {}).items()}
+        dep_schemas = {k: self.compile(s, depth) for k, s in (schema.get("dependentSchemas") or {}).items()}
+        for key, dep in (schema.get("dependencies") or {}).items():
+            if isinstance(dep, list):
+                dep_required[key] = list(dep)
+            else:
+                dep_schemas[key] = self.compile(dep, depth)
+        if not (prop_items or required or patterns or extra_check or min_props is not None or max_props is not None
+                or names_check is not _noop or dep_required or dep_schemas):
+            return []
+
+        def check(v: Any, loc: Loc, errs: _Errors) -> None:
+            if not isinstance(v, Mapping):
+                return
+            for key in required:
+                if key not in v:
+                    errs.add(loc, f"missing required property {key!r}")
+            if min_props is not None and len(v) < min_props:
+                errs.add(loc, f"{len(v)} properties < minProperties {min_props}")
+            if max_props is not None and len(v) > max_props:
+                errs.add(loc, f"{len(v)} properties > maxProperties {max_props}")
+            for key, sub in prop_items:
+                if key in v:
+                    sub(v[key], (loc, key), errs)
+            if names_check is not _noop:
+                for key in v:
+                    names_check(key, (loc, key), errs)
+            for key, needed in dep_required.items():
+                if key in v:
+                    for other in needed:
+                        if other not in v:
+                            errs.add(loc, f"property {other!r} is required when {key!r} is present")
+            for key, sub in dep_schemas.items():
+                if key in v:
+                    sub(v, loc, errs)
+            if patterns or extra_check is not None:
+                for key, value in v.items():
+                    matched = key in props
+                    for regex, sub in patterns:
+                        if regex.search(key):
+                            matched = True
+                            sub(value, (loc, key), errs)
+                    if not matched and extra_check is not None:
+                        if additional is False:
+                            errs.add(loc, f"additional property {key!r} is not allowed")
+                        else:
+                            extra_check(value, (loc, key), errs)
+        return [check]
+
+    def _combinators(self, schema: Mapping[str, Any], depth: int) -> list[Check]:
+        out: list[Check] = []
+        # allOf 不算往下一层：和当前节点是同一个值
+        for sub in schema.get("allOf") or []:
+            out.append(self.compile(sub, depth))
+        if "anyOf" in schema:
+            any_of = [self.compile(s, depth) for s in schema["anyOf"]]
+            out.append(lambda v, loc, errs: None if any(_passes(c, v, loc) for c in any_of)
+                       else errs.add(loc, f"{_brief(v)} does not match any schema in anyOf"))
+        if "oneOf" in schema:
+            one_of = [self.compile(s, depth) for s in schema["oneOf"]]
+
+            def check_one(v: Any, loc: Loc, errs: _Errors) -> None:
+                hits = sum(1 for c in one_of if _passes(c, v, loc))
+                if hits != 1:
+                    errs.add(loc, f"{_brief(v)} matches {hits} schemas in oneOf, expected exactly 1")
+            out.append(check_one)
+        if "not" in schema:
+            negated = self.compile(schema["not"], depth)
+            out.append(lambda v, loc, errs: errs.add(loc, f"{_brief(v)} must not match the 'not' schema")
+                       if _passes(negated, v, loc) else None)
+        return out
+
+    def _conditional(self, schema: Mapping[str, Any], depth: int) -> list[Check]:
+        """if / then / else：if 通过就按 then 查，否则按 else 查；没有 if 时 then / else 不起作用"""
+        if "if" not in schema or ("then" not in schema and "else" not in schema):
+            return []
+        cond = self.compile(schema["if"], depth)
+        then_check = self.compile(schema.get("then", True), depth)
+        else_check = self.compile(schema.get("else", True), depth)
+
+        def check(v: Any, loc: Loc, errs: _Errors) -> None:
+            (then_check if _passes(cond, v, loc) else else_check)(v, loc, errs)
+        return [check]
+
+
+def _noop(v: Any, loc: Loc, errs: _Errors) -> None:
+    return None
+
+
+def _type_check(spec: str | list[str]) -> Check:
+    names = [spec] if isinstance(spec, str) else list(spec)
+    unknown = [n for n in names if n not in _TYPES]
+    if unknown:
+        raise ValueError(f"unknown JSON Schema type(s): {unknown}")
+    tests = [_TYPES[n] for n in names]
+    label = names[0] if len(names) == 1 else " or ".join(names)
+
+    def check(v: Any, loc: Loc, errs: _Errors) -> None:
+        for test in tests:
+            if test(v):
+                return
+        errs.add(loc, f"expected {label}, got {_json_type(v)}")
+    return check
+
+
+def _chain(checks: list[Check]) -> Check:
+    checks = [c for c in checks if c is not _noop]
+    if not checks:
+        return _noop
+    if len(checks) == 1:
+        return checks[0]
+
+    def check(v: Any, loc: Loc, errs: _Errors) -> None:
+        for c in checks:
+            c(v, loc, errs)
+    return check
+
+
+# ------------------ 对外接口 ------------------ #
+
+class CompiledSchema:
+    """编译好的 schema；用 load_schema(ref) 拿（文件的有缓存），不用直接构造"""
+
+    def __init__(self, schema: Any, *, shallow: bool = False, backend: str | None = None,
+                 source: str = "<inline>") -> None:
+        self.schema = schema
+        self.shallow = shallow
+        self.source = source
+        self.backend = "builtin" if shallow else get_backend(backend)
+        if self.backend == "jsonschema":
+            cls = jsonschema.validators.validator_for(schema)
+            cls.check_schema(schema)
+            self._validator = cls(schema)
+        else:
+            self._check = _Compiler(schema, max_depth=1 if shallow else None).compile(schema)
+
+    def __repr__(self) -> str:
+        mode = ", shallow" if self.shallow else ""
+        return f"CompiledSchema({self.source!r}, {self.backend}{mode})"
+
+    def errors(self, data: Any, max_errors: int = 10) -> list[str]:
+        """最多返回 max_errors 条错误（"路径: 原因"），空列表 = 通过"""
+        if self.backend == "jsonschema":
+            out = []
+            for err in self._validator.iter_errors(data):
+                loc: Loc = None
+                for key in err.absolute_path:
+                    loc = (loc, key)
+                out.append(f"{_render(loc)}: {err.message}")
+                if len(out) >= max_errors:
+                    break
+            return out
+        errs = _Errors(max(1, max_errors))
+        try:
+            self._check(data, None, errs)
+        except _Full:
+            pass
+        return errs.items
+
+    def is_valid(self, data: Any) -> bool:
+        return not self.errors(data, max_errors=1)
+
+
+def resolve_schema_path(ref: str | os.PathLike[str]) -> Path:
+    path = Path(ref)
+    if not path.is_absolute():
+        path = SCHEMA_DIR / path
+    if not path.exists():
+        raise FileNotFoundError(f"schema 文件不存在: {path}")
+    return path.resolve()
+
+
+def _read_schema(path: Path) -> Any:
+    text = path.read_text(encoding="utf-8")
+    if path.suffix.lower() in (".yml", ".yaml"):
+        return yaml.safe_load(text)
+    return json.loads(text)
+
+
+@lru_cache(maxsize=256)
+def _compile_file(path: str, mtime_ns: int, shallow: bool, backend: str) -> CompiledSchema:
+    # mtime 只参与缓存键：文件改了就是新的键，重新读 + 编译
+    return CompiledSchema(_read_schema(Path(path)), shallow=shallow, backend=backend, source=path)
+
+
+def load_schema(ref: str | os.PathLike[str] | Mapping[str, Any], *, shallow: bool = False,
+                backend: str | None = None) -> CompiledSchema:
+    """
+    ref: data/schemas/ 下的相对路径 / 绝对路径（按路径 + mtime 缓存）/ 内联 dict（不缓存）
+    """
+    if isinstance(ref, Mapping):
+        return CompiledSchema(ref, shallow=shallow, backend=backend)
+    path = resolve_schema_path(ref)
+    backend = "builtin" if shallow else get_backend(backend)
+    return _compile_file(str(path), path.stat().st_mtime_ns, shallow, backend)
+
+
+def schema_cache_info() -> Any:
+    """编译缓存的命中情况（functools 的 CacheInfo：hits / misses / currsize）"""
+    return _compile_file.cache_info()
+
+
+def clear_schema_cache() -> None:
+    _compile_file.cache_clear()
@@ -13,17 +13,35 @@ PROJECT_ROOT = Path(__file__).resolve().parents[2]
 LOG_DIR = PROJECT_ROOT / "logs"
 LOG_DIR.mkdir(parents=True, exist_ok=True)
 
+# 已经告警过的非法 AUTOFW_LOG_LEVEL 值：get_logger 到处都在调，同一个错值只告警一次
+_warned_bad_levels: set[str] = set()
+
+
+def _env_level() -> tuple[int, str | None]:
+    """读 AUTOFW_LOG_LEVEL；拼错（如 WARN_）不抛错，回退 INFO 并把原值带回去告警。"""
+    raw = os.getenv("AUTOFW_LOG_LEVEL", "INFO").strip().upper()
+    level = logging.getLevelNamesMapping().get(raw)
+    if level is None:
+        return logging.INFO, raw
+    return level, None
+
 
 def get_logger(name: str = "autofw") -> logging.Logger:
     """
     获取一个全局可复用的 logger：
     - 同时输出到控制台和 logs/autofw.log 文件
     - 避免重复添加 handler（多次调用不会重复打日志）
+    - 级别默认 INFO，可以用环境变量 AUTOFW_LOG_LEVEL=WARNING 之类调高，
+      压测时 INFO 请求日志就完全不格式化、不写文件
     """
     logger = logging.getLogger(name)
 
     # ✅ 每次调用都保证 level / propagate 正确
-    logger.setLevel(logging.INFO)
+    level, bad_level = _env_level()
+    logger.setLevel(level)
+    if bad_level is not None and bad_level not in _warned_bad_levels:
+        _warned_bad_levels.add(bad_level)
+        logger.warning("AUTOFW_LOG_LEVEL=%r 不是合法的日志级别，回退到 INFO", bad_level)
 
     # ✅ pytest 下打开 propagate，caplog 才能抓到
     is_pytest = ("PYTEST_CURRENT_TEST" in os.environ) or ("pytest" in sys.modules)
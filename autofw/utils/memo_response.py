@@ -0,0 +1,74 @@
+# autofw/utils/memo_response.py
+"""
+APIClient 返回的响应：MemoResponse（requests.Response 的子类，isinstance 照样成立）
+
+- resp.json() / resp.text 第一次访问时解码并缓存，之后直接返回同一个对象
+  （json() 返回的 dict 是共享的：要改它先 copy.deepcopy）
+- resp.peek(n): 只解码 body 前 n 个字符，给报错信息用，多 MB 的响应也不会整体解码
+- body_snippet(resp, n): 对普通 requests.Response 也能用的同款函数（assert_status_code 在用）
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import requests
+
+from autofw.utils.json_codec import JSONCodec, get_codec, response_json
+
+_UNSET: Any = object()
+
+
+def body_snippet(resp: requests.Response, n: int = 200) -> str:
+    """
+    body 的前 n 个字符。只解码前 n*4 个字节（UTF-8 一个字符最多 4 字节），
+    stream=True 且还没读的 body 不去读，返回占位符。
+    """
+    content = getattr(resp, "_content", None)
+    if content is False:
+        return "<body not read>"
+    if not isinstance(content, (bytes, bytearray)):
+        # 不是真正的 requests.Response（测试里的替身对象等）
+        return str(getattr(resp, "text", "") or "")[:n]
+    encoding = resp.encoding or "utf-8"
+    try:
+        return content[: n * 4].decode(encoding, errors="replace")[:n]
+    except LookupError:
+        return content[: n * 4].decode("utf-8", errors="replace")[:n]
+
+
+class MemoResponse(requests.Response):
+    """不新增构造参数：APIClient 拿到真实响应后用 memoize() 原地换 class"""
+
+    json_codec: JSONCodec | None = None
+    _memo_json: Any = _UNSET
+    _memo_text: str | None = None
+
+    def json(self, **kwargs: Any) -> Any:
+        # 传了 object_hook / parse_float 之类的参数：不走缓存，按 requests 原逻辑解析
+        if kwargs:
+            return super().json(**kwargs)
+        if self._memo_json is _UNSET:
+            self._memo_json = response_json(self, self.json_codec or get_codec())
+        return self._memo_json
+
+    @property
+    def text(self) -> str:
+        if self._memo_text is None:
+            self._memo_text = requests.Response.text.fget(self)
+        return self._memo_text
+
+    def peek(self, n: int = 200) -> str:
+        return body_snippet(self, n)
+
+
+def memoize(resp: requests.Response, codec: JSONCodec | None = None) -> requests.Response:
+    """
+    把 requests.Response 原地变成 MemoResponse（已经是的话只更新 codec）。
+    其它类型（自定义子类、mock 对象）原样返回，不去动它。
+    """
+    if type(resp) is requests.Response:
+        resp.__class__ = MemoResponse
+    if isinstance(resp, MemoResponse):
+        resp.json_codec = codec
+    return resp
@@ -0,0 +1,214 @@
+# autofw/utils/metrics.py
+"""
+进程级请求指标：
+
+- 每个请求按 (method, 路径模板, status) 记进一个 HDR 风格的延迟直方图
+  路径模板：/users/123/orders/9f1c... -> /users/{id}/orders/{id}，避免每个 id 一条序列
+- 同时计 requests / attempts / retries / errors（errors = 以异常结束的请求，status 记成异常类名）
+- pytest 结束时由 conftest 写出 reports/metrics.json + reports/metrics.csv（p50/p90/p99/max、RPS）
+- 要显式开：APIClient(metrics=get_registry())；默认 None 不记。conftest 的 client / network_client
+  按 config.yml 的 metrics 打开（cassette 回放时不开），mock / monkeypatch 的假请求不会混进真实延迟分布
+
+直方图：值按微秒取整，按 2 的幂分段、每段线性分 sub_buckets 格，
+相对误差 ≈ 1/sub_buckets；只存有数据的格子（dict），记录一次是 O(1)。
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import re
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlsplit
+
+_ID_SEGMENT = re.compile(
+    r"^(\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}|[0-9a-fA-F]{16,})$"
+)
+
+CSV_FIELDS = (
+    "method", "path", "status", "requests", "attempts", "retries", "errors",
+    "rps", "mean_ms", "p50_ms", "p90_ms", "p99_ms", "max_ms",
+)
+
+
+@lru_cache(maxsize=4096)
+def template_path(url: str) -> str:
+    """URL -> 路径模板：去掉 host / query，把纯数字、UUID、长 hex 段替换成 {id}"""
+    path = urlsplit(url).path or "/"
+    return "/".join("{id}" if _ID_SEGMENT.match(seg) else seg for seg in path.split("/"))
+
+
+class Histogram:
+    """HDR 风格直方图（非线程安全，由 MetricsRegistry 加锁）"""
+
+    def __init__(self, sub_buckets: int = 32) -> None:
+        if sub_buckets < 2 or sub_buckets & (sub_buckets - 1):
+            raise ValueError(f"sub_buckets must be a power of 2 >= 2, got {sub_buckets!r}")
+        self.sub_buckets = sub_buckets
+        self._sub_bits = sub_buckets.bit_length() - 1
+        self.counts: dict[int, int] = {}
+        self.count = 0
+        self.total_us = 0
+        self.min_us = 0
+        self.max_us = 0
+
+    def _index(self, value: int) -> int:
+        shift = max(0, value.bit_length() - self._sub_bits - 1)
+        return shift * self.sub_buckets + (value >> shift)
+
+    def _upper(self, index: int) -> int:
+        """格子里能出现的最大值（报告百分位时用，偏保守）"""
+        if index < 2 * self.sub_buckets:
+            return index
+        shift = index // self.sub_buckets - 1
+        sub = index - shift * self.sub_buckets
+        return ((sub + 1) << shift) - 1
+
+    def record(self, seconds: float) -> None:
+        value = max(0, int(seconds * 1_000_000))
+        idx = self._index(value)
+        self.counts[idx] = self.counts.get(idx, 0) + 1
+        if self.count == 0 or value < self.min_us:
+            self.min_us = value
+        if value > self.max_us:
+            self.max_us = value
+        self.count += 1
+        self.total_us += value
+
+    def percentile(self, p: float) -> float:
+        """返回毫秒；没有数据时为 0"""
+        if self.count == 0:
+            return 0.0
+        rank = max(1, int(self.count * p / 100 + 0.5))
+        seen = 0
+        for idx in sorted(self.counts):
+            seen += self.counts[idx]
+            if seen >= rank:
+                return min(self._upper(idx), self.max_us) / 1000
+        return self.max_us / 1000
+
+    def mean(self) -> float:
+        return self.total_us / self.count / 1000 if self.count else 0.0
+
+
+class _Series:
+    __slots__ = ("histogram", "requests", "attempts", "errors")
+
+    def __init__(self, sub_buckets: int) -> None:
+        self.histogram = Histogram(sub_buckets)
+        self.requests = 0
+        self.attempts = 0
+        self.errors = 0
+
+
+class MetricsRegistry:
+    """线程安全；APIClient / AsyncAPIClient 传 metrics=get_registry() 才记到这个进程级实例里（默认 None 不记）"""
+
+    def __init__(self, sub_buckets: int = 32) -> None:
+        self.sub_buckets = sub_buckets
+        self._series: dict[tuple[str, str, str], _Series] = {}
+        self._lock = threading.Lock()
+        self._first_at: float | None = None
+        self._last_at = 0.0
+
+    def record(
+            self,
+            method: str,
+            url: str,
+            status: int | str,
+            seconds: float,
+            *,
+            attempts: int = 1,
+            error: bool = False,
+    ) -> None:
+        """记一个请求（不是 attempt）：seconds 是含重试等待的端到端耗时"""
+        key = (method.upper(), template_path(url), str(status))
+        now = time.monotonic()
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(self.sub_buckets)
+            series.histogram.record(seconds)
+            series.requests += 1
+            series.attempts += attempts
+            if error:
+                series.errors += 1
+            if self._first_at is None:
+                self._first_at = now - seconds
+            self._last_at = now
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._series)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+            self._first_at = None
+            self._last_at = 0.0
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        """每条序列一行，按 method / path / status 排序"""
+        with self._lock:
+            wall_s = self._last_at - self._first_at if self._first_at is not None else 0.0
+            rows = []
+            for (method, path, status), s in sorted(self._series.items()):
+                h = s.histogram
+                rows.append({
+                    "method": method,
+                    "path": path,
+                    "status": status,
+                    "requests": s.requests,
+                    "attempts": s.attempts,
+                    "retries": s.attempts - s.requests,
+                    "errors": s.errors,
+                    "rps": round(s.requests / wall_s, 3) if wall_s > 0 else 0.0,
+                    "mean_ms": round(h.mean(), 3),
+                    "p50_ms": h.percentile(50),
+                    "p90_ms": h.percentile(90),
+                    "p99_ms": h.percentile(99),
+                    "max_ms": h.max_us / 1000,
+                })
+            return rows
+
+    def summary(self) -> dict[str, Any]:
+        rows = self.snapshot()
+        with self._lock:
+            wall_s = self._last_at - self._first_at if self._first_at is not None else 0.0
+        requests = sum(r["requests"] for r in rows)
+        return {
+            "requests": requests,
+            "attempts": sum(r["attempts"] for r in rows),
+            "retries": sum(r["retries"] for r in rows),
+            "errors": sum(r["errors"] for r in rows),
+            "wall_s": round(wall_s, 3),
+            "rps": round(requests / wall_s, 3) if wall_s > 0 else 0.0,
+            "series": rows,
+        }
+
+    def write_json(self, path: str | Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.summary(), ensure_ascii=False, indent=2), encoding="utf-8")
+        return path
+
+    def write_csv(self, path: str | Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            writer.writerows(self.snapshot())
+        return path
+
+
+_registry = MetricsRegistry()
+
+
+def get_registry() -> MetricsRegistry:
+    """进程级默认 registry"""
+    return _registry
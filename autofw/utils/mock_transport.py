@@ -0,0 +1,253 @@
+# autofw/utils/mock_transport.py
+"""
+内存里的假传输层：APIClient(sender=MockTransport()) 之后请求不再经过 requests / urllib3，
+直接按路由表返回响应，mock 用例从毫秒级降到微秒级。
+
+代替手写 monkeypatch(client.session, "request", fake) + build_response：
+- 路由表：method + path（支持 {id} 路径参数、* 通配），后加的路由优先（方便单个用例覆盖）
+- 响应可以是：dict（JSON body）/ int（状态码）/ MockResponse / requests.Response /
+  异常（实例或类，直接抛出）/ callable(MockRequest) -> 以上任意一种 /
+  list（按调用顺序依次返回，用完后一直返回最后一个；JSON 数组 body 用 MockResponse(json=[...])）
+- 每个请求都记在 transport.calls（和 route.calls）里，方便断言发了什么
+- VirtualClock：假时钟，clock() 返回当前时间，sleep(s) 只把时间往前拨；
+  传给 APIClient(sleep=...) 后退避不真睡，也能断言睡了多久
+
+sender 是每个 client 自己的，不像 monkeypatch session 那样会影响共享同一个 session 的其它 client。
+
+用法：
+    transport = MockTransport()
+    transport.add("GET", "/users/{id}", lambda req: {"id": int(req.path_params["id"])})
+    transport.add("POST", "/orders", [503, 503, MockResponse(201, {"ok": True})])
+    clock = VirtualClock()
+    client = APIClient(base_url="http://mock.local", sender=transport, sleep=clock.sleep, metrics=None)
+
+metrics=None：假请求的耗时没有意义，不要记到进程级 registry（reports/metrics.*）里；
+conftest 的 mock_client fixture 已经这样配好了。
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from datetime import timedelta
+from http import HTTPStatus
+from typing import Any
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from autofw.utils import json_codec
+
+_UNSET: Any = object()
+_REASONS = {s.value: s.phrase for s in HTTPStatus}
+
+
+class NoRouteError(LookupError):
+    """请求没有匹配到任何路由（一般是用例漏配了，不会被当成网络错误重试）"""
+
+
+class VirtualClock:
+    """
+    假时钟：可以当 clock 传给 RateLimiter / CircuitBreaker / ResponseCache，
+    sleep 传给 APIClient。sleeps 记录每次 sleep 的秒数。
+    """
+
+    def __init__(self, start: float = 0.0) -> None:
+        self.now = start
+        self.sleeps: list[float] = []
+        self._lock = threading.Lock()
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        with self._lock:
+            self.sleeps.append(seconds)
+            self.now += max(0.0, seconds)
+
+    def advance(self, seconds: float) -> None:
+        """不记到 sleeps 里的拨表（模拟“过了一段时间”）"""
+        with self._lock:
+            self.now += seconds
+
+    @property
+    def slept(self) -> float:
+        return sum(self.sleeps)
+
+
+@dataclass
+class MockResponse:
+    status: int = 200
+    json: Any = _UNSET
+    body: bytes | str = b""
+    headers: dict[str, str] = field(default_factory=dict)
+
+    def build(self, url: str) -> requests.Response:
+        resp = requests.Response()
+        resp.status_code = self.status
+        resp.reason = _REASONS.get(self.status, "")
+        resp.url = url
+        resp.headers = CaseInsensitiveDict(self.headers)
+        if self.json is not _UNSET:
+            resp._content = json_codec.dumps(self.json)
+            resp.headers.setdefault("Content-Type", "application/json; charset=utf-8")
+        else:
+            resp._content = self.body.encode("utf-8") if isinstance(self.body, str) else self.body
+        resp._content_consumed = True
+        resp.encoding = get_encoding_from_headers(resp.headers)
+        resp.elapsed = timedelta(0)
+        return resp
+
+
+@dataclass
+class MockRequest:
+    method: str
+    url: str
+    path: str
+    params: dict[str, Any]
+    headers: CaseInsensitiveDict
+    json: Any = None
+    data: Any = None
+    path_params: dict[str, str] = field(default_factory=dict)
+    kwargs: dict[str, Any] = field(default_factory=dict)
+
+
+def _compile(path: str) -> re.Pattern[str]:
+    """/users/{id} -> 命名分组；* -> 任意字符（可以跨 /）"""
+    out = []
+    for token in re.split(r"(\{\w+\}|\*)", path):
+        if token == "*":
+            out.append(".*")
+        elif token.startswith("{") and token.endswith("}"):
+            out.append(f"(?P<{token[1:-1]}>[^/]+)")
+        else:
+            out.append(re.escape(token))
+    return re.compile("".join(out) + "$")
+
+
+class Route:
+    def __init__(self, method: str, path: str, response: Any) -> None:
+        self.method = method.upper()
+        self.path = path
+        self.pattern = _compile(path)
+        self.responses = list(response) if isinstance(response, (list, tuple)) else [response]
+        if not self.responses:
+            raise ValueError(f"route {method} {path}: response list is empty")
+        self.calls: list[MockRequest] = []
+
+    def match(self, method: str, path: str) -> dict[str, str] | None:
+        if self.method not in ("*", method):
+            return None
+        m = self.pattern.match(path)
+        return m.groupdict() if m else None
+
+    def next_response(self) -> Any:
+        # 调用方持锁：calls 已经 append 过当前请求
+        return self.responses[min(len(self.calls), len(self.responses)) - 1]
+
+    def __repr__(self) -> str:
+        return f"Route({self.method} {self.path}, calls={len(self.calls)})"
+
+
+class MockTransport:
+    """APIClient 的 sender：request(method, url, **kwargs) 和 requests.Session.request 同签名"""
+
+    def __init__(self, routes: Mapping[str, Any] | None = None) -> None:
+        """routes: {"GET /get": {...}, "POST /post": 201} 这种简写，等价于逐个 add()"""
+        self.routes: list[Route] = []
+        self.calls: list[MockRequest] = []
+        self._lock = threading.Lock()
+        for key, response in (routes or {}).items():
+            method, _, path = key.partition(" ")
+            self.add(method, path, response)
+
+    def add(self, method: str, path: str, response: Any = _UNSET, *, status: int = 200,
+            json: Any = _UNSET, headers: dict[str, str] | None = None) -> Route:
+        """
+        response 不传时用 status / json / headers 拼一个 MockResponse：
+            transport.add("GET", "/get", json={"args": {}})
+        """
+        if response is _UNSET:
+            response = MockResponse(status, json, headers=headers or {})
+        route = Route(method, path, response)
+        with self._lock:
+            self.routes.append(route)
+        return route
+
+    def route(self, method: str, path: str) -> Callable[[Callable[[MockRequest], Any]], Callable[[MockRequest], Any]]:
+        """装饰器写法：@transport.route("POST", "/login")"""
+        def _decorator(fn: Callable[[MockRequest], Any]) -> Callable[[MockRequest], Any]:
+            self.add(method, path, fn)
+            return fn
+        return _decorator
+
+    def call_count(self, method: str | None = None, path: str | None = None) -> int:
+        with self._lock:
+            return sum(1 for c in self.calls
+                       if (method is None or c.method == method.upper()) and (path is None or c.path == path))
+
+    def reset(self) -> None:
+        with self._lock:
+            self.calls.clear()
+            for route in self.routes:
+                route.calls.clear()
+
+    # ------------------ Sender 接口 ------------------ #
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        method = method.upper()
+        parts = urlsplit(url)
+        params = dict(parse_qsl(parts.query, keep_blank_values=True))
+        params.update(kwargs.get("params") or {})
+        req = MockRequest(
+            method=method,
+            url=url,
+            path=parts.path or "/",
+            params=params,
+            headers=CaseInsensitiveDict(kwargs.get("headers") or {}),
+            json=kwargs.get("json"),
+            data=kwargs.get("data"),
+            kwargs=kwargs,
+        )
+
+        with self._lock:
+            self.calls.append(req)
+            for route in reversed(self.routes):
+                path_params = route.match(method, req.path)
+                if path_params is not None:
+                    req.path_params = path_params
+                    route.calls.append(req)
+                    spec = route.next_response()
+                    break
+            else:
+                known = ", ".join(f"{r.method} {r.path}" for r in self.routes) or "<none>"
+                raise NoRouteError(f"no mock route for {method} {req.path}; routes: {known}")
+
+        # callable 在锁外执行：里面可以慢 / 可以再调 client
+        return _to_response(spec, req)
+
+
+def _to_response(spec: Any, req: MockRequest) -> requests.Response:
+    if isinstance(spec, BaseException):
+        raise spec
+    if isinstance(spec, type) and issubclass(spec, BaseException):
+        raise spec(f"mock {req.method} {req.path}")
+    if isinstance(spec, requests.Response):
+        return spec
+    if isinstance(spec, MockResponse):
+        return spec.build(req.url)
+    if isinstance(spec, bool):
+        raise TypeError(f"unsupported mock response {spec!r}")
+    if isinstance(spec, int):
+        return MockResponse(spec).build(req.url)
+    if isinstance(spec, (dict, list)):
+        return MockResponse(json=spec).build(req.url)
+    if isinstance(spec, (str, bytes)):
+        return MockResponse(body=spec).build(req.url)
+    if callable(spec):
+        return _to_response(spec(req), req)
+    raise TypeError(f"unsupported mock response {spec!r}")
@@ -0,0 +1,79 @@
+# autofw/utils/rate_limiter.py
+"""
+客户端限速（GCRA，效果等同令牌桶）：
+
+- 整个 client 一个总速率 qps（可选），再按 path 通配符（fnmatch）单独限速
+- reserve() 只在锁里算“要等多久”并预约时间片，真正的等待在锁外做：
+  同步 client 用 time.sleep，async client 用 asyncio.sleep，所以线程和协程下都安全
+- 统计被限速的次数和总等待时间
+
+示例：
+    RateLimiter(qps=20, burst=5, per_path={"/status/*": 2})
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable, Mapping
+from fnmatch import fnmatchcase
+
+
+class _Bucket:
+    """单个 GCRA 桶：rate 个/秒，允许突发 burst 个"""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        if rate <= 0:
+            raise ValueError(f"rate must be > 0, got {rate!r}")
+        self.interval = 1.0 / rate
+        self.tolerance = self.interval * (max(1, int(burst)) - 1)
+        self.tat = 0.0  # theoretical arrival time
+
+    def reserve(self, now: float) -> float:
+        tat = max(self.tat, now)
+        wait = max(0.0, tat - self.tolerance - now)
+        self.tat = tat + self.interval
+        return wait
+
+
+class RateLimiter:
+    def __init__(
+            self,
+            qps: float | None = None,
+            burst: int = 1,
+            per_path: Mapping[str, float] | None = None,
+            clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.clock = clock
+        self._default = _Bucket(qps, burst) if qps else None
+        self._rules = [(pattern, _Bucket(rate, burst)) for pattern, rate in (per_path or {}).items()]
+        self._lock = threading.Lock()
+
+        self.calls = 0
+        self.throttled_calls = 0
+        self.throttled_s_total = 0.0
+
+    def reserve(self, path: str) -> float:
+        """预约一个请求名额，返回调用方需要等待的秒数（0 = 不用等）"""
+        with self._lock:
+            now = self.clock()
+            wait = 0.0
+            if self._default is not None:
+                wait = self._default.reserve(now)
+            for pattern, bucket in self._rules:
+                if fnmatchcase(path, pattern):
+                    wait = max(wait, bucket.reserve(now))
+
+            self.calls += 1
+            if wait > 0:
+                self.throttled_calls += 1
+                self.throttled_s_total += wait
+            return wait
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "throttled_calls": self.throttled_calls,
+                "throttled_ms_total": round(self.throttled_s_total * 1000, 3),
+            }
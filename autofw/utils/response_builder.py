@@ -1,11 +1,12 @@
 # autofw/utils/response_builder.py
 from __future__ import annotations
 
-import json
 from typing import Any
 
 import requests
 
+from autofw.utils import json_codec
+
 
 def build_response(
         status_code: int,
@@ -28,6 +29,8 @@ def build_response(
     if json_body is None:
         resp._content = b""
     else:
-        resp._content = json.dumps(json_body, ensure_ascii=False).encode("utf-8")
+        resp._content = json_codec.dumps(json_body)
+    # 和真实响应读完 body 后一致：close() / iter_content() 都不会再去碰 raw
+    resp._content_consumed = True
 
     return resp
@@ -0,0 +1,171 @@
+# autofw/utils/response_cache.py
+"""
+APIClient.get 用的进程内响应缓存（默认不开，按 client / 按请求 opt-in）：
+
+- key = method + url + params + 选定的 vary headers（默认 Accept / Authorization）
+- TTL 过期 + LRU 淘汰（max_entries / max_bytes 两个上限）
+- 过期但带 ETag / Last-Modified 的条目：下次请求带 If-None-Match / If-Modified-Since 去验证，
+  服务端回 304 就直接续期复用旧响应
+- hits / misses / revalidated / evictions 计数
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+import requests
+
+CacheKey = tuple[Any, ...]
+
+
+@dataclass
+class CacheEntry:
+    response: requests.Response
+    expires_at: float
+    size: int
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def is_fresh(self, now: float) -> bool:
+        return now < self.expires_at
+
+    def validators(self) -> dict[str, str]:
+        """条件请求头：过期后用它们去找服务端确认内容有没有变"""
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """线程安全的 TTL + LRU 响应缓存"""
+
+    def __init__(
+            self,
+            ttl: float = 60.0,
+            max_entries: int = 256,
+            max_bytes: int = 32 * 1024 * 1024,
+            vary_headers: tuple[str, ...] = ("Accept", "Authorization"),
+            clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.vary_headers = tuple(h.lower() for h in vary_headers)
+        # TTL 计时用的时钟；用例里可以传 VirtualClock，拨表就能让条目过期
+        self.clock = clock
+
+        self._entries: OrderedDict[CacheKey, CacheEntry] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.evictions = 0
+
+    def make_key(
+            self,
+            method: str,
+            url: str,
+            params: Mapping[str, Any] | None,
+            headers: Mapping[str, Any] | None,
+    ) -> CacheKey:
+        lower = {str(k).lower(): v for k, v in (headers or {}).items()}
+        vary = tuple(lower.get(h) for h in self.vary_headers)
+        items = tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+        return method.upper(), url, items, vary
+
+    def lookup(self, key: CacheKey) -> tuple[CacheEntry | None, bool]:
+        """
+        返回 (entry, fresh)：
+        - fresh=True: 直接命中，可以不发请求
+        - entry 不为空但 fresh=False: 过期了，但有验证器，可以发条件请求
+        - entry 为空: 未命中
+        """
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, False
+
+            self._entries.move_to_end(key)
+            if entry.is_fresh(now):
+                self.hits += 1
+                return entry, True
+
+            self.misses += 1
+            if entry.etag or entry.last_modified:
+                return entry, False
+
+            self._remove(key)
+            return None, False
+
+    def store(self, key: CacheKey, resp: requests.Response) -> None:
+        """只缓存 200 且没声明 no-store 的响应"""
+        if resp.status_code != 200:
+            return
+        if "no-store" in resp.headers.get("Cache-Control", "").lower():
+            return
+
+        size = len(resp.content or b"")
+        if size > self.max_bytes:
+            return
+
+        entry = CacheEntry(
+            response=resp,
+            expires_at=self.clock() + self.ttl,
+            size=size,
+            etag=resp.headers.get("ETag"),
+            last_modified=resp.headers.get("Last-Modified"),
+        )
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._bytes += size
+            while self._entries and (
+                    len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def refresh(self, key: CacheKey) -> CacheEntry | None:
+        """服务端回 304：旧响应仍然有效，续期"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            entry.expires_at = self.clock() + self.ttl
+            self._entries.move_to_end(key)
+            self.revalidated += 1
+            return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidated": self.revalidated,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    def _remove(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
@@ -0,0 +1,105 @@
+# autofw/utils/retry_policy.py
+"""
+重试策略的几个小零件（APIClient / AsyncAPIClient 共用）：
+
+- compute_backoff: 指数退避 + 可选 jitter（full / decorrelated），避免所有调用方同一时刻一起重试
+- parse_retry_after: 解析 429/503 的 Retry-After（秒数或 HTTP 日期）
+- RetryBudget: 客户端级重试预算（令牌桶），限制“重试请求占总请求的比例”，
+  后端抖动时不会被一大波重试压垮
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+
+JITTER_MODES = ("none", "full", "decorrelated")
+
+
+def compute_backoff(
+        attempt: int,
+        base: float,
+        *,
+        jitter: str = "none",
+        prev_sleep: float = 0.0,
+        cap: float = 30.0,
+) -> float:
+    """
+    attempt 从 1 开始（第 1 次重试）。
+
+    - none: base * 2**(attempt-1)（原来的确定性退避）
+    - full: uniform(0, base * 2**(attempt-1))
+    - decorrelated: uniform(base, prev_sleep * 3)，第一次 prev_sleep 用 base
+    结果都不超过 cap。
+    """
+    if base <= 0:
+        return 0.0
+    if jitter == "full":
+        return random.uniform(0, min(cap, base * (2 ** (attempt - 1))))
+    if jitter == "decorrelated":
+        prev = prev_sleep if prev_sleep > 0 else base
+        return min(cap, random.uniform(base, prev * 3))
+    return min(cap, base * (2 ** (attempt - 1)))
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Retry-After 支持两种写法：'120' 或 'Wed, 21 Oct 2015 07:28:00 GMT'，解析失败返回 None"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=UTC)
+    return max(0.0, (when - datetime.now(UTC)).total_seconds())
+
+
+class RetryBudget:
+    """
+    令牌桶式重试预算：
+
+    - 每个请求（首发）往桶里存 ratio 个令牌，最多存 max_tokens 个
+    - 每次重试要取 1 个令牌，取不到就放弃重试（retries_denied + 1）
+    - 初始给 min_tokens 个令牌，保证请求量很小时也能重试几次
+
+    ratio=0.1 ≈ “重试请求不超过总请求的 10%”。线程安全，多个 client 可以共享一个预算。
+    """
+
+    def __init__(self, ratio: float = 0.1, min_tokens: float = 10.0, max_tokens: float = 100.0) -> None:
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = min(min_tokens, max_tokens)
+        self._lock = threading.Lock()
+
+        self.requests = 0
+        self.retries_spent = 0
+        self.retries_denied = 0
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                self.retries_spent += 1
+                return True
+            self.retries_denied += 1
+            return False
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "retries_spent": self.retries_spent,
+                "retries_denied": self.retries_denied,
+                "tokens": round(self._tokens, 3),
+            }
@@ -0,0 +1,175 @@
+# autofw/utils/soft_assertions.py
+"""
+软断言：一个用例里的所有期望都检查一遍，失败先记下来，最后一次性报出全部失败。
+
+数据驱动用例（YAML）原来第一个 assert 失败就停，环境坏了要跑好几轮才能看到所有问题；
+check_case 对一次响应把用例声明的期望全查完：
+
+    result = check_case(resp, case)
+    result.raise_if_failed()      # 有失败就抛 SoftAssertionError（AssertionError 的子类），信息里列出全部失败
+
+用例里认识的 key（都可选）：
+- expected_status: 状态码
+- expected_subset: 响应体包含的子集（每一处不一致单独记一条，规则同 assert_dict_contains）
+- list_mode: expected_subset 里列表的比较方式（equal / ordered / prefix / contains）
+- expected_paths: {路径: 期望值}，规则同 assert_json_value
+- expected_lengths: {路径: 长度}，路径指向的列表 / dict 的长度
+
+body 只解析一次；不是合法 JSON 时记一条失败，跳过其它 body 相关的检查。
+
+手写的检查用 SoftAssertions：
+    soft = SoftAssertions()
+    soft.check("status", assert_status_code, resp, 200)
+    with soft.expect("token"):
+        assert body["token"]
+    soft.raise_if_failed()
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator, Mapping, Sized
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+from requests import Response
+
+from autofw.utils.assertions import assert_json_value, assert_list_length, assert_status_code
+from autofw.utils.json_path import compile_path
+from autofw.utils.memo_response import body_snippet
+from autofw.utils.subset import find_mismatches
+
+# expected_subset 最多记多少处不一致（整个 body 都对不上时不至于刷屏）
+MAX_SUBSET_FAILURES = 20
+
+
+class SoftAssertionError(AssertionError):
+    """raise_if_failed 抛出的异常；.result 是完整的 SoftResult"""
+
+    def __init__(self, result: SoftResult) -> None:
+        super().__init__(result.summary())
+        self.result = result
+
+
+@dataclass(frozen=True)
+class Failure:
+    check: str      # 哪一项检查：status / subset / path:json.id / length:items ...
+    message: str
+
+
+@dataclass
+class SoftResult:
+    label: str = ""
+    checks: int = 0
+    failures: list[Failure] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failures
+
+    def summary(self) -> str:
+        head = f"{self.label}: " if self.label else ""
+        if self.ok:
+            return f"{head}all {self.checks} checks passed"
+        lines = "\n".join(f"  - [{f.check}] {f.message}" for f in self.failures)
+        return f"{head}{len(self.failures)} failure(s) in {self.checks} checks:\n{lines}"
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "label": self.label,
+            "checks": self.checks,
+            "ok": self.ok,
+            "failures": [{"check": f.check, "message": f.message} for f in self.failures],
+        }
+
+    def raise_if_failed(self) -> None:
+        if self.failures:
+            raise SoftAssertionError(self)
+
+
+class SoftAssertions:
+    """
+    收集器：check / expect 里的 AssertionError 只记录不抛出；其它异常照常抛（那是用例本身的 bug）。
+    当上下文管理器用时，退出 with 块会自动 raise_if_failed()。
+    """
+
+    def __init__(self, label: str = "") -> None:
+        self.result = SoftResult(label=label)
+
+    @property
+    def failures(self) -> list[Failure]:
+        return self.result.failures
+
+    def fail(self, check: str, message: str) -> None:
+        self.result.checks += 1
+        self.result.failures.append(Failure(check, message))
+
+    def check(self, name: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> bool:
+        """调用 fn(*args, **kwargs)，抛 AssertionError 就记一条失败；返回是否通过"""
+        with self.expect(name):
+            fn(*args, **kwargs)
+            return True
+        return False
+
+    @contextmanager
+    def expect(self, name: str) -> Iterator[None]:
+        self.result.checks += 1
+        try:
+            yield
+        except AssertionError as e:
+            self.result.failures.append(Failure(name, str(e) or repr(e)))
+
+    def raise_if_failed(self) -> None:
+        self.result.raise_if_failed()
+
+    def __enter__(self) -> SoftAssertions:
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        if exc_type is None:
+            self.raise_if_failed()
+
+
+def check_case(
+        resp: Response,
+        case: Mapping[str, Any],
+        *,
+        max_subset_failures: int = MAX_SUBSET_FAILURES,
+) -> SoftResult:
+    """按 case 里声明的期望检查 resp，返回全部结果（不抛异常）"""
+    soft = SoftAssertions(label=str(case.get("name", "")))
+
+    if "expected_status" in case:
+        soft.check("status", assert_status_code, resp, case["expected_status"])
+
+    subset = case.get("expected_subset") or {}
+    paths = case.get("expected_paths") or {}
+    lengths = case.get("expected_lengths") or {}
+    if not (subset or paths or lengths):
+        return soft.result
+
+    try:
+        body = resp.json()
+    except ValueError:
+        soft.fail("json", f"响应不是合法 JSON: {body_snippet(resp, 200)!r}")
+        return soft.result
+
+    if subset:
+        mismatches = find_mismatches(
+            body, subset, list_mode=case.get("list_mode", "equal"), max_mismatches=max_subset_failures,
+        )
+        soft.result.checks += 1
+        soft.result.failures.extend(Failure("subset", m.message) for m in mismatches)
+
+    for path, expected in paths.items():
+        soft.check(f"path:{path}", assert_json_value, body, path, expected)
+
+    for path, expected_length in lengths.items():
+        with soft.expect(f"length:{path}"):
+            value = compile_path(path).get(body)
+            if not isinstance(value, Sized):
+                # 显式 raise：python -O 下 assert 语句会被去掉
+                raise AssertionError(f"Path {path!r} is {type(value).__name__}, has no length")
+            assert_list_length(value, expected_length)
+
+    return soft.result
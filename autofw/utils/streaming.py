@@ -0,0 +1,268 @@
+# autofw/utils/streaming.py
+"""
+流式响应：大响应体（导出 / 大列表接口）不整体读进内存。
+
+- StreamedResponse.iter_bytes(): 按块读，累计超过 max_bytes 直接抛 ResponseTooLargeError
+- iter_ndjson(): 一行一个 JSON（application/x-ndjson / jsonl）
+- iter_json_array(): 顶层是 JSON 数组时，边读边解析出每个元素
+- iter_items(): 按 Content-Type 自动选上面两种（NDJSON 类型走 iter_ndjson，其余按 JSON 数组）
+
+内存占用 ≈ 一个 chunk + 当前正在解析的那个元素，和响应体总大小无关。
+元素用 client 的 json_codec 解析（APIClient.stream 会传进来）。
+
+分阶段计时：stream=True 时 _request 在响应头到达后就结束了，timing_hook 收到的
+download_ms ≈ 0；响应体完整读完时，这里再把 resp.timings[-1] 的 download_ms / total_ms 补上
+（只读了一部分就 close 的不补）。
+断言侧配合 autofw.utils.assertions 里的 assert_each_item_contains 等函数，一边消费一边断言。
+
+用法：
+    with client.stream("GET", "/export", max_bytes=50 * 1024 * 1024) as s:
+        count = assert_each_item_contains(s.iter_items(), {"status": "active"})
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+import time
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+import requests
+
+from autofw.utils import json_codec
+from autofw.utils.json_codec import JSONCodec, OrjsonCodec
+
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/jsonl", "application/json-seq", "application/x-jsonlines")
+
+_WHITESPACE = " \t\r\n"
+_NUMBER_START = "-0123456789"
+_NUMBER_CHARS = "0123456789.eE+-"
+_EXPECT_OPEN, _EXPECT_FIRST, _EXPECT_ITEM, _EXPECT_SEPARATOR = range(4)
+# 已解析部分超过这么多字符、且占 buffer 一半以上时才丢掉（不是每块都整体复制一遍）
+_COMPACT_MIN = 64 * 1024
+# 内置的两个 codec 解析结果和标准库一致，raw_decode 拿到的元素直接用；自定义 codec 再用它解析一遍
+_STDLIB_EQUIVALENT = (JSONCodec, OrjsonCodec)
+
+
+class ResponseTooLargeError(requests.exceptions.RequestException):
+    """响应体超过 max_bytes（Content-Length 预检或边读边计数）"""
+
+    def __init__(self, url: str, limit: int, seen: int) -> None:
+        super().__init__(f"response body from {url} exceeds max_bytes={limit} (read {seen} bytes)")
+        self.url = url
+        self.limit = limit
+        self.seen = seen
+
+
+class StreamedResponse:
+    """
+    包一层 stream=True 的 requests.Response；用完要 close()（或用 with），连接才会还回池子。
+    每个 StreamedResponse 只能被迭代一次。
+    """
+
+    def __init__(self, resp: requests.Response, max_bytes: int | None = None, chunk_size: int = 64 * 1024,
+                 codec: JSONCodec | None = None) -> None:
+        self.response = resp
+        self.max_bytes = max_bytes
+        self.chunk_size = chunk_size
+        self.codec = codec or json_codec.get_codec()
+        self.bytes_read = 0
+
+    # 常用属性直接透传，断言 status / headers 时不用 .response
+    @property
+    def status_code(self) -> int:
+        return self.response.status_code
+
+    @property
+    def headers(self) -> Any:
+        return self.response.headers
+
+    @property
+    def url(self) -> str:
+        return self.response.url
+
+    def __enter__(self) -> StreamedResponse:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.response.close()
+
+    # ------------------ 原始块 ------------------ #
+
+    def iter_bytes(self, chunk_size: int | None = None) -> Iterator[bytes]:
+        limit = self.max_bytes
+        if limit is not None:
+            declared = self.response.headers.get("Content-Length")
+            if declared and declared.isdigit() and int(declared) > limit:
+                self.close()
+                raise ResponseTooLargeError(self.url, limit, int(declared))
+
+        for chunk in self.response.iter_content(chunk_size or self.chunk_size):
+            if not chunk:
+                continue
+            self.bytes_read += len(chunk)
+            if limit is not None and self.bytes_read > limit:
+                self.close()
+                raise ResponseTooLargeError(self.url, limit, self.bytes_read)
+            yield chunk
+        self._finish_timing()
+
+    def _finish_timing(self) -> None:
+        """响应体读完：补上最后一个 attempt 的 download_ms（_request 返回时只到响应头）"""
+        timings = getattr(self.response, "timings", None)
+        if not timings or not timings[-1]._headers_at:
+            return
+        timing = timings[-1]
+        download_ms = round((time.perf_counter() - timing._headers_at) * 1000, 3)
+        timing.total_ms = round(timing.total_ms - timing.download_ms + download_ms, 3)
+        timing.download_ms = download_ms
+
+    def _iter_text(self) -> Iterator[str]:
+        decoder = codecs.getincrementaldecoder(self.response.encoding or "utf-8")(errors="replace")
+        for chunk in self.iter_bytes():
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+    # ------------------ JSON 元素 ------------------ #
+
+    def iter_lines(self) -> Iterator[str]:
+        # 只在新到的文本里找换行；跨块的半行先存成片段，凑齐一行才 join 一次（长行跨很多块也是线性的）
+        partial: list[str] = []
+        for text in self._iter_text():
+            start = 0
+            end = text.find("\n")
+            while end != -1:
+                partial.append(text[start:end])
+                yield "".join(partial)
+                partial.clear()
+                start = end + 1
+                end = text.find("\n", start)
+            if start < len(text):
+                partial.append(text[start:])
+        if partial:
+            yield "".join(partial)
+
+    def iter_ndjson(self) -> Iterator[Any]:
+        loads = self.codec.loads
+        for lineno, line in enumerate(self.iter_lines(), start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield loads(line)
+            except ValueError as e:
+                raise ValueError(f"invalid NDJSON at line {lineno}: {e}") from None
+
+    def iter_json_array(self) -> Iterator[Any]:
+        """顶层必须是 JSON 数组：[item, item, ...]，逐个元素 yield"""
+        # iter_json_array 会把 ] 后面剩下的也读完（只允许空白）：iter_bytes 走到结尾才会补上 download 计时
+        yield from iter_json_array(self._iter_text(), codec=self.codec)
+
+    def iter_items(self) -> Iterator[Any]:
+        content_type = self.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        if content_type in NDJSON_CONTENT_TYPES:
+            return self.iter_ndjson()
+        return self.iter_json_array()
+
+
+def iter_json_array(texts: Iterable[str], codec: JSONCodec | None = None) -> Iterator[Any]:
+    """
+    增量解析顶层 JSON 数组。texts 是按顺序到达的文本片段（切在任意位置都行）。
+
+    每个元素用 JSONDecoder.raw_decode 找边界；解析失败 / 数字后面还没读到别的字符
+    （可能还没读完）时先读更多再试。读更多时至少让未解析部分翻倍，
+    大元素跨很多块也只重试 O(log n) 次；已解析的部分攒到一定量才丢掉，
+    不会每来一块就把整个 buffer 复制一遍。
+
+    语法和 json.loads 一样严格：元素之间必须正好一个逗号（不接受 `[1 2]`、`[,1]`、`[1,,2]`、`[1,]`），
+    `]` 后面只能有空白。最后一个元素 yield 之后会把 texts 读完，确认没有多余内容。
+    """
+    decoder = json.JSONDecoder()
+    redecode = None if codec is None or type(codec) in _STDLIB_EQUIVALENT else codec.loads
+    buf = ""
+    pos = 0
+    # 下一个该出现的：[ / 元素或 ]（刚读到 [）/ 元素（刚读到 ,）/ , 或 ]（刚读完一个元素）
+    expect = _EXPECT_OPEN
+    eof = False
+    texts = iter(texts)
+
+    def _more(min_chars: int = 1) -> bool:
+        """至少再读 min_chars 个字符（读到结尾为止）；一个字符都没读到返回 False"""
+        nonlocal buf, pos, eof
+        pieces = []
+        got = 0
+        for text in texts:
+            pieces.append(text)
+            got += len(text)
+            if got >= min_chars:
+                break
+        else:
+            eof = True
+        if not pieces:
+            return False
+        if pos >= _COMPACT_MIN and pos * 2 >= len(buf):
+            buf = buf[pos:]
+            pos = 0
+        buf += "".join(pieces)
+        return True
+
+    while True:
+        while pos < len(buf) and buf[pos] in _WHITESPACE:
+            pos += 1
+        if pos >= len(buf):
+            if eof or not _more():
+                raise ValueError("unexpected end of JSON array stream")
+            continue
+
+        ch = buf[pos]
+        if expect == _EXPECT_OPEN:
+            if ch != "[":
+                raise ValueError(f"expected top-level JSON array, got {ch!r}")
+            expect = _EXPECT_FIRST
+            pos += 1
+            continue
+
+        if ch == "]" and expect in (_EXPECT_FIRST, _EXPECT_SEPARATOR):
+            pos += 1
+            break
+        if expect == _EXPECT_SEPARATOR:
+            if ch != ",":
+                raise ValueError(f"expected ',' or ']' after array item near offset {pos}, got {ch!r}")
+            expect = _EXPECT_ITEM
+            pos += 1
+            continue
+        if ch in ",]":
+            raise ValueError(f"expected array item near offset {pos}, got {ch!r}")
+
+        try:
+            item, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof or not _more(len(buf) - pos):
+                raise ValueError(f"invalid JSON array item near offset {pos}") from None
+            continue
+        if ch in _NUMBER_START and not eof and (end >= len(buf) or buf[end] in _NUMBER_CHARS):
+            # 数字可能被切断了（`-0` 后面还有 `.5`、`1.` 后面还有 `5`），读到数字后面的字符才算完整
+            if _more():
+                continue
+        if redecode is not None:
+            item = redecode(buf[pos:end])
+        pos = end
+        expect = _EXPECT_SEPARATOR
+        yield item
+
+    # ] 后面只能有空白：buffer 里剩下的和还没读的都查一遍
+    rest = buf[pos:].lstrip(_WHITESPACE)
+    if rest:
+        raise ValueError(f"unexpected data after JSON array: {rest[:20]!r}")
+    for text in texts:
+        rest = text.lstrip(_WHITESPACE)
+        if rest:
+            raise ValueError(f"unexpected data after JSON array: {rest[:20]!r}")
@@ -0,0 +1,268 @@
+# autofw/utils/subset.py
+"""
+“实际结果包含期望子集”的匹配器（assert_dict_contains 的实现）：
+
+- 显式栈迭代，不递归：几千层嵌套也不会 RecursionError
+- dict：期望里的 key 必须存在，value 继续按子集比较（和原来一样）
+- list：按 list_mode 比较
+    - equal（默认，和原来一样）：长度相同、逐个元素完全相等（元素里的 dict 也要完全相等）；
+      和原来的 != 一样，list 和 tuple 不算相等
+    - ordered：长度相同，逐个元素按子集比较
+    - prefix：实际列表以期望的这些元素开头（逐个按子集比较），后面可以有更多
+    - contains：不看顺序，每个期望元素都能在实际列表里找到一个（不重复使用的）匹配元素
+- max_mismatches：找到这么多处不一致就停（默认 1 = 第一处就停）
+- 错误信息里的值用 short_repr 截断，几 MB 的 payload 也不会花几秒拼字符串
+
+contains 是二分图最大匹配：每对 (实际元素, 期望元素) 先比较一次得到候选表，再用增广路径分配，
+不会因为先到的期望元素占了别人唯一的候选而误报。元素之间的比较同样走显式栈（_matches）。
+"""
+
+from __future__ import annotations
+
+import reprlib
+from collections.abc import Generator, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+LIST_MODES = ("equal", "ordered", "prefix", "contains")
+
+_STR_TYPES = (str, bytes, bytearray)
+_MISSING: Any = object()
+
+_repr = reprlib.Repr()
+_repr.maxlevel = 3
+_repr.maxdict = 8
+_repr.maxlist = 8
+_repr.maxtuple = 8
+_repr.maxset = 8
+_repr.maxstring = 80
+_repr.maxother = 80
+
+
+def short_repr(value: Any, limit: int = 200) -> str:
+    """repr 的截断版：容器只展开前几项 / 前几层，整体最多 limit 个字符"""
+    text = _repr.repr(value)
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+def _is_seq(value: Any) -> bool:
+    return isinstance(value, Sequence) and not isinstance(value, _STR_TYPES)
+
+
+def _seq_kind(value: Any) -> type:
+    """equal 模式比较的序列类型：list / tuple 的子类归到 list / tuple（同 == 的规则）"""
+    for kind in (list, tuple):
+        if isinstance(value, kind):
+            return kind
+    return type(value)
+
+
+def _join(path: str, key: Any) -> str:
+    return f"{path}.{key}" if path else str(key)
+
+
+def _is_leaf(value: Any) -> bool:
+    return not isinstance(value, Mapping) and not _is_seq(value)
+
+
+def _match_steps(a: Any, e: Any, list_mode: str, exact: bool) -> Generator[tuple[Any, Any, bool], bool, bool]:
+    """
+    a 是否包含 e（规则同 find_mismatches，只要结果不要错误信息）。
+    子元素的比较 yield (actual, expected, exact) 出去，由 _matches 算完再 send 回来。
+    """
+    if a is _MISSING:
+        return False
+    if isinstance(e, Mapping):
+        if not isinstance(a, Mapping):
+            return False
+        if exact and any(key not in e for key in a):
+            return False
+        for key, e_value in e.items():
+            if not (yield a.get(key, _MISSING), e_value, exact):
+                return False
+        return True
+    if _is_seq(e):
+        if not _is_seq(a):
+            return False
+        mode = "equal" if exact else list_mode
+        if mode == "equal" and _seq_kind(a) is not _seq_kind(e):
+            return False
+        if mode in ("equal", "ordered") and len(a) != len(e):
+            return False
+        if mode == "prefix" and len(a) < len(e):
+            return False
+        if mode == "contains":
+            candidates = []
+            for e_item in e:
+                row = []
+                for i, a_item in enumerate(a):
+                    if (yield a_item, e_item, False):
+                        row.append(i)
+                if not row:
+                    return False
+                candidates.append(row)
+            return -1 not in _max_matching(candidates, len(a))
+        for i in range(len(e)):
+            if not (yield a[i], e[i], mode == "equal"):
+                return False
+        return True
+    return not (a != e)
+
+
+def _matches(actual: Any, expected: Any, list_mode: str, exact: bool = False) -> bool:
+    """_match_steps 的驱动：生成器放在显式栈上，嵌套再深也不递归"""
+    stack = [_match_steps(actual, expected, list_mode, exact)]
+    result: bool | None = None
+    while stack:
+        try:
+            a, e, sub_exact = stack[-1].send(result)
+        except StopIteration as stop:
+            stack.pop()
+            result = stop.value
+            continue
+        if _is_leaf(e):
+            # 标量直接比，不用再开一个生成器
+            result = a is not _MISSING and not (a != e)
+        else:
+            stack.append(_match_steps(a, e, list_mode, sub_exact))
+            result = None
+    return bool(result)
+
+
+def _max_matching(candidates: list[list[int]], size: int) -> list[int]:
+    """
+    二分图最大匹配：candidates[j] = 能匹配期望元素 j 的实际元素下标，size = 实际元素个数。
+    返回每个期望元素分到的实际元素下标（-1 = 分不到）。增广路径用 BFS 找，不递归。
+    """
+    match_e = [-1] * len(candidates)
+    match_a = [-1] * size
+    for root, row in enumerate(candidates):
+        # 常见情况：有空着的候选，直接占上
+        free = next((i for i in row if match_a[i] < 0), -1)
+        if free >= 0:
+            match_a[free], match_e[root] = root, free
+            continue
+        # 候选都被占了：找一条增广路径，让占着的期望元素换到别的候选上
+        parent: dict[int, int] = {}
+        queue = [root]
+        for j in queue:
+            for i in candidates[j]:
+                if i in parent:
+                    continue
+                parent[i] = j
+                if match_a[i] < 0:
+                    free = i
+                    break
+                queue.append(match_a[i])
+            if free >= 0:
+                break
+        # 沿路径回溯：每个期望元素换到路径上的下一个实际元素（找不到路径时 free = -1，什么都不改）
+        i = free
+        while i >= 0:
+            j = parent[i]
+            prev = match_e[j]
+            match_a[i], match_e[j] = j, i
+            i = prev
+    return match_e
+
+
+@dataclass(frozen=True)
+class Mismatch:
+    path: str
+    message: str
+
+    def __str__(self) -> str:
+        return self.message
+
+
+def find_mismatches(
+        actual: Any,
+        expected: Any,
+        *,
+        list_mode: str = "equal",
+        max_mismatches: int = 1,
+        path: str = "",
+        repr_limit: int = 200,
+) -> list[Mismatch]:
+    """返回最多 max_mismatches 处不一致（空列表 = actual 包含 expected）"""
+    if list_mode not in LIST_MODES:
+        raise ValueError(f"list_mode must be one of {LIST_MODES}, got {list_mode!r}")
+
+    out: list[Mismatch] = []
+
+    def _fail(where: str, message: str) -> bool:
+        out.append(Mismatch(where, message))
+        return len(out) >= max_mismatches
+
+    def _value_mismatch(where: str, a: Any, e: Any) -> str:
+        return (f"Value mismatch at {where or '<root>'}: "
+                f"actual={short_repr(a, repr_limit)}, expected={short_repr(e, repr_limit)}")
+
+    # (actual, expected, path, exact)：exact=True 时按“完全相等”比较（equal 模式的列表元素）
+    stack: list[tuple[Any, Any, str, bool]] = [(actual, expected, path, False)]
+    while stack:
+        a, e, where, exact = stack.pop()
+
+        if a is _MISSING:
+            if _fail(where, f"Key {where} missing in actual dict"):
+                break
+            continue
+
+        if isinstance(e, Mapping):
+            if not isinstance(a, Mapping):
+                if _fail(where, _value_mismatch(where, a, e)):
+                    break
+                continue
+            if exact and len(a) != len(e):
+                extra = [k for k in a if k not in e]
+                if extra and _fail(where, f"Keys mismatch at {where or '<root>'}: "
+                                          f"unexpected keys {short_repr(extra, repr_limit)}"):
+                    break
+            # 缺的 key 也压栈（_MISSING），倒序压：按期望里的顺序检查 / 报错
+            stack.extend((a.get(key, _MISSING), e_value, _join(where, key), exact)
+                         for key, e_value in reversed(list(e.items())))
+
+        elif _is_seq(e):
+            if not _is_seq(a):
+                if _fail(where, _value_mismatch(where, a, e)):
+                    break
+                continue
+            mode = "equal" if exact else list_mode
+            label = where or "<root>"
+            if mode == "equal" and _seq_kind(a) is not _seq_kind(e):
+                if _fail(where, f"Type mismatch at {label}: actual is {type(a).__name__}, "
+                                f"expected {type(e).__name__} (list_mode=equal); "
+                                f"actual={short_repr(a, repr_limit)}"):
+                    break
+                continue
+            if mode in ("equal", "ordered") and len(a) != len(e):
+                if _fail(where, f"Length mismatch at {label}: actual len={len(a)}, expected len={len(e)} "
+                                f"(list_mode={mode}); actual={short_repr(a, repr_limit)}"):
+                    break
+                continue
+            if mode == "prefix" and len(a) < len(e):
+                if _fail(where, f"Length mismatch at {label}: actual len={len(a)} < expected prefix len={len(e)} "
+                                f"(list_mode=prefix)"):
+                    break
+                continue
+            if mode == "contains":
+                candidates = [[i for i, a_item in enumerate(a) if _matches(a_item, e_item, list_mode)]
+                              for e_item in e]
+                assigned = _max_matching(candidates, len(a))
+                for j, e_item in enumerate(e):
+                    if assigned[j] >= 0:
+                        continue
+                    note = "list_mode=contains"
+                    if candidates[j]:
+                        note += f"; its {len(candidates[j])} candidate(s) are taken by other expected elements"
+                    if _fail(f"{where}[{j}]", f"No element at {label} matches expected[{j}]="
+                                              f"{short_repr(e_item, repr_limit)} ({note})"):
+                        return out
+                continue
+            stack.extend((a[i], e[i], f"{where}[{i}]", mode == "equal") for i in reversed(range(len(e))))
+
+        elif a != e:
+            if _fail(where, _value_mismatch(where, a, e)):
+                break
+
+    return out
@@ -0,0 +1,69 @@
+# autofw/utils/timing.py
+"""
+单次请求（attempt）的分阶段耗时：
+
+    pool_wait -> dns -> connect -> tls -> ttfb -> download
+
+- 连接层（autofw.utils.http_pool 里的连接类）往“当前线程正在进行的 RequestTiming”里写时间点
+- APIClient._request 每个 attempt 开一个 RequestTiming，结束后挂到 resp.timings 上，
+  并交给 timing_hook（指标收集用）
+- 复用 keep-alive 连接时 dns / connect / tls 都是 0，reused=True
+
+用它判断：一个接口慢，到底是连接没复用（connect/tls 大），还是服务端慢（ttfb 大），
+还是响应体大（download 大）。
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+_local = threading.local()
+
+
+@dataclass
+class RequestTiming:
+    method: str = ""
+    url: str = ""
+    attempt: int = 1
+    status: int | None = None
+    error: str | None = None
+    reused: bool | None = None  # None = 没走到连接层（比如 mock 掉了 session.request）
+
+    pool_wait_ms: float = 0.0
+    dns_ms: float = 0.0
+    connect_ms: float = 0.0
+    tls_ms: float = 0.0
+    ttfb_ms: float = 0.0
+    download_ms: float = 0.0
+    total_ms: float = 0.0
+
+    # 连接层写入的 perf_counter 时间点，只在内部算差值用
+    _connected_at: float = field(default=0.0, repr=False, compare=False)
+    _sent_at: float = field(default=0.0, repr=False, compare=False)
+    _headers_at: float = field(default=0.0, repr=False, compare=False)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {k: v for k, v in asdict(self).items() if not k.startswith("_")}
+
+
+def begin_timing(method: str, url: str, attempt: int) -> RequestTiming:
+    timing = RequestTiming(method=method, url=url, attempt=attempt)
+    _local.current = timing
+    return timing
+
+
+def current_timing() -> RequestTiming | None:
+    """当前线程正在进行的 attempt；不在 APIClient 请求里时返回 None"""
+    return getattr(_local, "current", None)
+
+
+def end_timing(timing: RequestTiming, start: float) -> None:
+    """attempt 结束（成功或异常都要调）：算 total / download，清掉线程上的 current"""
+    now = time.perf_counter()
+    timing.total_ms = round((now - start) * 1000, 3)
+    if timing._headers_at:
+        timing.download_ms = round((now - timing._headers_at) * 1000, 3)
+    _local.current = None
@@ -0,0 +1,79 @@
+# perf/bench_json_codec.py
+"""
+JSON 编解码微基准：标准库 json vs orjson（装了才测）。
+
+    make bench                                  # = PYTHONPATH=. python perf/bench_json_codec.py
+    PYTHONPATH=. python perf/bench_json_codec.py --items 20000 --repeat 5
+
+每个后端测 dumps / loads，取 repeat 次里最快的一次（排除 GC / 调度抖动）。
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from collections.abc import Callable
+from typing import Any
+
+from autofw.utils.json_codec import BACKENDS, get_codec
+
+
+def _payload(items: int) -> list[dict[str, Any]]:
+    return [
+        {
+            "id": i,
+            "name": f"user-{i}",
+            "email": f"user{i}@example.com",
+            "active": i % 3 != 0,
+            "score": i * 1.25,
+            "tags": ["api", "test", "中文"],
+            "profile": {"city": "Shanghai", "age": 20 + i % 40, "extra": None},
+        }
+        for i in range(items)
+    ]
+
+
+def _best_of(fn: Callable[[], Any], repeat: int, number: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    obj = _payload(args.items)
+    results: dict[str, tuple[float, float]] = {}
+    for name in BACKENDS:
+        try:
+            codec = get_codec(name)
+        except ValueError:
+            print(f"{name:<8} not installed, skipped")
+            continue
+        raw = codec.dumps(obj)
+        assert codec.loads(raw) == obj
+        results[name] = (
+            _best_of(lambda c=codec: c.dumps(obj), args.repeat, args.number),
+            _best_of(lambda c=codec, r=raw: c.loads(r), args.repeat, args.number),
+        )
+
+    size_kb = len(get_codec("stdlib").dumps(obj)) / 1024
+    print(f"payload: {args.items} items, {size_kb:.0f} KiB")
+    print(f"{'backend':<8} {'dumps_ms':>10} {'loads_ms':>10}")
+    for name, (dumps_s, loads_s) in results.items():
+        print(f"{name:<8} {dumps_s * 1000:>10.3f} {loads_s * 1000:>10.3f}")
+    if "orjson" in results:
+        (sd, sl), (od, ol) = results["stdlib"], results["orjson"]
+        print(f"speedup: dumps x{sd / od:.1f}, loads x{sl / ol:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,10 +19,12 @@ class EchoUser(HttpUser):
     - You can override with
         set BASE_URL env
         or pass --host in CLI
+    - make perf-local runs it against autofw.utils.echo_server
+      with WAIT_MIN=0 WAIT_MAX=0 (measures the client, not the internet)
     """
 
     # Wait time between tasks (simulate real user pacing)
-    wait_time = between(0.2,1)
+    wait_time = between(float(_env("WAIT_MIN", "0.2")), float(_env("WAIT_MAX", "1")))
 
     # if you don't pass  --host, Locust uses this host attr.
     host = _env("BASE_URL", "https://postman-echo.com")
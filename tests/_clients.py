@@ -0,0 +1,88 @@
+# tests/_clients.py
+"""
+conftest 的 client / network_client 怎么从 config.yml + 环境变量构造出来（fixture 本身留在 conftest）：
+
+- build_client(cfg)：按环境配置建 APIClient（连接池 / 熔断 / 限速 / 对冲 / 缓存 / 传输层 / cassette / 指标 ...）
+- session_cassette()：AUTOFW_CASSETTE* 环境变量 -> Cassette（off = None）
+- patient(client)：network_client 的构造方式
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import os
+from typing import Any
+
+from autofw.api_client import APIClient
+from autofw.utils.cassette import Cassette
+from autofw.utils.circuit_breaker import CircuitBreaker
+from autofw.utils.dns_cache import get_dns_cache
+from autofw.utils.hedging import HedgePolicy
+from autofw.utils.metrics import get_registry
+from autofw.utils.rate_limiter import RateLimiter
+from autofw.utils.response_cache import ResponseCache
+from autofw.utils.retry_policy import RetryBudget
+
+# 录制 / 回放外网交互：off（默认，真实打网络）/ record / replay / auto，见 autofw.utils.cassette
+CASSETTE_MODE = os.environ.get("AUTOFW_CASSETTE", "off")
+CASSETTE_PATH = os.environ.get("AUTOFW_CASSETTE_PATH", "tests/cassettes/network.jsonl")
+# 回放时按录制耗时的多少倍 sleep（0 = 不等）
+CASSETTE_LATENCY = float(os.environ.get("AUTOFW_CASSETTE_LATENCY", "0"))
+
+
+def build_client(cfg: dict[str, Any]) -> APIClient:
+    # cache_ttl > 0 才打开 GET 缓存；需要最新数据的用例用 client.get(..., use_cache=False)
+    cache_ttl = float(cfg.get("cache_ttl", 0))
+    # circuit_breaker: {failure_rate, window, min_calls, cooldown}，不配 = 不熔断
+    breaker_cfg = cfg.get("circuit_breaker")
+    # rate_limit: {qps, burst, per_path}，不配 = 不限速
+    rate_cfg = cfg.get("rate_limit")
+    # hedge: {delay} 或 {percentile, max_extra_ratio}，不配 = 不对冲
+    hedge_cfg = cfg.get("hedge")
+    # dns_cache_ttl > 0：所有 client 共用一个进程级 DNS 缓存
+    dns_ttl = float(cfg.get("dns_cache_ttl", 0))
+    # metrics: true 时记进程级指标（reports/metrics.*）；cassette 回放的耗时不是真实延迟，不记
+    cassette = session_cassette()
+    record_metrics = bool(cfg.get("metrics", False)) and cassette is None
+    api_client = APIClient(
+        base_url=cfg["base_url"],
+        timeout=int(cfg.get("timeout", 20)),
+        retries=int(cfg.get("retries", 2)),
+        backoff=float(cfg.get("backoff", 0.5)),
+        jitter=str(cfg.get("jitter", "none")),
+        circuit_breaker=CircuitBreaker(**breaker_cfg) if breaker_cfg else None,
+        rate_limiter=RateLimiter(**rate_cfg) if rate_cfg else None,
+        hedge=HedgePolicy(**hedge_cfg) if hedge_cfg else None,
+        retry_budget=RetryBudget(ratio=float(cfg["retry_budget_ratio"])) if cfg.get("retry_budget_ratio") else None,
+        pool_connections=int(cfg.get("pool_connections", 10)),
+        pool_maxsize=int(cfg.get("pool_maxsize", 10)),
+        pool_block=bool(cfg.get("pool_block", False)),
+        dns_cache=get_dns_cache(dns_ttl) if dns_ttl > 0 else None,
+        cache=ResponseCache(ttl=cache_ttl) if cache_ttl > 0 else None,
+        log_mode=str(cfg.get("log_mode", "full")),
+        log_body_max=int(cfg.get("log_body_max", 1024)),
+        transport=str(cfg.get("transport", "http1")),
+        cassette=cassette,
+        metrics=get_registry() if record_metrics else None,
+    )
+    # warmup_connections > 0：session 开始时先把连接建好，第一个用例的耗时不再包含 DNS / TCP / TLS
+    warmup = int(cfg.get("warmup_connections", 0))
+    if warmup > 0:
+        api_client.warmup(warmup, timeout=min(api_client.timeout, 5))
+    return api_client
+
+
+def session_cassette() -> Cassette | None:
+    if CASSETTE_MODE == "off":
+        return None
+    return Cassette(CASSETTE_PATH, mode=CASSETTE_MODE, replay_latency=CASSETTE_LATENCY)
+
+
+def patient(api_client: APIClient) -> APIClient:
+    # 外网用更耐心的配置，不污染默认 client；其它字段（日志 / 传输层 / 录制回放 / 熔断 / 指标 ...）原样继承
+    return dataclasses.replace(
+        api_client,
+        timeout=max(api_client.timeout, 30),
+        retries=max(api_client.retries, 3),
+        backoff=max(api_client.backoff, 1.0),
+    )
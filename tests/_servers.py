@@ -0,0 +1,179 @@
+# tests/_servers.py
+"""
+离线用例用的本地 HTTP 服务（conftest 里的 local_base_url / local_h2_server fixture 用它们）：
+
+- LocalEchoHandler + serve_local_http()：ThreadingHTTPServer 上的 keep-alive 小服务（HTTP/1.1）
+- LocalH2Server：h2c（明文 HTTP/2）小服务
+"""
+
+from __future__ import annotations
+
+import json
+import socket
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import h2.config
+import h2.connection
+import h2.events
+
+
+class LocalEchoHandler(BaseHTTPRequestHandler):
+    """
+    本地 keep-alive 小服务（只给离线用例用）：
+    - GET /get          回显 headers / path
+    - GET /sleep/<ms>   睡 ms 毫秒再返回，用来制造并发/排队
+    - GET /etag         带 ETag: "v1"；If-None-Match 命中时回 304
+    - GET /items/<n>    chunked 传输的 JSON 数组（n 个元素）；/items/<n>?ndjson=1 一行一个
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path.startswith("/etag") and self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path.startswith("/items/"):
+            self._send_items()
+            return
+        if self.path.startswith("/sleep/"):
+            time.sleep(int(self.path.rsplit("/", 1)[-1]) / 1000)
+        body = json.dumps({"headers": dict(self.headers), "path": self.path}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if self.path.startswith("/etag"):
+            self.send_header("ETag", '"v1"')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_items(self):
+        split = urlsplit(self.path)
+        n = int(split.path.rsplit("/", 1)[-1])
+        ndjson = "ndjson=1" in split.query
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson" if ndjson else "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def chunk(data: bytes) -> None:
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+
+        if not ndjson:
+            chunk(b"[")
+        for i in range(n):
+            item = json.dumps({"id": i, "status": "active", "name": f"user-{i}"}).encode("utf-8")
+            if ndjson:
+                chunk(item + b"\n")
+            else:
+                chunk((b"," if i else b"") + item)
+        if not ndjson:
+            chunk(b"]")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, *args):
+        pass
+
+
+@contextmanager
+def serve_local_http() -> Iterator[str]:
+    """起一个 127.0.0.1 随机端口的 LocalEchoHandler 服务，yield base_url，退出时关掉"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), LocalEchoHandler)
+    t = threading.Thread(target=server.serve_forever, daemon=True)
+    t.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+class LocalH2Server:
+    """
+    本地 h2c（明文 HTTP/2，prior knowledge）小服务，给 transport="h2c" 的离线用例用：
+    - 每个 stream 单独一个线程处理，慢请求不会挡住同一连接上的其它 stream
+    - GET /get          回显 path / stream_id
+    - GET /sleep/<ms>   睡 ms 毫秒再返回
+    - GET /flaky/<key>  每个 key 第一次回 503，之后 200
+    - GET /cookie       带 Set-Cookie: sid=h2
+    - POST 任意 path    回显 body（data 字段）
+    - connections: 一共接受了多少条 TCP 连接（验证多路复用）
+    """
+
+    def __init__(self) -> None:
+        self._listener = socket.create_server(("127.0.0.1", 0))
+        self.base_url = f"http://127.0.0.1:{self._listener.getsockname()[1]}"
+        self.connections = 0
+        self._flaky_seen: set[str] = set()
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+
+    def _accept_loop(self) -> None:
+        while True:
+            try:
+                sock, _ = self._listener.accept()
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(target=self._serve, args=(sock,), daemon=True).start()
+
+    def _serve(self, sock: socket.socket) -> None:
+        conn = h2.connection.H2Connection(config=h2.config.H2Configuration(client_side=False))
+        lock = threading.Lock()
+        conn.initiate_connection()
+        sock.sendall(conn.data_to_send())
+        pending: dict[int, tuple[dict[bytes, bytes], bytearray]] = {}
+        with sock:
+            while True:
+                try:
+                    data = sock.recv(65535)
+                except OSError:
+                    return
+                if not data:
+                    return
+                with lock:
+                    events = conn.receive_data(data)
+                    for event in events:
+                        if isinstance(event, h2.events.RequestReceived):
+                            pending[event.stream_id] = (dict(event.headers), bytearray())
+                        elif isinstance(event, h2.events.DataReceived):
+                            pending[event.stream_id][1].extend(event.data)
+                            conn.acknowledge_received_data(event.flow_controlled_length, event.stream_id)
+                    sock.sendall(conn.data_to_send())
+                for event in events:
+                    if isinstance(event, h2.events.StreamEnded):
+                        headers, body = pending.pop(event.stream_id)
+                        threading.Thread(target=self._respond, daemon=True,
+                                         args=(sock, conn, lock, event.stream_id, headers, bytes(body))).start()
+
+    def _respond(self, sock, conn, lock, stream_id: int, headers: dict[bytes, bytes], body: bytes) -> None:
+        path = headers[b":path"].decode()
+        status = 200
+        extra: list[tuple[str, str]] = []
+        if path.startswith("/sleep/"):
+            time.sleep(int(path.rsplit("/", 1)[-1]) / 1000)
+        if path.startswith("/flaky/") and path not in self._flaky_seen:
+            self._flaky_seen.add(path)
+            status = 503
+        if path.startswith("/cookie"):
+            extra.append(("set-cookie", "sid=h2; Path=/"))
+        payload = {"path": path, "stream_id": stream_id, "method": headers[b":method"].decode()}
+        if body:
+            payload["data"] = body.decode("utf-8")
+        out = json.dumps(payload).encode("utf-8")
+        with lock:
+            try:
+                conn.send_headers(stream_id, [(":status", str(status)), ("content-type", "application/json"),
+                                              ("content-length", str(len(out))), *extra])
+                conn.send_data(stream_id, out, end_stream=True)
+                sock.sendall(conn.data_to_send())
+            except Exception:  # noqa: BLE001  客户端提前断开等，测试服务不关心
+                pass
+
+    def close(self) -> None:
+        self._listener.close()
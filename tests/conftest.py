@@ -1,13 +1,22 @@
 import os
+from collections.abc import Callable
+from urllib.parse import urlsplit
 
 import pytest
-import requests
 
 from autofw.api_client import APIClient
 from autofw.services.demo_echo_service import EchoService
 from autofw.services.user_service import UserService
 from autofw.utils.config_loader import load_config
 from autofw.utils.db import PG
+from autofw.utils.echo_server import EchoServer
+from autofw.utils.metrics import get_registry
+from autofw.utils.mock_transport import MockTransport, VirtualClock
+from tests._clients import CASSETTE_MODE, CASSETTE_PATH, build_client, patient
+from tests._servers import LocalH2Server, serve_local_http
+
+# 请求指标（延迟直方图 + 次数）输出目录，和 pytest-html 的 reports/report.html 放一起
+METRICS_DIR = os.environ.get("AUTOFW_METRICS_DIR", "reports")
 
 PROXY_KEYS = [
     "HTTP_PROXY", "HTTPS_PROXY", "http_proxy", "https_proxy",
@@ -42,12 +51,12 @@ def get_token() -> str:
 
 
 # ✅ 需要真实打外网时再用它（只给 network/integration 用例依赖）
+#    走 network_client：AUTOFW_CASSETTE=replay 时也能离线回放
 @pytest.fixture(scope="session")
-def get_token_network() -> str:
+def get_token_network(network_client: APIClient) -> str:
     print("\n[Fixture]开始获取token（网络）...")
-    url = "https://postman-echo.com/post"
     payload = {"username": "test_user", "password": "123456"}
-    resp = requests.post(url, json=payload, timeout=10)
+    resp = network_client.post("/post", json=payload, timeout=10, retries=0)
     if resp.status_code == 200:
         token = resp.json().get("json", {}).get("username", "") + "fake_token"
     else:
@@ -60,27 +69,82 @@ def get_token_network() -> str:
 def client() -> APIClient:
     cfg = load_config()
     print(f"[Fixture] 使用环境: {cfg['env']} | base_url={cfg['base_url']}")
-    return APIClient(
-        base_url=cfg["base_url"],
-        timeout=int(cfg.get("timeout", 20)),
-        retries=int(cfg.get("retries", 2)),
-        backoff=float(cfg.get("backoff", 0.5)),
-    )
+    return build_client(cfg)
 
 
 @pytest.fixture(scope="session")
-def network_client(client: APIClient) -> APIClient:
-    # 外网用更耐心的配置，不污染默认 client
-    return client.__class__(
-        base_url=client.base_url,
-        timeout=max(client.timeout, 30),
-        session=client.session,
-        retries=max(getattr(client, "retries", 2), 3),
-        backoff=max(getattr(client, "backoff", 0.5), 1.0),
-        retry_statuses=getattr(client, "retry_statuses", (429, 500, 502, 503, 504)),
-        retry_exceptions=getattr(client, "retry_exceptions",
-                                 (requests.exceptions.Timeout, requests.exceptions.ConnectionError)),
-    )
+def make_network_client() -> Callable[[APIClient], APIClient]:
+    """network_client 的构造方式；用例可以拿它从自己配的 client（比如 replay cassette）造一个"""
+    return patient
+
+
+@pytest.fixture(scope="session")
+def network_client(client: APIClient, make_network_client: Callable[[APIClient], APIClient]) -> APIClient:
+    return make_network_client(client)
+
+
+@pytest.fixture(autouse=True)
+def skip_network_when_circuit_open(request):
+    """
+    network / integration 用例：目标 host 的熔断器已经打开（环境挂了），直接跳过，
+    不再每个用例都白等超时 + 重试。
+    """
+    if not (request.node.get_closest_marker("network") or request.node.get_closest_marker("integration")):
+        return
+    api_client: APIClient = request.getfixturevalue("client")
+    breaker = api_client.circuit_breaker
+    if breaker is None:
+        return
+    host = urlsplit(api_client.base_url).netloc
+    if breaker.is_open(host):
+        pytest.skip(f"circuit open for {host}, skip network tier")
+
+
+@pytest.fixture(autouse=True)
+def skip_network_without_cassette(request):
+    """
+    AUTOFW_CASSETTE=replay 但还没有录好的 cassette（make network-record 录完提交）：
+    network / integration 用例直接跳过并说明原因，不会去连外网，也不会每个用例都 CassetteMissError。
+    """
+    if CASSETTE_MODE != "replay":
+        return
+    if not (request.node.get_closest_marker("network") or request.node.get_closest_marker("integration")):
+        return
+    if not os.path.exists(CASSETTE_PATH) or os.path.getsize(CASSETTE_PATH) == 0:
+        pytest.skip(f"no recorded cassette at {CASSETTE_PATH}; run `make network-record` and commit it")
+
+
+@pytest.fixture(autouse=True)
+def no_metrics_for_offline_tests(request):
+    """
+    mock 用例、用了 monkeypatch 的用例：用例期间 session 的 client / network_client 不记指标。
+    这些用例的响应是假的（monkeypatch session.request 之类），不能混进 reports/metrics.* 的真实延迟。
+    """
+    offline = request.node.get_closest_marker("mock") or "monkeypatch" in request.fixturenames
+    names = [name for name in ("network_client", "client") if name in request.fixturenames]
+    if not offline or not names:
+        yield
+        return
+    with pytest.MonkeyPatch.context() as mp:
+        # network_client 先取：它是从 client 复制出来的，不能在 client 临时关掉指标时才第一次复制
+        for name in names:
+            mp.setattr(request.getfixturevalue(name), "metrics", None)
+        yield
+
+
+@pytest.fixture
+def local_base_url():
+    """起一个 127.0.0.1 随机端口的本地 HTTP 服务（tests/_servers.py 的 LocalEchoHandler），返回 base_url"""
+    with serve_local_http() as base_url:
+        yield base_url
+
+
+@pytest.fixture
+def local_h2_server():
+    """本地 h2c 服务（tests/_servers.py 的 LocalH2Server）"""
+    server = LocalH2Server()
+    yield server
+    server.close()
 
 
 @pytest.fixture
@@ -88,6 +152,41 @@ def echo_service(client: APIClient):
     return EchoService(client)
 
 
+@pytest.fixture
+def virtual_clock() -> VirtualClock:
+    return VirtualClock()
+
+
+@pytest.fixture
+def mock_transport() -> MockTransport:
+    """空路由表；用例里 mock_transport.add(...) 配自己要的响应"""
+    return MockTransport()
+
+
+@pytest.fixture
+def mock_client(mock_transport: MockTransport, virtual_clock: VirtualClock) -> APIClient:
+    """
+    请求全部交给 mock_transport（不经过 requests / 网络），退避走 virtual_clock（不真睡）。
+    和 client / network_client 不共享任何状态，不用再 monkeypatch session.request / time.sleep。
+    metrics=None（APIClient 的默认值，这里写明）：假请求不记到进程级 registry，不污染 reports/metrics.* 里的真实延迟
+    """
+    return APIClient(base_url="http://mock.local", backoff=0.5, sender=mock_transport, sleep=virtual_clock.sleep,
+                     metrics=None)
+
+
+@pytest.fixture(scope="session")
+def echo_server():
+    """本地 postman-echo 替身（autofw.utils.echo_server），整个 session 共用一个"""
+    with EchoServer() as server:
+        yield server
+
+
+@pytest.fixture
+def local_echo_service(echo_server: EchoServer):
+    """和 echo_service 一样的接口，但打本地 echo_server：不联网、不限速"""
+    return EchoService(APIClient(base_url=echo_server.base_url, timeout=5, retries=0))
+
+
 @pytest.fixture(scope="session")
 def pg() -> PG:
     """
@@ -143,3 +242,13 @@ def user_service(network_client, pg):
     - uses local/CI Postgres for db assertions
     """
     return UserService(network_client, pg)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """整个 session 的 APIClient 请求指标写成 metrics.json / metrics.csv（p50/p90/p99/max、RPS）"""
+    registry = get_registry()
+    if not len(registry):
+        return
+    out_dir = os.path.join(str(session.config.rootpath), METRICS_DIR)
+    registry.write_json(os.path.join(out_dir, "metrics.json"))
+    registry.write_csv(os.path.join(out_dir, "metrics.csv"))
@@ -19,6 +19,19 @@ def test_config_default_env():
     assert cfg["timeout"] > 0
 
 
+@pytest.mark.config
+def test_default_env_keeps_new_options_opt_in():
+    """
+    默认环境不悄悄打开新行为：jitter / 熔断 / 限速 / 对冲 / 缓存这些都要显式配置才生效
+    """
+    cfg = load_config()
+    assert cfg.get("jitter", "none") == "none"
+    for key in ("retry_budget_ratio", "circuit_breaker", "rate_limit", "hedge"):
+        assert not cfg.get(key), key
+    for key in ("cache_ttl", "dns_cache_ttl", "warmup_connections"):
+        assert not cfg.get(key, 0), key
+
+
 @pytest.mark.config
 def test_config_switch_env_with_monkeypatch(monkeypatch):
     """
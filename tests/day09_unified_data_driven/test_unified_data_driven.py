@@ -1,6 +1,8 @@
 import pytest
 
+from autofw.utils.assertions import assert_status_code
 from autofw.utils.data_loader import load_yaml
+from autofw.utils.soft_assertions import SoftAssertions
 
 # 1)启动时一习性把 YAML 用例读进来
 cases = load_yaml("day09_unified_cases.yml")
@@ -23,6 +25,9 @@ def test_unified_get_post(client, case):
     expected_status = case["expected_status"]
     expect_echo = case.get("expect_echo")
 
+    if expect_echo and expect_echo not in ("args", "json"):
+        pytest.skip(f"暂不认识的expect_echo类型: {expect_echo}")
+
     # 2) 根据 method 选择 GET / POST
     if method == "GET":
         resp = client.get(path, params=params)
@@ -31,31 +36,34 @@ def test_unified_get_post(client, case):
     else:
         pytest.skip(f"暂不支持的方法: {method}")
 
-    # 3) 断言状态码
-    assert resp.status_code == expected_status
-
-    # 4) 根据 expect_echo 决定如何校验响应体
-    if not expect_echo:
-        # 如果 YAML 没配置 expect_echo，就只校验状态码
-        return
+    # 3) 状态码 + 回显一起查完，退出 with 时把全部失败一次报出来（软断言）
+    with SoftAssertions(label=case["name"]) as soft:
+        soft.check("status", assert_status_code, resp, expected_status)
 
-    resp_json = resp.json()
+        # 4) 根据 expect_echo 决定如何校验响应体
+        if not expect_echo:
+            # 如果 YAML 没配置 expect_echo，就只校验状态码
+            return
 
-    if expect_echo == "args":
-        # GET /get 的查询参数回显在 args
-        echoed_args = resp_json.get("args",{})
-        assert echoed_args == params
+        try:
+            resp_json = resp.json()
+        except ValueError:
+            soft.fail("json", f"响应不是合法 JSON: {resp.text[:200]!r}")
+            return
 
-    elif expect_echo == "json":
-        # POST /post 的 JSON 回显在 json 字段
-        echoed_json = resp_json.get("json")
+        if expect_echo == "args":
+            # GET /get 的查询参数回显在 args
+            with soft.expect("args"):
+                echoed_args = resp_json.get("args", {})
+                assert echoed_args == params
 
-        # ⚠ postman-echo 对空 JSON 会返回 null（Python里是 None）
-        if json_body == {} and echoed_json is None:
-            echoed_json = {}
+        else:
+            # POST /post 的 JSON 回显在 json 字段
+            echoed_json = resp_json.get("json")
 
-        assert echoed_json == json_body
-
-    else:
-        pytest.skip(f"暂不认识的expect_echo类型: {expect_echo}")
+            # ⚠ postman-echo 对空 JSON 会返回 null（Python里是 None）
+            if json_body == {} and echoed_json is None:
+                echoed_json = {}
 
+            with soft.expect("json"):
+                assert echoed_json == json_body
@@ -3,8 +3,8 @@
 import pytest
 import requests
 
-from autofw.utils.assertions import assert_dict_contains, assert_status_code
 from autofw.utils.data_loader import load_yaml
+from autofw.utils.soft_assertions import check_case
 
 # 启动时一次性加载 YAML 用例
 cases = load_yaml("day10_unified_cases.yml")
@@ -32,8 +32,6 @@ def test_unified_with_advanced_assertions(client, case):
     path = case["path"]
     params = case.get("params") or {}
     json_body = case.get("json") or {}
-    expected_status = case["expected_status"]
-    expected_subset = case.get("expected_subset") or {}
 
     # 1. 发送请求(增加网络异常保护)
     try:
@@ -47,18 +45,5 @@ def test_unified_with_advanced_assertions(client, case):
         # ✅ 如果是公司网络/防火墙/外网问题，就优雅地跳过，不算你代码挂
         pytest.skip(f"网络异常，跳过本用例: {e}")
 
-    # 2. 统一断言状态码
-    assert_status_code(resp, expected_status)
-
-    # 3. 如果没有配置 expected_subset，表示只关心状态码，直接返回
-    if not expected_subset:
-        return
-
-    # 4. 尝试解析 JSON
-    try:
-        body = resp.json()
-    except ValueError:
-        pytest.fail(f"响应不是合法 JSON: {resp.text[:200]}")
-
-    # 5. 使用我们封装的“字典包含断言”
-    assert_dict_contains(body, expected_subset)
+    # 2. 状态码 + expected_subset 一次查完，失败时一起报出来（软断言）
+    check_case(resp, case).raise_if_failed()
@@ -2,7 +2,7 @@
 import pytest
 
 from autofw.services.demo_echo_service import EchoService
-from autofw.utils.assertions import assert_dict_contains, assert_status_code
+from autofw.utils.soft_assertions import check_case
 
 pytestmark = pytest.mark.network  # ✅ 整个模块默认都是 network
 
@@ -18,13 +18,8 @@ def test_echo_get_with_params_basic(echo_service: EchoService):
 
     resp = echo_service.get_with_params(params)
 
-    assert_status_code(resp, 200)
-
-    body = resp.json()
-    expected = {
-        "args": params
-    }
-    assert_dict_contains(body, expected)
+    # 状态码 + args 回显一次查完，失败时一起报出来（软断言）
+    check_case(resp, {"expected_status": 200, "expected_subset": {"args": params}}).raise_if_failed()
 
 
 @pytest.mark.service
@@ -50,13 +45,8 @@ def test_echo_get_params_dd(echo_service: EchoService, params):
     """
     resp = echo_service.get_with_params(params)
 
-    assert_status_code(resp, 200)
-
-    body = resp.json()
-    expected = {
-        "args": params
-    }
-    assert_dict_contains(body, expected)
+    # 状态码 + args 回显一次查完，失败时一起报出来（软断言）
+    check_case(resp, {"expected_status": 200, "expected_subset": {"args": params}}).raise_if_failed()
 
 
 @pytest.mark.service
@@ -77,14 +67,6 @@ def test_echo_post_json_service(echo_service: EchoService):
 
     resp = echo_service.post_json(payload)
 
-    assert_status_code(resp, 200)
-
-    body = resp.json()
-
     # postman-echo 的 /post 会在 json 字段里回显请求体
-    expected_subset = {
-        "json": payload
-    }
-
-    # 我们只关心 body["json"] 是否包含 payload（全量匹配也 ok）
-    assert_dict_contains(body, expected_subset)
+    # 我们只关心 body["json"] 是否包含 payload（全量匹配也 ok），规则同 assert_dict_contains
+    check_case(resp, {"expected_status": 200, "expected_subset": {"json": payload}}).raise_if_failed()
@@ -0,0 +1,167 @@
+# tests/day24_async_client/test_async_client.py
+import asyncio
+
+import httpx
+import pytest
+
+from autofw.services.demo_echo_service import AsyncEchoService
+from autofw.utils.async_api_client import AsyncAPIClient
+
+
+def _make_client(handler, **kwargs) -> AsyncAPIClient:
+    session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return AsyncAPIClient(base_url="http://mock.local", session=session, backoff=0, **kwargs)
+
+
+@pytest.mark.mock
+def test_async_echo_service_get_and_post():
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "GET":
+            return httpx.Response(200, json={"args": dict(request.url.params), "url": str(request.url)})
+        return httpx.Response(200, content=b'{"json": ' + request.content + b"}")
+
+    async def main():
+        async with _make_client(handler) as client:
+            service = AsyncEchoService(client)
+            get_resp, post_resp = await asyncio.gather(
+                service.get_with_params({"foo": "bar"}),
+                service.post_json({"user": {"id": 10086}}),
+            )
+        return get_resp, post_resp
+
+    get_resp, post_resp = asyncio.run(main())
+    assert get_resp.status_code == 200
+    assert get_resp.json()["args"] == {"foo": "bar"}
+    assert post_resp.json()["json"] == {"user": {"id": 10086}}
+
+
+@pytest.mark.mock
+@pytest.mark.retry
+def test_async_retry_on_timeout_then_success():
+    calls = {"n": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls["n"] += 1
+        if calls["n"] == 1:
+            raise httpx.ReadTimeout("boom", request=request)
+        return httpx.Response(200, json={"ok": True})
+
+    async def main():
+        async with _make_client(handler) as client:
+            return await client.get("/get")
+
+    resp = asyncio.run(main())
+    assert resp.status_code == 200
+    assert calls["n"] == 2
+
+
+@pytest.mark.mock
+@pytest.mark.retry
+def test_async_request_override_disable_retry():
+    calls = {"n": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls["n"] += 1
+        return httpx.Response(503)
+
+    async def main():
+        async with _make_client(handler, retries=3) as client:
+            return await client.get("/status/503", retries=0)
+
+    resp = asyncio.run(main())
+    assert resp.status_code == 503
+    assert calls["n"] == 1
+
+
+@pytest.mark.mock
+def test_async_logging_redaction(caplog):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"ok": True})
+
+    async def main():
+        async with _make_client(handler) as client:
+            await client.get("/get", headers={"Authorization": "Bearer SECRET"})
+
+    with caplog.at_level("INFO"):
+        asyncio.run(main())
+
+    text = "\n".join(r.message for r in caplog.records)
+    assert "Bearer SECRET" not in text
+    assert "***REDACTED***" in text
+
+
+@pytest.mark.mock
+def test_async_follows_redirects_like_requests():
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/old":
+            return httpx.Response(302, headers={"Location": "/new"})
+        return httpx.Response(200, json={"path": request.url.path})
+
+    async def main():
+        async with _make_client(handler) as client:
+            return await client.get("/old"), await client.get("/old", follow_redirects=False)
+
+    followed, raw = asyncio.run(main())
+    assert followed.status_code == 200 and followed.json() == {"path": "/new"}
+    assert raw.status_code == 302
+
+
+@pytest.mark.mock
+@pytest.mark.retry
+@pytest.mark.parametrize("exc", [httpx.RemoteProtocolError, httpx.ReadError, httpx.ConnectError])
+def test_async_retries_dropped_connections(exc):
+    calls = {"n": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls["n"] += 1
+        if calls["n"] == 1:
+            raise exc("peer closed connection", request=request)
+        return httpx.Response(200, json={"ok": True})
+
+    async def main():
+        async with _make_client(handler) as client:
+            return await client.get("/get")
+
+    assert asyncio.run(main()).status_code == 200
+    assert calls["n"] == 2
+
+
+class _RecordingPG:
+    """只记录 SQL 的假 PG：同步 / 异步 service 应该发出完全一样的语句"""
+
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, sql, params=None):
+        self.statements.append((sql, params))
+        return 1
+
+    def fetchone(self, sql, params=None):
+        self.statements.append((sql, params))
+        return {"username": params[0]}
+
+
+@pytest.mark.mock
+def test_async_user_service_runs_the_same_sql_as_sync(mock_client, mock_transport):
+    from autofw.services.user_service import AsyncUserService, UserService
+
+    mock_transport.add("POST", "/post", json={})
+    mock_transport.add("GET", "/get", json={})
+    sync_pg = _RecordingPG()
+    sync = UserService(mock_client, sync_pg)
+    sync.create_user("t", username="u1", email="u1@x", status="active")
+    sync.get_user("t", username="u1")
+    sync.update_user_status("t", username="u1", new_status="disabled")
+
+    async def main():
+        async_pg = _RecordingPG()
+        async with _make_client(lambda request: httpx.Response(200, json={})) as client:
+            service = AsyncUserService(client, async_pg)
+            await service.create_user("t", username="u1", email="u1@x", status="active")
+            await service.get_user("t", username="u1")
+            await service.update_user_status("t", username="u1", new_status="disabled")
+        return async_pg
+
+    async_pg = asyncio.run(main())
+    assert async_pg.statements == sync_pg.statements
+    assert len(sync_pg.statements) == 5
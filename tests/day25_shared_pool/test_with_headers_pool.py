@@ -0,0 +1,37 @@
+# tests/day25_shared_pool/test_with_headers_pool.py
+import pytest
+
+from autofw.utils.api_client import APIClient
+
+
+@pytest.mark.mock
+def test_with_headers_shares_session_and_not_pollute(local_base_url):
+    client = APIClient(base_url=local_base_url, timeout=3)
+    auth_client = client.with_headers({"Authorization": "Bearer T1"})
+
+    assert auth_client.session is client.session
+    assert "Authorization" not in client.session.headers
+
+    resp = auth_client.get("/get")
+    assert resp.json()["headers"]["Authorization"] == "Bearer T1"
+
+    # 请求级 headers 优先于 with_headers 叠加的头
+    resp = auth_client.get("/get", headers={"Authorization": "Bearer T2"})
+    assert resp.json()["headers"]["Authorization"] == "Bearer T2"
+
+    # 父 client 不带 token
+    resp = client.get("/get")
+    assert "Authorization" not in resp.json()["headers"]
+
+
+@pytest.mark.mock
+def test_with_headers_reuses_keep_alive_connection(local_base_url):
+    client = APIClient(base_url=local_base_url, timeout=3)
+
+    for i in range(5):
+        client.with_headers({"Authorization": f"Bearer {i}"}).get("/get")
+
+    stats = client.connection_stats()
+    assert stats["requests"] == 5
+    assert stats["connections_opened"] == 1
+    assert stats["connections_reused"] == 4
@@ -0,0 +1,49 @@
+# tests/day26_pool_stats/test_pool_stats.py
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from autofw.utils.api_client import APIClient
+from autofw.utils.http_pool import PooledHTTPAdapter
+
+
+@pytest.mark.mock
+def test_pool_adapter_mounted_once_for_shared_session(local_base_url):
+    client = APIClient(base_url=local_base_url, pool_maxsize=4)
+    adapter = client.session.get_adapter("https://")
+    assert isinstance(adapter, PooledHTTPAdapter)
+    assert adapter._pool_maxsize == 4
+
+    # 共享 session 的 client 不会重新挂 adapter（否则连接池会被丢掉）
+    shared = APIClient(base_url=local_base_url, session=client.session, pool_maxsize=99)
+    assert shared.session.get_adapter("https://") is adapter
+
+
+@pytest.mark.mock
+def test_non_blocking_pool_discards_extra_connections(local_base_url):
+    client = APIClient(base_url=local_base_url, timeout=5, pool_maxsize=1, pool_block=False)
+
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        resps = list(ex.map(lambda _: client.get("/sleep/100"), range(4)))
+
+    assert all(r.status_code == 200 for r in resps)
+    stats = client.connection_stats()
+    assert stats["requests"] == 4
+    assert stats["connections_opened"] == 4
+    # 池子只能放回 1 条，其余 3 条被丢弃
+    assert stats["connections_discarded"] == 3
+
+
+@pytest.mark.mock
+def test_blocking_pool_waits_for_connection(local_base_url):
+    client = APIClient(base_url=local_base_url, timeout=5, pool_maxsize=1, pool_block=True)
+
+    with ThreadPoolExecutor(max_workers=3) as ex:
+        list(ex.map(lambda _: client.get("/sleep/100"), range(3)))
+
+    stats = client.connection_stats()
+    assert stats["requests"] == 3
+    assert stats["connections_opened"] == 1
+    assert stats["connections_reused"] == 2
+    assert stats["connections_discarded"] == 0
+    assert stats["pool_wait_ms_max"] >= 50
@@ -0,0 +1,76 @@
+# tests/day27_batch_map/test_batch_map.py
+import asyncio
+import threading
+
+import httpx
+import pytest
+import requests
+
+from autofw.utils.api_client import APIClient
+from autofw.utils.async_api_client import AsyncAPIClient
+
+
+@pytest.mark.mock
+def test_map_keeps_order_and_runs_concurrently(mock_client, mock_transport):
+    # 8 个请求都到齐才一起放行：串行执行时第一个请求就会在 barrier 上超时，不靠墙钟判断快慢
+    barrier = threading.Barrier(8, timeout=5)
+
+    @mock_transport.route("GET", "/slow/{n}")
+    def _slow(req):
+        barrier.wait()
+        return {"path": req.path}
+
+    specs = [{"method": "GET", "path": f"/slow/{i}"} for i in range(8)]
+    results = mock_client.map(specs, concurrency=8)
+
+    assert all(r.ok for r in results)
+    assert [r.response.json()["path"] for r in results] == [s["path"] for s in specs]
+    assert mock_transport.call_count() == 8
+
+
+@pytest.mark.mock
+def test_map_returns_failures_as_values_with_overrides(local_base_url):
+    client = APIClient(base_url=local_base_url, timeout=5, retries=3, backoff=0)
+    specs = [
+        {"method": "GET", "path": "/get", "params": {"a": "1"}},
+        # 端口 1 连不上；请求级 retries=0 覆盖生效，不重试
+        {"method": "GET", "path": "http://127.0.0.1:1/get", "retries": 0, "timeout": 1},
+        {"method": "GET", "path": "/get"},
+    ]
+
+    results = client.map(specs, concurrency=2)
+
+    assert [r.ok for r in results] == [True, False, True]
+    assert isinstance(results[1].error, requests.exceptions.ConnectionError)
+    assert results[1].response is None
+    assert results[0].response.json()["path"] == "/get?a=1"
+
+
+@pytest.mark.mock
+def test_map_empty_specs():
+    assert APIClient(base_url="http://mock.local").map([]) == []
+
+
+@pytest.mark.mock
+def test_async_gather_bounded_concurrency():
+    state = {"in_flight": 0, "peak": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        await asyncio.sleep(0.01)
+        state["in_flight"] -= 1
+        if request.url.path == "/boom":
+            raise httpx.ConnectError("down", request=request)
+        return httpx.Response(200, json={"path": request.url.path})
+
+    async def main():
+        session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with AsyncAPIClient(base_url="http://mock.local", session=session, retries=0) as client:
+            specs = [{"path": f"/item/{i}"} for i in range(20)] + [{"path": "/boom"}]
+            return await client.gather(specs, concurrency=5)
+
+    results = asyncio.run(main())
+    assert state["peak"] <= 5
+    assert [r.response.json()["path"] for r in results[:20]] == [f"/item/{i}" for i in range(20)]
+    assert isinstance(results[-1].error, httpx.ConnectError)
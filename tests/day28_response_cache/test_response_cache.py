@@ -0,0 +1,87 @@
+# tests/day28_response_cache/test_response_cache.py
+import time
+
+import pytest
+
+from autofw.utils.api_client import APIClient
+from autofw.utils.response_builder import build_response
+from autofw.utils.response_cache import ResponseCache
+
+
+@pytest.mark.mock
+def test_cache_hit_skips_network(local_base_url):
+    cache = ResponseCache(ttl=60)
+    client = APIClient(base_url=local_base_url, timeout=3, cache=cache)
+
+    r1 = client.get("/get", params={"a": "1"})
+    r2 = client.get("/get", params={"a": "1"})
+    r3 = client.get("/get", params={"a": "2"})  # 参数不同 = 不同 key
+
+    assert r2 is r1
+    assert r3 is not r1
+    assert client.connection_stats()["requests"] == 2
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+@pytest.mark.mock
+def test_cache_is_opt_in_per_call(local_base_url):
+    client = APIClient(base_url=local_base_url, timeout=3, cache=ResponseCache())
+
+    client.get("/get")
+    fresh = client.get("/get", use_cache=False)
+
+    assert fresh.status_code == 200
+    assert client.connection_stats()["requests"] == 2
+
+    with pytest.raises(ValueError):
+        APIClient(base_url=local_base_url).get("/get", use_cache=True)
+
+
+@pytest.mark.mock
+def test_cache_varies_on_authorization(local_base_url):
+    cache = ResponseCache()
+    client = APIClient(base_url=local_base_url, timeout=3, cache=cache)
+
+    a = client.with_headers({"Authorization": "Bearer A"}).get("/get")
+    b = client.with_headers({"Authorization": "Bearer B"}).get("/get")
+
+    assert a is not b
+    assert b.json()["headers"]["Authorization"] == "Bearer B"
+
+
+@pytest.mark.mock
+def test_expired_entry_revalidates_with_etag(local_base_url):
+    cache = ResponseCache(ttl=0.01)
+    client = APIClient(base_url=local_base_url, timeout=3, cache=cache)
+
+    first = client.get("/etag")
+    time.sleep(0.02)
+    second = client.get("/etag")  # 过期 -> If-None-Match -> 304 -> 复用旧响应
+
+    assert second is first
+    assert second.status_code == 200
+    assert cache.stats()["revalidated"] == 1
+
+
+@pytest.mark.mock
+def test_lru_eviction_by_entries_and_bytes():
+    cache = ResponseCache(max_entries=2, max_bytes=10_000)
+    for i in range(3):
+        cache.store(("GET", f"/r{i}", (), ()), build_response(200, {"i": i}))
+
+    assert cache.lookup(("GET", "/r0", (), ()))[0] is None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["entries"] == 2
+
+    small = ResponseCache(max_bytes=20)
+    small.store(("GET", "/big", (), ()), build_response(200, {"x": "y" * 100}))
+    assert small.stats()["entries"] == 0
+
+
+@pytest.mark.mock
+def test_non_200_and_no_store_not_cached():
+    cache = ResponseCache()
+    cache.store(("k1",), build_response(500, {"err": 1}))
+    cache.store(("k2",), build_response(200, {"ok": 1}, headers={"Cache-Control": "no-store"}))
+    assert cache.stats()["entries"] == 0
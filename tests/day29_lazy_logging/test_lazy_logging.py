@@ -0,0 +1,116 @@
+# tests/day29_lazy_logging/test_lazy_logging.py
+import logging
+
+import pytest
+
+import autofw.utils.api_client as api_client_mod
+from autofw.utils.api_client import APIClient
+from autofw.utils.response_builder import build_response
+
+
+def _fake_request(method, url, **kwargs):
+    return build_response(200, {"ok": True}, url=url)
+
+
+def _request_lines(caplog):
+    return [r.getMessage() for r in caplog.records if r.name == "autofw.api_client"]
+
+
+@pytest.mark.mock
+def test_full_mode_one_req_and_one_resp_line(monkeypatch, caplog):
+    client = APIClient(base_url="http://mock.local")
+    monkeypatch.setattr(client.session, "request", _fake_request)
+
+    with caplog.at_level("INFO"):
+        client.get("/get", params={"a": "1"})
+
+    lines = _request_lines(caplog)
+    assert len(lines) == 2
+    assert lines[0].startswith("[REQ ")
+    assert lines[1].startswith("[RESP ")
+
+
+@pytest.mark.mock
+def test_log_body_max_truncates_large_json(monkeypatch, caplog):
+    client = APIClient(base_url="http://mock.local", log_body_max=100)
+    monkeypatch.setattr(client.session, "request", _fake_request)
+
+    with caplog.at_level("INFO"):
+        client.post("/post", json={"blob": "x" * 10_000})
+
+    req_line = _request_lines(caplog)[0]
+    assert "truncated" in req_line
+    assert len(req_line) < 300
+
+
+@pytest.mark.mock
+def test_compact_mode_single_line(monkeypatch, caplog):
+    client = APIClient(base_url="http://mock.local", log_mode="compact")
+    monkeypatch.setattr(client.session, "request", _fake_request)
+
+    with caplog.at_level("INFO"):
+        client.get("/get", headers={"Authorization": "Bearer SECRET"})
+
+    lines = _request_lines(caplog)
+    assert len(lines) == 1
+    assert "status=200" in lines[0]
+    assert "attempts=1" in lines[0]
+    assert "SECRET" not in lines[0]
+
+
+@pytest.mark.mock
+def test_off_mode_and_level_gate_skip_formatting(monkeypatch, caplog):
+    formatted = {"n": 0}
+
+    class _Spy(api_client_mod._LazyKwargs):
+        def __str__(self):
+            formatted["n"] += 1
+            return super().__str__()
+
+    monkeypatch.setattr(api_client_mod, "_LazyKwargs", _Spy)
+
+    off_client = APIClient(base_url="http://mock.local", log_mode="off")
+    monkeypatch.setattr(off_client.session, "request", _fake_request)
+    with caplog.at_level("INFO"):
+        off_client.get("/get")
+    assert _request_lines(caplog) == []
+
+    # full 模式但 logger 级别是 WARNING：也不会去格式化 kwargs
+    full_client = APIClient(base_url="http://mock.local")
+    monkeypatch.setattr(full_client.session, "request", _fake_request)
+    caplog.set_level(logging.WARNING, logger="autofw.api_client")
+    full_client.get("/get")
+    assert formatted["n"] == 0
+
+
+@pytest.mark.mock
+def test_invalid_log_mode():
+    with pytest.raises(ValueError):
+        APIClient(base_url="http://mock.local", log_mode="verbose")
+
+
+@pytest.mark.mock
+def test_bad_env_log_level_falls_back_to_info(monkeypatch, caplog):
+    from autofw.utils.logger_helper import get_logger
+
+    monkeypatch.setenv("AUTOFW_LOG_LEVEL", "WARN_")
+    with caplog.at_level("WARNING"):
+        logger = get_logger("autofw.day29_bad_level")
+
+    assert logger.level == logging.INFO
+    assert any("WARN_" in r.getMessage() for r in caplog.records)
+
+    monkeypatch.setenv("AUTOFW_LOG_LEVEL", "warning")
+    assert get_logger("autofw.day29_bad_level").level == logging.WARNING
+
+
+@pytest.mark.mock
+def test_bad_env_log_level_warns_once(monkeypatch, caplog):
+    from autofw.utils.logger_helper import get_logger
+
+    monkeypatch.setenv("AUTOFW_LOG_LEVEL", "LOUD_ONCE")
+    with caplog.at_level("WARNING"):
+        for name in ("autofw.day29_once_a", "autofw.day29_once_b", "autofw.day29_once_a"):
+            assert get_logger(name).level == logging.INFO
+
+    assert sum("LOUD_ONCE" in r.getMessage() for r in caplog.records) == 1
@@ -0,0 +1,121 @@
+# tests/day30_retry_budget/test_retry_budget.py
+import pytest
+import requests
+
+import autofw.utils.api_client as api_client_mod
+from autofw.utils.api_client import APIClient
+from autofw.utils.response_builder import build_response
+from autofw.utils.retry_policy import RetryBudget, compute_backoff, parse_retry_after
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(api_client_mod.time, "sleep", lambda s: recorded.append(s))
+    return recorded
+
+
+@pytest.mark.retry
+@pytest.mark.mock
+def test_retry_after_header_is_honored(monkeypatch, sleeps):
+    client = APIClient(base_url="http://mock.local", retries=2, backoff=0.1)
+    responses = iter([
+        build_response(429, {"msg": "slow down"}, headers={"Retry-After": "3"}),
+        build_response(200, {"ok": True}),
+    ])
+    monkeypatch.setattr(client.session, "request", lambda method, url, **kw: next(responses))
+
+    resp = client.get("/get")
+
+    assert resp.status_code == 200
+    assert sleeps == [3.0]
+
+
+@pytest.mark.retry
+@pytest.mark.mock
+def test_retry_after_is_capped(monkeypatch, sleeps):
+    client = APIClient(base_url="http://mock.local", retries=1, retry_after_max=5)
+    responses = iter([
+        build_response(503, None, headers={"Retry-After": "3600"}),
+        build_response(200, {"ok": True}),
+    ])
+    monkeypatch.setattr(client.session, "request", lambda method, url, **kw: next(responses))
+
+    client.get("/get")
+    assert sleeps == [5]
+
+
+@pytest.mark.retry
+@pytest.mark.mock
+def test_retry_budget_denies_retries_when_exhausted(monkeypatch, sleeps):
+    budget = RetryBudget(ratio=0.0, min_tokens=1)
+    client = APIClient(base_url="http://mock.local", retries=3, backoff=0.1, retry_budget=budget)
+    calls = {"n": 0}
+
+    def always_500(method, url, **kwargs):
+        calls["n"] += 1
+        return build_response(500, {"err": True})
+
+    monkeypatch.setattr(client.session, "request", always_500)
+
+    # 预算只有 1 个令牌：首次 + 1 次重试，之后直接返回 500
+    assert client.get("/a").status_code == 500
+    assert calls["n"] == 2
+
+    # 预算用完：不再重试
+    assert client.get("/b").status_code == 500
+    assert calls["n"] == 3
+
+    stats = budget.stats()
+    assert stats["requests"] == 2
+    assert stats["retries_spent"] == 1
+    # /a 第 2 次重试被拒 + /b 第 1 次重试被拒
+    assert stats["retries_denied"] == 2
+
+
+@pytest.mark.retry
+@pytest.mark.mock
+def test_retry_budget_denied_exception_is_raised(monkeypatch, sleeps):
+    budget = RetryBudget(ratio=0.0, min_tokens=0)
+    client = APIClient(base_url="http://mock.local", retries=3, retry_budget=budget)
+
+    def always_timeout(method, url, **kwargs):
+        raise requests.exceptions.ReadTimeout("boom")
+
+    monkeypatch.setattr(client.session, "request", always_timeout)
+
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        client.get("/get")
+    assert sleeps == []
+    assert budget.stats()["retries_denied"] == 1
+
+
+@pytest.mark.retry
+def test_budget_refills_with_traffic():
+    budget = RetryBudget(ratio=0.5, min_tokens=0, max_tokens=1)
+    assert budget.try_spend() is False
+    budget.record_request()
+    budget.record_request()
+    budget.record_request()  # 封顶 max_tokens=1
+    assert budget.try_spend() is True
+    assert budget.try_spend() is False
+
+
+@pytest.mark.retry
+def test_compute_backoff_jitter_bounds():
+    assert compute_backoff(3, 0.5) == 2.0
+    assert compute_backoff(10, 0.5, cap=4) == 4
+    for attempt in range(1, 6):
+        assert 0 <= compute_backoff(attempt, 0.5, jitter="full") <= 0.5 * 2 ** (attempt - 1)
+    prev = 0.0
+    for _ in range(20):
+        prev = compute_backoff(1, 0.5, jitter="decorrelated", prev_sleep=prev, cap=10)
+        assert 0.5 <= prev <= 10
+
+
+@pytest.mark.retry
+def test_parse_retry_after():
+    assert parse_retry_after("120") == 120.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0  # 过去的时间
+    assert parse_retry_after("not-a-date") is None
+    assert parse_retry_after(None) is None
@@ -0,0 +1,120 @@
+# tests/day31_circuit_breaker/test_circuit_breaker.py
+import pytest
+import requests
+
+import autofw.utils.api_client as api_client_mod
+from autofw.utils.api_client import APIClient
+from autofw.utils.cassette import CassetteMissError
+from autofw.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from autofw.utils.mock_transport import MockTransport, NoRouteError
+from autofw.utils.response_builder import build_response
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.mock
+def test_breaker_state_transitions():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_rate=0.5, window=4, min_calls=4, cooldown=10, clock=clock)
+    host = "api.local"
+
+    for ok in (True, False, True, False):
+        breaker.before_call(host)
+        breaker.record(host, ok)
+    assert breaker.state(host) == "open"
+
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call(host)
+
+    clock.now = 10
+    assert breaker.state(host) == "half_open"
+    breaker.before_call(host)  # 探测请求放行
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call(host)  # 探测名额只有 1 个
+
+    breaker.record(host, False)  # 探测失败 -> 重新打开
+    assert breaker.state(host) == "open"
+
+    clock.now = 20
+    breaker.before_call(host)
+    breaker.record(host, True)  # 探测成功 -> 关闭
+    assert breaker.state(host) == "closed"
+    assert breaker.state("other.local") == "closed"
+
+
+@pytest.mark.mock
+def test_client_fails_fast_when_host_is_down(monkeypatch):
+    monkeypatch.setattr(api_client_mod.time, "sleep", lambda s: None)
+    breaker = CircuitBreaker(failure_rate=1.0, window=3, min_calls=3, cooldown=60)
+    client = APIClient(base_url="http://down.local", retries=5, circuit_breaker=breaker)
+    calls = {"n": 0}
+
+    def always_refused(method, url, **kwargs):
+        calls["n"] += 1
+        raise requests.exceptions.ConnectionError("refused")
+
+    monkeypatch.setattr(client.session, "request", always_refused)
+
+    # 第 3 次失败后熔断打开，剩下的重试直接 CircuitOpenError，不再真的发请求
+    with pytest.raises(CircuitOpenError):
+        client.get("/get")
+    assert calls["n"] == 3
+
+    with pytest.raises(CircuitOpenError):
+        client.with_headers({"Authorization": "Bearer x"}).get("/get")
+    assert calls["n"] == 3
+    assert breaker.is_open("down.local")
+
+
+@pytest.mark.mock
+def test_5xx_counts_as_failure_but_4xx_does_not(monkeypatch):
+    breaker = CircuitBreaker(failure_rate=0.5, window=2, min_calls=2)
+    client = APIClient(base_url="http://svc.local", retries=0, circuit_breaker=breaker)
+    statuses = iter([404, 404, 502])
+    monkeypatch.setattr(client.session, "request",
+                        lambda method, url, **kw: build_response(next(statuses), {}))
+
+    client.get("/a")
+    client.get("/a")
+    assert breaker.state("svc.local") == "closed"
+
+    # 窗口 [404, 502]：失败率 0.5 -> 打开
+    client.get("/a")
+    assert breaker.state("svc.local") == "open"
+
+
+@pytest.mark.mock
+def test_non_transport_errors_do_not_trip_breaker():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_rate=0.5, window=2, min_calls=2, cooldown=10, clock=clock)
+    transport = MockTransport()
+    transport.add("GET", "/miss", CassetteMissError("GET", "http://svc.local/miss", "f00"))
+    transport.add("GET", "/bug", KeyError("fixture bug"))
+    client = APIClient(base_url="http://svc.local", retries=0, circuit_breaker=breaker,
+                       sender=transport, metrics=None)
+
+    for _ in range(3):
+        with pytest.raises(CassetteMissError):
+            client.get("/miss")
+        with pytest.raises(KeyError):
+            client.get("/bug")
+        with pytest.raises(NoRouteError):
+            client.get("/unrouted")
+    assert breaker.state("svc.local") == "closed"
+
+    # half_open 的探测请求遇到非传输层异常：名额还回去，下一个请求还能探测
+    for _ in range(2):
+        breaker.before_call("svc.local")
+        breaker.record("svc.local", False)
+    clock.now = 10
+    with pytest.raises(KeyError):
+        client.get("/bug")
+    transport.add("GET", "/ok", 200)
+    assert client.get("/ok").status_code == 200
+    assert breaker.state("svc.local") == "closed"
@@ -0,0 +1,94 @@
+# tests/day32_rate_limiter/test_rate_limiter.py
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+import autofw.utils.api_client as api_client_mod
+from autofw.utils.api_client import APIClient
+from autofw.utils.async_api_client import AsyncAPIClient
+from autofw.utils.rate_limiter import RateLimiter
+from autofw.utils.response_builder import build_response
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.mock
+def test_gcra_burst_then_steady_rate():
+    clock = FakeClock()
+    limiter = RateLimiter(qps=10, burst=3, clock=clock)
+
+    waits = [limiter.reserve("/get") for _ in range(5)]
+    # 前 3 个是突发额度，之后每个间隔 0.1s
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert waits[3] == pytest.approx(0.1)
+    assert waits[4] == pytest.approx(0.2)
+
+    clock.now += 10  # 空闲很久后额度恢复
+    assert limiter.reserve("/get") == 0.0
+    assert limiter.stats()["throttled_calls"] == 2
+
+
+@pytest.mark.mock
+def test_per_path_pattern_only_limits_matching_paths():
+    limiter = RateLimiter(per_path={"/status/*": 1}, clock=FakeClock())
+
+    assert limiter.reserve("/status/500") == 0.0
+    assert limiter.reserve("/status/503") == pytest.approx(1.0)
+    assert limiter.reserve("/get") == 0.0
+
+
+@pytest.mark.mock
+def test_client_sleeps_and_reports_throttled_time(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(api_client_mod.time, "sleep", lambda s: sleeps.append(s))
+    limiter = RateLimiter(qps=2, clock=FakeClock())
+    client = APIClient(base_url="http://mock.local", rate_limiter=limiter)
+    monkeypatch.setattr(client.session, "request", lambda method, url, **kw: build_response(200, {}))
+
+    first = client.get("/get")
+    second = client.with_headers({"X-Trace": "1"}).get("/get")  # 派生 client 共用同一个限速器
+
+    assert first.throttled_ms == 0
+    assert second.throttled_ms == pytest.approx(500)
+    assert sleeps == [pytest.approx(0.5)]
+
+
+@pytest.mark.mock
+def test_limiter_is_thread_safe_under_map(monkeypatch):
+    client = APIClient(base_url="http://mock.local", rate_limiter=RateLimiter(qps=50, burst=1))
+    monkeypatch.setattr(client.session, "request", lambda method, url, **kw: build_response(200, {}))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        list(ex.map(lambda _: client.get("/get"), range(11)))
+    elapsed = time.perf_counter() - start
+
+    # 11 个请求 @50qps：至少 10 个间隔 = 0.2s
+    assert elapsed >= 0.19
+
+
+@pytest.mark.mock
+def test_async_client_throttles_without_blocking_loop():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={})
+
+    async def main():
+        session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        limiter = RateLimiter(qps=50)
+        async with AsyncAPIClient(base_url="http://mock.local", session=session, rate_limiter=limiter) as client:
+            start = time.perf_counter()
+            resps = await asyncio.gather(*(client.get("/get") for _ in range(6)))
+            return time.perf_counter() - start, resps
+
+    elapsed, resps = asyncio.run(main())
+    assert elapsed >= 0.09
+    assert max(r.throttled_ms for r in resps) == pytest.approx(100, abs=5)
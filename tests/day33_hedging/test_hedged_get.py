@@ -0,0 +1,142 @@
+# tests/day33_hedging/test_hedged_get.py
+import threading
+import time
+
+import pytest
+import requests
+
+from autofw.utils.api_client import APIClient
+from autofw.utils.hedging import HedgePolicy
+from autofw.utils.response_builder import build_response
+
+
+def _slow_first_request(slow_s: float):
+    """第 1 次调用很慢（长尾），之后的调用立刻返回"""
+    lock = threading.Lock()
+    calls = {"n": 0}
+
+    def fake_request(method, url, **kwargs):
+        with lock:
+            calls["n"] += 1
+            n = calls["n"]
+        if n == 1:
+            time.sleep(slow_s)
+        return build_response(200, {"call": n}, url=url)
+
+    return fake_request, calls
+
+
+@pytest.mark.mock
+def test_hedge_wins_against_slow_primary(monkeypatch):
+    policy = HedgePolicy(delay=0.05)
+    client = APIClient(base_url="http://mock.local", hedge=policy)
+    fake_request, calls = _slow_first_request(0.5)
+    monkeypatch.setattr(client.session, "request", fake_request)
+
+    start = time.perf_counter()
+    resp = client.get("/get")
+    elapsed = time.perf_counter() - start
+
+    assert resp.json() == {"call": 2}
+    assert elapsed < 0.4
+    stats = policy.stats()
+    assert stats["hedges_fired"] == 1
+    assert stats["hedges_won"] == 1
+
+
+@pytest.mark.mock
+def test_hedge_not_queued_behind_busy_primaries(monkeypatch):
+    # 主请求池只有 1 个线程，被卡住的主请求占着；对冲请求照样能发出去并赢
+    policy = HedgePolicy(delay=0.01, max_workers=1)
+    client = APIClient(base_url="http://mock.local", hedge=policy)
+    release = threading.Event()
+    lock = threading.Lock()
+    calls = {"n": 0}
+
+    def fake_request(method, url, **kwargs):
+        with lock:
+            calls["n"] += 1
+            n = calls["n"]
+        if n == 1:
+            release.wait(5)
+        return build_response(200, {"call": n}, url=url)
+
+    monkeypatch.setattr(client.session, "request", fake_request)
+    try:
+        assert client.get("/get").json() == {"call": 2}
+        assert policy.stats()["hedges_won"] == 1
+    finally:
+        release.set()
+
+
+@pytest.mark.mock
+def test_fast_primary_does_not_hedge(monkeypatch):
+    policy = HedgePolicy(delay=0.5)
+    client = APIClient(base_url="http://mock.local", hedge=policy)
+    monkeypatch.setattr(client.session, "request", lambda method, url, **kw: build_response(200, {}))
+
+    for _ in range(3):
+        client.get("/get")
+
+    assert policy.stats()["hedges_fired"] == 0
+    assert policy.stats()["requests"] == 3
+
+
+@pytest.mark.mock
+def test_hedge_budget_caps_extra_load(monkeypatch):
+    policy = HedgePolicy(delay=0.01, max_extra_ratio=0.0, min_tokens=0)
+    client = APIClient(base_url="http://mock.local", hedge=policy)
+    fake_request, calls = _slow_first_request(0.05)
+    monkeypatch.setattr(client.session, "request", fake_request)
+
+    assert client.get("/get").json() == {"call": 1}
+    assert calls["n"] == 1
+    assert policy.stats()["hedges_denied"] == 1
+
+
+@pytest.mark.mock
+def test_hedge_is_opt_in_per_call(monkeypatch):
+    policy = HedgePolicy(delay=0.01)
+    client = APIClient(base_url="http://mock.local", hedge=policy)
+    fake_request, calls = _slow_first_request(0.05)
+    monkeypatch.setattr(client.session, "request", fake_request)
+
+    client.get("/get", hedge=False)
+    assert calls["n"] == 1
+    assert policy.stats()["requests"] == 0
+
+    with pytest.raises(ValueError):
+        APIClient(base_url="http://mock.local").get("/get", hedge=True)
+
+
+@pytest.mark.mock
+def test_hedge_falls_back_when_one_copy_fails(monkeypatch):
+    policy = HedgePolicy(delay=0.02)
+    client = APIClient(base_url="http://mock.local", hedge=policy, retries=0)
+    calls = {"n": 0}
+    lock = threading.Lock()
+
+    def fake_request(method, url, **kwargs):
+        with lock:
+            calls["n"] += 1
+            n = calls["n"]
+        if n == 1:
+            time.sleep(0.1)
+            return build_response(200, {"call": 1})
+        raise requests.exceptions.ConnectionError("hedge copy failed")
+
+    monkeypatch.setattr(client.session, "request", fake_request)
+
+    assert client.get("/get").json() == {"call": 1}
+    assert policy.stats()["hedges_won"] == 0
+
+
+@pytest.mark.mock
+def test_observed_percentile_delay():
+    policy = HedgePolicy(min_samples=20, min_delay=0.001)
+    assert policy.current_delay() is None
+
+    for i in range(1, 101):
+        policy.record_latency(i / 1000)
+
+    assert policy.current_delay() == pytest.approx(0.096, abs=0.01)
@@ -0,0 +1,82 @@
+# tests/day34_request_timing/test_request_timing.py
+import pytest
+import requests
+
+from autofw.utils.api_client import APIClient
+from autofw.utils.response_builder import build_response
+from autofw.utils.timing import current_timing
+
+
+@pytest.mark.mock
+def test_first_request_opens_connection_second_reuses(local_base_url):
+    client = APIClient(base_url=local_base_url, timeout=5)
+
+    first = client.get("/get")
+    second = client.get("/get")
+
+    t1, t2 = first.timing, second.timing
+    assert t1.reused is False
+    assert t1.connect_ms > 0
+    assert t1.ttfb_ms > 0
+    assert t1.status == 200
+
+    # keep-alive 复用：没有 dns / connect / tls
+    assert t2.reused is True
+    assert t2.dns_ms == 0 and t2.connect_ms == 0 and t2.tls_ms == 0
+    assert t2.ttfb_ms > 0
+    assert t2.total_ms >= t2.ttfb_ms
+    assert current_timing() is None
+
+
+@pytest.mark.mock
+def test_slow_server_shows_up_in_ttfb(local_base_url):
+    client = APIClient(base_url=local_base_url, timeout=5)
+    resp = client.get("/sleep/100")
+    assert resp.timing.ttfb_ms >= 90
+    assert resp.timing.connect_ms < resp.timing.ttfb_ms
+
+
+@pytest.mark.mock
+def test_timing_hook_gets_every_attempt(monkeypatch):
+    seen = []
+    client = APIClient(base_url="http://mock.local", retries=2, backoff=0, timing_hook=seen.append)
+    statuses = iter([503, 503, 200])
+    monkeypatch.setattr(client.session, "request", lambda method, url, **kw: build_response(next(statuses), {}))
+
+    resp = client.get("/get")
+
+    assert [t.attempt for t in seen] == [1, 2, 3]
+    assert [t.status for t in seen] == [503, 503, 200]
+    assert resp.timings == seen
+    assert resp.timing is seen[-1]
+    # mock 掉了 session.request，不经过连接层
+    assert resp.timing.reused is None
+
+
+@pytest.mark.mock
+def test_timing_hook_records_error_and_failures_do_not_break_requests(monkeypatch):
+    def boom(timing):
+        raise RuntimeError("metrics down")
+
+    client = APIClient(base_url="http://mock.local", retries=0, timing_hook=boom)
+    monkeypatch.setattr(client.session, "request", lambda method, url, **kw: build_response(200, {}))
+    assert client.get("/get").status_code == 200
+
+    seen = []
+    client = APIClient(base_url="http://mock.local", retries=0, timing_hook=seen.append)
+
+    def raise_conn(method, url, **kw):
+        raise requests.exceptions.ConnectionError("down")
+
+    monkeypatch.setattr(client.session, "request", raise_conn)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.get("/get")
+    assert seen[0].error == "ConnectionError"
+    assert seen[0].status is None
+
+
+@pytest.mark.mock
+def test_with_headers_keeps_timing_hook():
+    seen = []
+    client = APIClient(base_url="http://mock.local", timing_hook=seen.append)
+    assert client.with_headers({"X-A": "1"}).timing_hook is client.timing_hook
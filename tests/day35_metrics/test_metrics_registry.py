@@ -0,0 +1,151 @@
+# tests/day35_metrics/test_metrics_registry.py
+import asyncio
+import csv
+import json
+
+import httpx
+import pytest
+import requests
+
+from autofw.utils.api_client import APIClient
+from autofw.utils.async_api_client import AsyncAPIClient
+from autofw.utils.metrics import Histogram, MetricsRegistry, get_registry, template_path
+from autofw.utils.response_builder import build_response
+from tests._clients import build_client, patient
+
+
+@pytest.mark.mock
+@pytest.mark.parametrize(
+    "url, expected",
+    [
+        ("https://api.local/users/123", "/users/{id}"),
+        ("/users/42/orders/7?page=1", "/users/{id}/orders/{id}"),
+        ("/items/9f1c2a3b-0000-4a4a-9b9b-123456789abc", "/items/{id}"),
+        ("/blobs/deadbeefdeadbeef", "/blobs/{id}"),
+        ("/get", "/get"),
+        ("https://api.local", "/"),
+    ],
+)
+def test_template_path(url, expected):
+    assert template_path(url) == expected
+
+
+@pytest.mark.mock
+def test_histogram_percentiles_within_relative_error():
+    h = Histogram(sub_buckets=32)
+    for ms in range(1, 1001):
+        h.record(ms / 1000)
+
+    assert h.count == 1000
+    assert h.max_us == 1_000_000
+    for p, expected_ms in ((50, 500), (90, 900), (99, 990)):
+        assert abs(h.percentile(p) - expected_ms) / expected_ms < 1 / 32
+    assert h.percentile(100) == 1000.0
+    assert abs(h.mean() - 500.5) < 0.01
+
+
+@pytest.mark.mock
+def test_histogram_rejects_non_power_of_two():
+    with pytest.raises(ValueError):
+        Histogram(sub_buckets=30)
+
+
+@pytest.mark.mock
+def test_client_records_requests_attempts_and_errors(monkeypatch):
+    registry = MetricsRegistry()
+    client = APIClient(base_url="http://mock.local", retries=2, backoff=0, metrics=registry)
+    statuses = iter([503, 200, 200])
+    monkeypatch.setattr(client.session, "request", lambda method, url, **kw: build_response(next(statuses), {}))
+
+    client.get("/users/1")
+    client.get("/users/2")
+
+    def raise_conn(method, url, **kw):
+        raise requests.exceptions.ConnectionError("down")
+
+    monkeypatch.setattr(client.session, "request", raise_conn)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.get("/users/3")
+
+    rows = {(r["method"], r["path"], r["status"]): r for r in registry.snapshot()}
+    ok = rows[("GET", "/users/{id}", "200")]
+    assert ok["requests"] == 2
+    assert ok["attempts"] == 3
+    assert ok["retries"] == 1
+    assert ok["errors"] == 0
+
+    err = rows[("GET", "/users/{id}", "ConnectionError")]
+    assert err["requests"] == 1
+    assert err["attempts"] == 3
+    assert err["errors"] == 1
+
+    summary = registry.summary()
+    assert summary["requests"] == 3
+    assert summary["retries"] == 3
+
+
+@pytest.mark.mock
+def test_async_client_records_into_registry():
+    registry = MetricsRegistry()
+    session = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(204)))
+
+    async def main():
+        async with AsyncAPIClient(base_url="http://mock.local", session=session, metrics=registry) as client:
+            await asyncio.gather(*(client.get(f"/items/{i}") for i in range(5)))
+
+    asyncio.run(main())
+    (row,) = registry.snapshot()
+    assert (row["path"], row["status"], row["requests"]) == ("/items/{id}", "204", 5)
+
+
+@pytest.mark.mock
+def test_metrics_none_disables_recording(monkeypatch):
+    client = APIClient(base_url="http://mock.local", metrics=None)
+    monkeypatch.setattr(client.session, "request", lambda method, url, **kw: build_response(200, {}))
+    client.get("/get")
+    assert client.with_headers({"X-A": "1"}).metrics is None
+
+
+@pytest.mark.mock
+def test_metrics_are_opt_in():
+    # 默认不记：monkeypatch 假响应的老用例不会往 reports/metrics.* 里写假延迟
+    assert APIClient(base_url="http://mock.local").metrics is None
+    assert AsyncAPIClient.__dataclass_fields__["metrics"].default is None
+
+    client = APIClient(base_url="http://mock.local", metrics=get_registry())
+    assert client.with_headers({}).metrics is get_registry()
+
+
+@pytest.mark.mock
+def test_session_clients_do_not_record_in_offline_tests(client, network_client):
+    # conftest 的 no_metrics_for_offline_tests：mock / monkeypatch 用例期间不记，假响应进不了 reports/metrics.*
+    assert client.metrics is None
+    assert network_client.metrics is None
+
+
+@pytest.mark.mock
+def test_build_client_maps_metrics_option():
+    on = build_client({"base_url": "http://mock.local", "metrics": True})
+    assert on.metrics is (get_registry() if on.cassette is None else None)
+    assert patient(on).metrics is on.metrics
+    assert build_client({"base_url": "http://mock.local", "metrics": False}).metrics is None
+    assert build_client({"base_url": "http://mock.local"}).metrics is None
+
+
+@pytest.mark.mock
+def test_write_json_and_csv(tmp_path):
+    registry = MetricsRegistry()
+    for ms in (10, 20, 30):
+        registry.record("get", "/orders/1", 200, ms / 1000)
+    registry.record("post", "/orders", "ReadTimeout", 5.0, attempts=3, error=True)
+
+    data = json.loads(registry.write_json(tmp_path / "metrics.json").read_text(encoding="utf-8"))
+    assert data["requests"] == 4
+    assert data["errors"] == 1
+    assert [s["path"] for s in data["series"]] == ["/orders/{id}", "/orders"]
+
+    with registry.write_csv(tmp_path / "out" / "metrics.csv").open(encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert rows[0]["method"] == "GET"
+    assert float(rows[0]["max_ms"]) == 30.0
+    assert rows[1]["status"] == "ReadTimeout"
@@ -0,0 +1,198 @@
+# tests/day36_streaming/test_streaming.py
+import json
+
+import pytest
+
+from autofw.utils.api_client import APIClient
+from autofw.utils.assertions import (
+    assert_any_item_contains,
+    assert_each_item_contains,
+    assert_stream_length,
+)
+from autofw.utils.json_codec import JSONCodec
+from autofw.utils.response_builder import build_response
+from autofw.utils.streaming import ResponseTooLargeError, StreamedResponse, iter_json_array
+
+
+def _split_every(text: str, n: int):
+    return (text[i:i + n] for i in range(0, len(text), n))
+
+
+@pytest.mark.mock
+@pytest.mark.parametrize("piece", [1, 2, 3, 7, 1000])
+def test_iter_json_array_handles_arbitrary_chunk_boundaries(piece):
+    items = [{"id": 1, "tags": ["a", "b"]}, 12345, "x,]y", None, [1, [2]], -0.5, {"s": "中文"}]
+    text = " [ " + ",\n ".join(json.dumps(i, ensure_ascii=False) for i in items) + " ] "
+    assert list(iter_json_array(_split_every(text, piece))) == items
+
+
+@pytest.mark.mock
+@pytest.mark.parametrize("text", ["[]", " [ ] "])
+def test_iter_json_array_empty(text):
+    assert list(iter_json_array(iter([text]))) == []
+
+
+@pytest.mark.mock
+@pytest.mark.parametrize("text", ['{"a": 1}', "[1, 2", '[{"a": ]'])
+def test_iter_json_array_rejects_bad_input(text):
+    with pytest.raises(ValueError):
+        list(iter_json_array(iter([text])))
+
+
+@pytest.mark.mock
+@pytest.mark.parametrize("text, match", [
+    ("[1 2 3]", "expected ',' or ']'"),
+    ('[{"a":1}{"b":2}]', "expected ',' or ']'"),
+    ("[,1]", "expected array item"),
+    ("[1,,2]", "expected array item"),
+    ("[1,]", "expected array item"),
+    ("[,]", "expected array item"),
+    ("[1] garbage", "after JSON array"),
+    ("[1]]", "after JSON array"),
+])
+@pytest.mark.parametrize("piece", [1, 1000])
+def test_iter_json_array_rejects_bad_separators_and_trailing_data(text, match, piece):
+    # 和 json.loads 一样严格
+    with pytest.raises(ValueError):
+        json.loads(text)
+    with pytest.raises(ValueError, match=match):
+        list(iter_json_array(_split_every(text, piece)))
+
+
+@pytest.mark.mock
+def test_stream_json_array_rejects_trailing_data_in_later_chunks():
+    resp = build_response(200, {})
+    resp._content = b"[1, 2] \n" + b" " * 300 + b"{}"
+    s = StreamedResponse(resp, chunk_size=64)
+    with pytest.raises(ValueError, match="after JSON array"):
+        list(s.iter_json_array())
+
+
+@pytest.mark.mock
+@pytest.mark.parametrize("chunk_size", [1, 3, 64 * 1024])
+def test_iter_lines_joins_lines_across_chunks(chunk_size):
+    long_line = json.dumps({"blob": "y" * 5000})
+    resp = build_response(200, {})
+    resp._content = ('{"id": 1}\n' + long_line + '\n\n{"id": 2}').encode()
+    s = StreamedResponse(resp, chunk_size=chunk_size)
+    assert list(s.iter_lines()) == ['{"id": 1}', long_line, "", '{"id": 2}']
+
+
+@pytest.mark.mock
+def test_stream_json_array_from_local_server(local_base_url):
+    client = APIClient(base_url=local_base_url, timeout=5)
+
+    with client.stream("GET", "/items/500", chunk_size=128) as s:
+        assert s.status_code == 200
+        count = assert_each_item_contains(s, {"status": "active"})
+
+    assert count == 500
+    assert s.bytes_read > 128
+
+
+@pytest.mark.mock
+def test_stream_ndjson_from_local_server(local_base_url):
+    client = APIClient(base_url=local_base_url, timeout=5)
+
+    with client.stream("GET", "/items/50", params={"ndjson": 1}) as s:
+        assert assert_any_item_contains(s.iter_items(), {"id": 42, "name": "user-42"}) == 42
+
+    with client.stream("GET", "/items/50", params={"ndjson": 1}) as s:
+        assert_stream_length(s, 50)
+
+
+@pytest.mark.mock
+def test_stream_max_bytes_guard(local_base_url):
+    client = APIClient(base_url=local_base_url, timeout=5, stream_max_bytes=1024)
+
+    with client.stream("GET", "/items/1000", chunk_size=256) as s, pytest.raises(ResponseTooLargeError) as ei:
+        for _ in s.iter_items():
+            pass
+    assert ei.value.limit == 1024
+    assert s.bytes_read <= 1024 + 256
+
+    # 请求级覆盖
+    with client.stream("GET", "/items/1000", max_bytes=10 * 1024 * 1024) as s:
+        assert_stream_length(s, 1000)
+
+
+@pytest.mark.mock
+def test_content_length_over_limit_fails_before_reading():
+    resp = build_response(200, {"big": "x" * 100})
+    resp.headers["Content-Length"] = str(len(resp._content))
+    s = StreamedResponse(resp, max_bytes=10)
+    with pytest.raises(ResponseTooLargeError) as ei:
+        next(s.iter_bytes())
+    assert ei.value.seen == len(resp._content)
+    assert s.bytes_read == 0
+
+
+@pytest.mark.mock
+def test_stream_assertion_errors_point_at_item():
+    items = iter([{"id": 1, "status": "active"}, {"id": 2, "status": "deleted"}, {"id": 3}])
+    with pytest.raises(AssertionError, match=r"\[1\]\.status"):
+        assert_each_item_contains(items, {"status": "active"})
+    # 出错后不会继续往下读
+    assert next(items) == {"id": 3}
+
+    with pytest.raises(AssertionError, match="at least 1"):
+        assert_each_item_contains(iter([]), {"a": 1})
+    with pytest.raises(AssertionError, match="checked 2 items"):
+        assert_any_item_contains([{"a": 1}, "not-a-dict"], {"a": 2})
+
+
+class _CountingCodec(JSONCodec):
+    name = "counting"
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def loads(self, data):
+        self.calls += 1
+        return super().loads(data)
+
+
+@pytest.mark.mock
+def test_stream_items_use_client_codec(local_base_url):
+    codec = _CountingCodec()
+    client = APIClient(base_url=local_base_url, timeout=5, json_codec=codec)
+
+    with client.stream("GET", "/items/20") as s:
+        assert_stream_length(s, 20)
+    with client.stream("GET", "/items/30", params={"ndjson": 1}) as s:
+        assert_stream_length(s, 30)
+    assert codec.calls == 50
+
+
+@pytest.mark.mock
+def test_iter_json_array_large_item_in_small_pieces_is_linear(monkeypatch):
+    attempts = {"n": 0}
+
+    class _CountingDecoder(json.JSONDecoder):
+        def raw_decode(self, s, idx=0):
+            attempts["n"] += 1
+            return super().raw_decode(s, idx)
+
+    monkeypatch.setattr(json, "JSONDecoder", _CountingDecoder)
+    big = {"blob": "x" * 4_000_000, "n": list(range(1000))}
+    text = json.dumps([1, big, 2])
+    pieces = len(text) // 256 + 1
+
+    assert list(iter_json_array(_split_every(text, 256))) == [1, big, 2]
+    # 每来一块就重新 raw_decode 一次是 ~15k 次（O(n²)）；未解析部分翻倍地读，只重试 O(log n) 次
+    assert attempts["n"] <= 3 + 2 * pieces.bit_length()
+
+
+@pytest.mark.mock
+def test_stream_download_timing_filled_when_body_consumed(local_base_url):
+    seen = []
+    client = APIClient(base_url=local_base_url, timeout=5, timing_hook=seen.append)
+
+    with client.stream("GET", "/items/5000", chunk_size=1024) as s:
+        timing = s.response.timings[-1]
+        at_headers = timing.download_ms
+        assert_stream_length(s, 5000)
+
+    assert seen[-1] is timing
+    assert timing.download_ms > at_headers
+    assert timing.total_ms >= timing.download_ms
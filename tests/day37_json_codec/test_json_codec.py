@@ -0,0 +1,154 @@
+# tests/day37_json_codec/test_json_codec.py
+from decimal import Decimal
+
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+from autofw.utils import json_codec
+from autofw.utils.api_client import APIClient
+from autofw.utils.json_codec import CodecSession, JSONCodec, get_codec
+from autofw.utils.memo_response import memoize
+from autofw.utils.response_builder import build_response
+
+BACKENDS = ["stdlib"] + (["orjson"] if json_codec.orjson is not None else [])
+
+
+class _CountingCodec(JSONCodec):
+    def __init__(self):
+        self.dumps_calls = 0
+        self.loads_calls = 0
+
+    def dumps(self, obj):
+        self.dumps_calls += 1
+        return super().dumps(obj)
+
+    def loads(self, data):
+        self.loads_calls += 1
+        return super().loads(data)
+
+
+@pytest.mark.mock
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_backends_produce_identical_compact_utf8(backend):
+    codec = get_codec(backend)
+    obj = {"user": {"id": 10086, "name": "李"}, "tags": ["api", "test"], "ok": True, "n": None}
+    assert codec.name == backend
+    assert codec.dumps(obj) == '{"user":{"id":10086,"name":"李"},"tags":["api","test"],"ok":true,"n":null}'.encode()
+    assert codec.loads(codec.dumps(obj)) == obj
+    assert codec.loads(codec.dumps(obj).decode("utf-8")) == obj
+
+
+@pytest.mark.mock
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_unsupported_types_fall_back_or_raise_type_error(backend):
+    codec = get_codec(backend)
+    with pytest.raises(TypeError):
+        codec.dumps({"price": Decimal("1.5")})
+    with pytest.raises(ValueError):
+        codec.loads(b"{not json")
+
+
+@pytest.mark.mock
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("bad", [float("nan"), float("inf"), -float("inf")])
+def test_non_finite_floats_raise_on_every_backend(backend, bad):
+    codec = get_codec(backend)
+    with pytest.raises(ValueError, match="not JSON compliant"):
+        codec.dumps({"x": [1, {"y": bad}]})
+    # 正常的 null 不受影响
+    assert codec.dumps({"x": None, "y": 1.5}) == b'{"x":null,"y":1.5}'
+
+    client, adapter = _client_with_capture(json_codec=codec)
+    with pytest.raises(requests.exceptions.InvalidJSONError):
+        client.post("/post", json={"x": bad})
+    assert adapter.requests == []
+
+
+@pytest.mark.mock
+def test_env_override_and_invalid_backend(monkeypatch):
+    monkeypatch.setenv("AUTOFW_JSON_BACKEND", "stdlib")
+    assert get_codec().name == "stdlib"
+    with pytest.raises(ValueError):
+        get_codec("simdjson")
+
+
+class _CaptureAdapter(BaseAdapter):
+    """不发网络请求：记下 PreparedRequest，回一个固定响应"""
+
+    def __init__(self):
+        super().__init__()
+        self.requests = []
+
+    def send(self, request, **kwargs):
+        self.requests.append(request)
+        return build_response(200, {"echo": True}, url=request.url)
+
+    def close(self):
+        pass
+
+
+def _client_with_capture(**kwargs):
+    client = APIClient(base_url="http://mock.local", **kwargs)
+    adapter = _CaptureAdapter()
+    client.session.mount("http://", adapter)
+    return client, adapter
+
+
+@pytest.mark.mock
+def test_client_encodes_json_body_with_codec():
+    codec = _CountingCodec()
+    client, adapter = _client_with_capture(json_codec=codec)
+    assert isinstance(client.session, CodecSession)
+    assert client.session.json_codec is codec
+
+    resp = client.post("/post", json={"user": {"id": 1}}, headers={"X-Trace": "t1"})
+
+    sent = adapter.requests[0]
+    assert sent.body == b'{"user":{"id":1}}'
+    assert sent.headers["Content-Type"] == "application/json"
+    assert sent.headers["X-Trace"] == "t1"
+    assert codec.dumps_calls == 1
+
+    assert resp.json() == {"echo": True}
+    assert codec.loads_calls == 1
+
+
+@pytest.mark.mock
+def test_explicit_content_type_and_data_are_kept():
+    client, adapter = _client_with_capture()
+
+    client.post("/post", json={"a": 1}, headers={"content-type": "application/vnd.api+json"})
+    client.post("/post", json={"a": 1}, data="raw=1")
+
+    assert adapter.requests[0].headers["Content-Type"] == "application/vnd.api+json"
+    assert adapter.requests[0].body == b'{"a":1}'
+    assert adapter.requests[1].body == "raw=1"
+
+
+@pytest.mark.mock
+def test_mocked_session_request_still_sees_json_kwarg(monkeypatch):
+    client = APIClient(base_url="http://mock.local")
+    seen = {}
+    monkeypatch.setattr(client.session, "request", lambda method, url, **kw: seen.update(kw) or build_response(200, {}))
+
+    client.post("/post", json={"a": 1})
+    assert seen["json"] == {"a": 1}
+
+
+@pytest.mark.mock
+def test_bound_json_keeps_requests_error_type_and_kwargs():
+    resp = memoize(build_response(200, None))
+    with pytest.raises(requests.exceptions.JSONDecodeError):
+        resp.json()
+
+    resp = memoize(build_response(200, {"a": 1.5}))
+    assert resp.json(parse_float=Decimal) == {"a": Decimal("1.5")}
+
+
+@pytest.mark.mock
+def test_non_utf8_response_falls_back_to_requests():
+    resp = build_response(200, None, headers={"Content-Type": "application/json; charset=latin-1"})
+    resp._content = '{"name": "café"}'.encode("latin-1")
+    resp.encoding = "latin-1"
+    assert memoize(resp).json() == {"name": "café"}
@@ -0,0 +1,77 @@
+# tests/day38_memo_response/test_memo_response.py
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+import requests
+
+from autofw.utils.api_client import APIClient
+from autofw.utils.assertions import assert_status_code
+from autofw.utils.json_codec import JSONCodec
+from autofw.utils.memo_response import MemoResponse, body_snippet, memoize
+from autofw.utils.response_builder import build_response
+
+
+class _CountingCodec(JSONCodec):
+    loads_calls = 0
+
+    def loads(self, data):
+        self.loads_calls += 1
+        return super().loads(data)
+
+
+@pytest.mark.mock
+def test_client_returns_memo_response_parsed_once(monkeypatch):
+    codec = _CountingCodec()
+    client = APIClient(base_url="http://mock.local", json_codec=codec)
+    monkeypatch.setattr(client.session, "request", lambda method, url, **kw: build_response(200, {"a": [1, 2]}))
+
+    resp = client.get("/get")
+
+    assert isinstance(resp, MemoResponse)
+    assert isinstance(resp, requests.Response)
+    first = resp.json()
+    assert resp.json() is first
+    assert codec.loads_calls == 1
+    assert resp.text is resp.text
+    # 带参数的 json() 不走缓存
+    assert resp.json(parse_int=Decimal) == {"a": [Decimal(1), Decimal(2)]}
+
+
+@pytest.mark.mock
+def test_peek_only_decodes_prefix():
+    resp = memoize(build_response(200, {"blob": "中" * 2_000_000}))
+    assert resp.peek(12) == '{"blob":"中中中'
+    assert resp._memo_text is None  # peek 不会触发整段 text 解码
+    assert resp.peek(0) == ""
+
+
+@pytest.mark.mock
+def test_body_snippet_edge_cases():
+    streamed = requests.Response()
+    streamed._content = False
+    assert body_snippet(streamed) == "<body not read>"
+    assert body_snippet(build_response(204, None)) == ""
+    assert body_snippet(SimpleNamespace(text="plain fake body"), 5) == "plain"
+
+
+@pytest.mark.mock
+def test_assert_status_code_uses_snippet():
+    resp = build_response(500, {"error": "boom", "trace": "x" * 1_000_000})
+    with pytest.raises(AssertionError) as ei:
+        assert_status_code(resp, 200)
+    msg = str(ei.value)
+    assert "actual=500" in msg
+    assert '{"error":"boom"' in msg
+    assert len(msg) < 400
+
+
+@pytest.mark.mock
+def test_memoize_leaves_foreign_objects_alone():
+    class MyResponse(requests.Response):
+        pass
+
+    custom = MyResponse()
+    assert type(memoize(custom)) is MyResponse
+    fake = SimpleNamespace(status_code=200)
+    assert memoize(fake) is fake
@@ -0,0 +1,93 @@
+# tests/day39_http2/test_http2_transport.py
+import socket
+import time
+
+import pytest
+import requests
+
+from autofw.utils.api_client import APIClient
+from autofw.utils.h2_adapter import HTTP2Adapter
+
+
+def _closed_port() -> int:
+    """拿一个刚释放、没人监听的端口"""
+    with socket.create_server(("127.0.0.1", 0)) as s:
+        return s.getsockname()[1]
+
+
+def _h2c_client(base_url: str, **kwargs) -> APIClient:
+    return APIClient(base_url=base_url, timeout=5, backoff=0, transport="h2c", **kwargs)
+
+
+@pytest.mark.mock
+def test_h2c_get_and_post(local_h2_server):
+    client = _h2c_client(local_h2_server.base_url)
+    assert isinstance(client.session.get_adapter("http://"), HTTP2Adapter)
+
+    resp = client.get("/get", params={"q": "1"})
+    assert resp.status_code == 200
+    assert resp.http_version == "HTTP/2"
+    assert resp.json()["path"] == "/get?q=1"
+
+    resp = client.post("/post", json={"user": {"id": 1}})
+    assert resp.json()["method"] == "POST"
+    assert resp.json()["data"] == '{"user":{"id":1}}'
+
+
+@pytest.mark.mock
+def test_concurrent_requests_share_one_connection(local_h2_server):
+    client = _h2c_client(local_h2_server.base_url)
+
+    start = time.perf_counter()
+    results = client.map([{"method": "GET", "path": "/sleep/200"} for _ in range(20)], concurrency=20)
+    elapsed = time.perf_counter() - start
+
+    assert all(r.ok for r in results)
+    # 20 个 200ms 的请求并发复用同一条连接：总耗时远小于串行的 4s
+    assert elapsed < 2.0
+    assert local_h2_server.connections == 1
+    assert len({r.response.json()["stream_id"] for r in results}) == 20
+
+
+@pytest.mark.mock
+@pytest.mark.retry
+def test_retry_semantics_unchanged_on_h2(local_h2_server):
+    client = _h2c_client(local_h2_server.base_url, retries=1)
+    resp = client.get("/flaky/a")
+    assert resp.status_code == 200
+    assert [t.status for t in resp.timings] == [503, 200]
+
+    # 请求级覆盖照样生效
+    assert client.get("/flaky/b", retries=0).status_code == 503
+
+
+@pytest.mark.mock
+def test_cookies_and_streaming_on_h2(local_h2_server):
+    client = _h2c_client(local_h2_server.base_url)
+    client.get("/cookie")
+    assert client.session.cookies.get("sid") == "h2"
+
+    with client.stream("GET", "/get") as s:
+        assert b"".join(s.iter_bytes()).startswith(b'{"path": "/get"')
+
+
+@pytest.mark.mock
+def test_http2_over_cleartext_falls_back_to_http11(local_base_url):
+    # 明文 + 没有 prior knowledge：协商不了 h2，退回 HTTP/1.1
+    client = APIClient(base_url=local_base_url, timeout=5, transport="http2")
+    resp = client.get("/get")
+    assert resp.status_code == 200
+    assert resp.http_version == "HTTP/1.1"
+
+
+@pytest.mark.mock
+def test_transport_errors_map_to_requests_exceptions():
+    client = _h2c_client(f"http://127.0.0.1:{_closed_port()}", retries=0)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.get("/get")
+
+
+@pytest.mark.mock
+def test_invalid_transport_rejected():
+    with pytest.raises(ValueError):
+        APIClient(base_url="http://mock.local", transport="quic")
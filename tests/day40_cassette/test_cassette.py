@@ -0,0 +1,124 @@
+# tests/day40_cassette/test_cassette.py
+import time
+
+import pytest
+import requests
+
+from autofw.utils.api_client import APIClient
+from autofw.utils.cassette import Cassette, CassetteAdapter, CassetteMissError, Interaction
+
+
+def _prepared(method: str, url: str, **kwargs) -> requests.PreparedRequest:
+    return requests.Request(method, url, **kwargs).prepare()
+
+
+def _interaction(cassette: Cassette, url: str, body: bytes, **kwargs) -> Interaction:
+    return Interaction(
+        fingerprint=cassette.fingerprint(_prepared("GET", url)),
+        method="GET",
+        url=url,
+        status=kwargs.pop("status", 200),
+        reason="OK",
+        headers=kwargs.pop("headers", [("Content-Type", "application/json")]),
+        body=body,
+        elapsed_ms=kwargs.pop("elapsed_ms", 1.0),
+    )
+
+
+@pytest.mark.mock
+def test_record_then_replay_offline(local_base_url, tmp_path):
+    path = tmp_path / "c.jsonl"
+    recorder = APIClient(base_url=local_base_url, timeout=5, cassette=Cassette(path, mode="record"))
+    live = recorder.get("/get", params={"b": "2", "a": "1"})
+    recorder.get("/etag")
+    assert recorder.cassette.stats()["recorded"] == 2
+    assert len(path.read_bytes().splitlines()) == 2
+
+    player = APIClient(base_url=local_base_url, timeout=5, cassette=Cassette(path, mode="replay"))
+    # query 参数顺序不同也能命中
+    replayed = player.get("/get", params={"a": "1", "b": "2"})
+
+    assert replayed.replayed is True
+    assert replayed.status_code == 200
+    assert replayed.json()["path"] == live.json()["path"]
+    assert player.get("/etag").headers["ETag"] == '"v1"'
+    assert player.cassette.stats() == {"hits": 2, "misses": 0, "recorded": 0}
+    # 真正的连接池一次都没用到
+    assert player.connection_stats()["requests"] == 0
+
+
+@pytest.mark.mock
+def test_replay_miss_raises_without_retry(tmp_path):
+    client = APIClient(base_url="http://mock.local", retries=2, backoff=0,
+                       cassette=Cassette(tmp_path / "empty.jsonl", mode="replay"))
+    with pytest.raises(CassetteMissError):
+        client.get("/never-recorded")
+    assert client.cassette.stats()["misses"] == 1
+
+
+@pytest.mark.mock
+def test_auto_mode_records_misses_and_replays_hits(local_base_url, tmp_path):
+    cassette = Cassette(tmp_path / "auto.jsonl", mode="auto")
+    client = APIClient(base_url=local_base_url, timeout=5, cassette=cassette)
+
+    first = client.get("/get")
+    second = client.get("/get")
+
+    assert not getattr(first, "replayed", False)
+    assert second.replayed is True
+    assert cassette.stats() == {"hits": 1, "misses": 1, "recorded": 1}
+
+
+@pytest.mark.mock
+def test_fingerprint_normalizes_json_body(tmp_path):
+    cassette = Cassette(tmp_path / "fp.jsonl")
+    a = cassette.fingerprint(_prepared("POST", "http://h/post", data=b'{"a": 1, "b": [1, 2]}'))
+    b = cassette.fingerprint(_prepared("POST", "http://h/post", data=b'{"b":[1,2],"a":1}'))
+    c = cassette.fingerprint(_prepared("POST", "http://h/post", data=b'{"a": 2}'))
+    assert a == b != c
+
+    ignoring = Cassette(tmp_path / "fp.jsonl", ignore_params=["ts"])
+    assert (ignoring.fingerprint(_prepared("GET", "http://h/get?ts=1&q=x"))
+            == ignoring.fingerprint(_prepared("GET", "http://h/get?q=x&ts=2")))
+
+
+@pytest.mark.mock
+def test_repeated_requests_replay_in_order_then_stick_to_last(tmp_path):
+    cassette = Cassette(tmp_path / "seq.jsonl", mode="replay")
+    for n in (1, 2):
+        cassette.append(_interaction(cassette, "http://mock.local/job", f'{{"n": {n}}}'.encode()))
+    client = APIClient(base_url="http://mock.local", cassette=cassette)
+
+    assert [client.get("/job").json()["n"] for _ in range(4)] == [1, 2, 2, 2]
+
+
+@pytest.mark.mock
+def test_replay_latency_cookies_and_binary_body(tmp_path):
+    path = tmp_path / "misc.jsonl"
+    writer = Cassette(path, mode="auto")
+    writer.append(_interaction(writer, "http://mock.local/slow", b"{}", elapsed_ms=100))
+    writer.append(_interaction(writer, "http://mock.local/login", b"{}",
+                               headers=[("Set-Cookie", "sid=abc; Path=/"), ("Set-Cookie", "lang=zh; Path=/")]))
+    writer.append(_interaction(writer, "http://mock.local/blob", b"\x89PNG\x00\xff",
+                               headers=[("Content-Type", "image/png")]))
+
+    client = APIClient(base_url="http://mock.local", cassette=Cassette(path, mode="replay", replay_latency=1.0))
+    start = time.perf_counter()
+    client.get("/slow")
+    assert time.perf_counter() - start >= 0.09
+
+    client.get("/login")
+    assert client.session.cookies.get("sid") == "abc"
+    assert client.session.cookies.get("lang") == "zh"
+    assert client.get("/blob").content == b"\x89PNG\x00\xff"
+
+
+@pytest.mark.mock
+def test_shared_session_wraps_once_and_keeps_pool(tmp_path):
+    client = APIClient(base_url="http://mock.local", cassette=Cassette(tmp_path / "x.jsonl"))
+    adapter = client.session.get_adapter("https://")
+    assert isinstance(adapter, CassetteAdapter)
+
+    derived = client.with_headers({"X-A": "1"})
+    assert derived.session.get_adapter("https://") is adapter
+    assert derived.connection_stats() == client.connection_stats()
@@ -0,0 +1,153 @@
+# tests/day41_echo_server/test_echo_server.py
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from autofw.utils.api_client import APIClient
+from autofw.utils.echo_server import EchoServer
+
+
+@pytest.mark.mock
+def test_get_echoes_args_headers_url(echo_server):
+    client = APIClient(base_url=echo_server.base_url, timeout=5)
+    resp = client.get("/get", params={"foo": "bar", "tag": ["a", "b"]}, headers={"X-Trace": "t-1"})
+
+    assert resp.status_code == 200
+    body = resp.json()
+    assert set(body) == {"args", "headers", "url"}
+    assert body["args"] == {"foo": "bar", "tag": ["a", "b"]}
+    assert body["headers"]["x-trace"] == "t-1"
+    assert body["url"].endswith("/get?foo=bar&tag=a&tag=b")
+
+
+@pytest.mark.mock
+def test_post_echoes_json_form_and_raw(echo_server):
+    client = APIClient(base_url=echo_server.base_url, timeout=5)
+
+    as_json = client.post("/post", json={"user": {"id": 1, "name": "中文"}}).json()
+    assert as_json["json"] == {"user": {"id": 1, "name": "中文"}}
+    assert as_json["data"] == as_json["json"]
+    assert set(as_json) == {"args", "data", "files", "form", "headers", "json", "url"}
+
+    as_form = client.post("/post", data={"k": "v"}).json()
+    assert as_form["form"] == {"k": "v"}
+    assert as_form["json"] is None
+
+    # 生成器 body -> chunked 请求体
+    chunked = client.post("/post", data=(part for part in [b"ab", b"cd"])).json()
+    assert chunked["data"] == "abcd"
+
+
+@pytest.mark.mock
+def test_local_echo_service_matches_postman_echo_contract(local_echo_service):
+    resp = local_echo_service.get_with_params({"ping": "pong"})
+    assert resp.json()["args"] == {"ping": "pong"}
+
+    resp = local_echo_service.post_json({"a": 1})
+    assert resp.json()["json"] == {"a": 1}
+
+
+@pytest.mark.mock
+@pytest.mark.parametrize("code", [200, 201, 404, 418, 500, 503])
+def test_status_endpoint(echo_server, code):
+    resp = requests.get(f"{echo_server.base_url}/status/{code}", timeout=5)
+    assert resp.status_code == code
+    assert resp.json() == {"status": code}
+
+
+@pytest.mark.mock
+def test_status_retry_against_local_server(echo_server):
+    client = APIClient(base_url=echo_server.base_url, timeout=5, retries=2, backoff=0)
+    before = echo_server.requests
+    resp = client.get("/status/503")
+    assert resp.status_code == 503
+    assert echo_server.requests - before == 3
+
+
+@pytest.mark.mock
+def test_delay_endpoint_is_capped_and_does_not_block_other_connections():
+    with EchoServer(max_delay=0.3) as server:
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            start = time.perf_counter()
+            slow = pool.submit(requests.get, f"{server.base_url}/delay/5", timeout=5)
+            fast = pool.submit(requests.get, f"{server.base_url}/get", timeout=5)
+            assert fast.result().status_code == 200
+            assert time.perf_counter() - start < 0.25
+            assert slow.result().json() == {"delay": "5"}
+            assert 0.25 <= time.perf_counter() - start < 2
+
+
+@pytest.mark.mock
+def test_keep_alive_and_pipelining(echo_server):
+    before = echo_server.connections
+    with socket.create_connection(("127.0.0.1", echo_server.port), timeout=5) as sock:
+        sock.sendall(b"GET /get?n=1 HTTP/1.1\r\nHost: x\r\n\r\n"
+                     b"GET /get?n=2 HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n")
+        data = b""
+        while chunk := sock.recv(65536):
+            data += chunk
+    assert data.count(b"HTTP/1.1 200 OK") == 2
+    assert data.index(b'"n":"1"') < data.index(b'"n":"2"')
+    # 两个请求走的是同一条连接
+    assert echo_server.connections == before + 1
+
+
+def _read_until_closed(sock: socket.socket) -> bytes:
+    data = b""
+    while chunk := sock.recv(65536):
+        data += chunk
+    return data
+
+
+@pytest.mark.mock
+def test_head_on_delay_has_no_body(echo_server):
+    get_length = len(requests.get(f"{echo_server.base_url}/delay/0.05", timeout=5).content)
+    with socket.create_connection(("127.0.0.1", echo_server.port), timeout=5) as sock:
+        sock.sendall(b"HEAD /delay/0.05 HTTP/1.1\r\nHost: x\r\n\r\n"
+                     b"GET /get?n=2 HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n")
+        data = _read_until_closed(sock)
+    head, _, rest = data.partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 200 OK")
+    assert f"Content-Length: {get_length}".encode() in head  # 和 GET 时的 body 一样长
+    # 延迟的 HEAD 响应后面紧跟下一个响应，没有夹带 body
+    assert rest.startswith(b"HTTP/1.1 200 OK")
+    assert b'"n":"2"' in rest
+
+
+@pytest.mark.mock
+@pytest.mark.parametrize("code", [204, 304])
+def test_no_body_statuses(echo_server, code):
+    resp = requests.get(f"{echo_server.base_url}/status/{code}", timeout=5)
+    assert resp.status_code == code
+    assert resp.content == b""
+    assert "Content-Length" not in resp.headers
+
+    with socket.create_connection(("127.0.0.1", echo_server.port), timeout=5) as sock:
+        sock.sendall(f"GET /status/{code} HTTP/1.1\r\nHost: x\r\n\r\n".encode()
+                     + b"GET /get HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n")
+        data = _read_until_closed(sock)
+    head, _, rest = data.partition(b"\r\n\r\n")
+    assert head.startswith(f"HTTP/1.1 {code} ".encode())
+    assert b"Content-Length" not in head
+    assert rest.startswith(b"HTTP/1.1 200 OK")
+
+
+@pytest.mark.mock
+def test_unknown_route_and_bad_request(echo_server):
+    assert requests.get(f"{echo_server.base_url}/nope", timeout=5).status_code == 404
+    with socket.create_connection(("127.0.0.1", echo_server.port), timeout=5) as sock:
+        sock.sendall(b"garbage\r\n\r\n")
+        assert sock.recv(1024).startswith(b"HTTP/1.1 400")
+
+
+@pytest.mark.mock
+def test_sustains_many_requests_on_pooled_client(echo_server):
+    client = APIClient(base_url=echo_server.base_url, timeout=5, log_mode="off")
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        statuses = list(pool.map(lambda i: client.get("/get", params={"i": i}).status_code, range(400)))
+    assert statuses == [200] * 400
+    # 连接池复用：400 个请求最多 10 条连接
+    assert client.connection_stats()["connections_opened"] <= 10
@@ -0,0 +1,171 @@
+# tests/day42_mock_transport/test_mock_transport.py
+import time
+
+import pytest
+import requests
+
+from autofw.services.demo_echo_service import EchoService
+from autofw.utils.api_client import APIClient
+from autofw.utils.mock_transport import MockResponse, MockTransport, NoRouteError, VirtualClock
+from autofw.utils.rate_limiter import RateLimiter
+
+
+@pytest.mark.mock
+def test_canned_and_callable_routes(mock_client, mock_transport):
+    mock_transport.add("GET", "/get", lambda req: {"args": req.params, "url": req.url})
+    mock_transport.add("GET", "/users/{uid}", lambda req: {"id": int(req.path_params["uid"])})
+
+    resp = EchoService(mock_client).get_with_params({"foo": "bar"})
+    assert resp.status_code == 200
+    assert resp.json()["args"] == {"foo": "bar"}
+    assert mock_client.get("/users/42").json() == {"id": 42}
+    assert mock_transport.call_count("GET") == 2
+
+
+@pytest.mark.mock
+def test_sequence_retries_on_virtual_clock(mock_client, mock_transport, virtual_clock):
+    route = mock_transport.add("POST", "/orders", [503, 503, MockResponse(201, {"ok": True})])
+
+    resp = mock_client.post("/orders", json={"sku": "A1"})
+
+    assert resp.status_code == 201
+    assert resp.json() == {"ok": True}
+    assert len(route.calls) == 3
+    assert route.calls[0].json == {"sku": "A1"}
+    # 指数退避 0.5 -> 1.0，但没有真睡
+    assert virtual_clock.sleeps == [0.5, 1.0]
+
+
+@pytest.mark.mock
+def test_exceptions_are_raised_and_retried(mock_client, mock_transport, virtual_clock):
+    mock_transport.add("GET", "/flaky", [requests.exceptions.ReadTimeout, {"ok": True}])
+    mock_transport.add("GET", "/down", requests.exceptions.ConnectionError("refused"))
+
+    assert mock_client.get("/flaky").json() == {"ok": True}
+    with pytest.raises(requests.exceptions.ConnectionError):
+        mock_client.get("/down")
+    assert mock_transport.call_count(path="/down") == 3
+
+
+@pytest.mark.mock
+def test_unmatched_route_fails_fast(mock_client, mock_transport):
+    mock_transport.add("GET", "/get", {})
+    with pytest.raises(NoRouteError, match="POST /post"):
+        mock_client.post("/post", json={})
+    assert mock_transport.call_count() == 1
+
+
+@pytest.mark.mock
+def test_later_routes_override_and_wildcards(mock_client, mock_transport):
+    mock_transport.add("*", "/api/*", 500)
+    mock_transport.add("GET", "/api/health", {"status": "up"})
+
+    assert mock_client.get("/api/health", retries=0).json() == {"status": "up"}
+    assert mock_client.post("/api/things/1", json={}, retries=0).status_code == 500
+
+
+@pytest.mark.mock
+def test_retry_after_uses_virtual_clock(mock_client, mock_transport, virtual_clock):
+    mock_transport.add("GET", "/limited", [MockResponse(429, headers={"Retry-After": "3"}), {"ok": True}])
+    assert mock_client.get("/limited").status_code == 200
+    assert virtual_clock.sleeps == [3.0]
+
+
+@pytest.mark.mock
+def test_rate_limiter_on_virtual_clock(mock_transport, virtual_clock):
+    mock_transport.add("GET", "/get", {})
+    client = APIClient(base_url="http://mock.local", sender=mock_transport, sleep=virtual_clock.sleep,
+                       rate_limiter=RateLimiter(qps=10, clock=virtual_clock), metrics=None)
+    for _ in range(5):
+        client.get("/get")
+    assert virtual_clock.slept == pytest.approx(0.4)
+
+
+@pytest.mark.mock
+def test_with_headers_keeps_sender_and_isolates_shared_session(mock_client, mock_transport):
+    mock_transport.add("GET", "/me", lambda req: {"auth": req.headers.get("Authorization")})
+
+    auth = mock_client.with_headers({"Authorization": "Bearer t"})
+    assert auth.get("/me").json() == {"auth": "Bearer t"}
+
+    # 同一个 session 上的另一个 client 不受 sender 影响（monkeypatch session.request 会串）
+    other = APIClient(base_url="http://mock.local", session=mock_client.session)
+    assert other.sender is None
+    assert mock_client.session.request.__func__ is requests.Session.request
+
+
+@pytest.mark.mock
+def test_constructor_shorthand_decorator_and_stream():
+    transport = MockTransport({"GET /items": MockResponse(json=[{"id": 1}, {"id": 2}])})
+
+    @transport.route("POST", "/login")
+    def _login(req):
+        return MockResponse(200, {"token": req.json["username"] + "-token"})
+
+    client = APIClient(base_url="http://mock.local", sender=transport, metrics=None)
+    assert client.post("/login", json={"username": "u"}).json() == {"token": "u-token"}
+    with client.stream("GET", "/items") as s:
+        assert [item["id"] for item in s.iter_items()] == [1, 2]
+
+    transport.reset()
+    assert transport.calls == [] and all(not r.calls for r in transport.routes)
+
+
+@pytest.mark.mock
+def test_virtual_clock_drives_circuit_breaker_cooldown():
+    from autofw.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+    clock = VirtualClock()
+    transport = MockTransport({"GET /get": [500, 500, {"ok": True}]})
+    breaker = CircuitBreaker(failure_rate=0.5, window=2, min_calls=2, cooldown=30, clock=clock)
+    client = APIClient(base_url="http://mock.local", sender=transport, sleep=clock.sleep, retries=0,
+                       circuit_breaker=breaker, metrics=None)
+
+    client.get("/get")
+    client.get("/get")
+    with pytest.raises(CircuitOpenError):
+        client.get("/get")
+    clock.advance(30)
+    assert client.get("/get").json() == {"ok": True}
+
+
+@pytest.mark.mock
+def test_virtual_clock_drives_response_cache_ttl(mock_transport, virtual_clock):
+    from autofw.utils.response_cache import ResponseCache
+
+    mock_transport.add("GET", "/get", [{"v": 1}, {"v": 2}])
+    cache = ResponseCache(ttl=60, clock=virtual_clock)
+    client = APIClient(base_url="http://mock.local", sender=mock_transport, cache=cache, metrics=None)
+
+    assert client.get("/get").json() == {"v": 1}
+    virtual_clock.advance(59)
+    assert client.get("/get").json() == {"v": 1}
+    assert mock_transport.call_count() == 1
+
+    virtual_clock.advance(1)
+    assert client.get("/get").json() == {"v": 2}
+    assert mock_transport.call_count() == 2
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.mock
+def test_in_memory_requests_are_fast(mock_transport):
+    mock_transport.add("GET", "/get", {"ok": True})
+    client = APIClient(base_url="http://mock.local", sender=mock_transport, log_mode="off", metrics=None)
+    start = time.perf_counter()
+    for _ in range(1000):
+        client.get("/get")
+    # 不经过 requests 的 adapter / urllib3：单次请求几十微秒量级
+    assert time.perf_counter() - start < 1.0
+
+
+@pytest.mark.mock
+def test_mock_client_does_not_pollute_global_metrics(mock_client, mock_transport):
+    from autofw.utils.metrics import get_registry
+
+    # 独一无二的 path：记了的话 registry 里一定会多一个序列
+    mock_transport.add("GET", "/metrics-probe", {})
+    before = len(get_registry())
+    mock_client.get("/metrics-probe")
+    assert mock_client.metrics is None
+    assert len(get_registry()) == before
@@ -0,0 +1,141 @@
+# tests/day43_warmup_dns/test_warmup_dns.py
+import socket
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from autofw.utils.api_client import APIClient
+from autofw.utils.cassette import Cassette
+from autofw.utils.dns_cache import DNSCache, get_dns_cache
+from autofw.utils.echo_server import EchoServer
+from autofw.utils.mock_transport import MockTransport, VirtualClock
+
+
+class _CountingResolver:
+    def __init__(self, fail: bool = False) -> None:
+        self.calls: list[str] = []
+        self.fail = fail
+
+    def __call__(self, host, port, *args):
+        self.calls.append(host)
+        if self.fail:
+            raise socket.gaierror("boom")
+        return socket.getaddrinfo("127.0.0.1", port, *args)
+
+
+@pytest.mark.mock
+def test_warmup_opens_connections_that_requests_reuse():
+    with EchoServer() as server:
+        client = APIClient(base_url=server.base_url, timeout=5, log_mode="off")
+        assert client.warmup(3) == 3
+
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            assert list(pool.map(lambda _: client.get("/get").status_code, range(3))) == [200] * 3
+
+        stats = client.connection_stats()
+        assert stats["connections_warmed"] == 3
+        assert stats["connections_opened"] == 0
+        assert stats["connections_reused"] == 3
+        # 服务端 accept 是异步的：等请求都回来以后再看连接数
+        assert server.connections == 3
+
+
+@pytest.mark.mock
+def test_warmup_on_requests_without_tls_context_lookup(monkeypatch):
+    with EchoServer() as server:
+        client = APIClient(base_url=server.base_url, timeout=5, log_mode="off")
+        # requests < 2.32.2 的 HTTPAdapter 只有 get_connection(url)；只在预热时去掉，后面的真实请求照常发
+        with monkeypatch.context() as m:
+            m.delattr(requests.adapters.HTTPAdapter, "get_connection_with_tls_context")
+            with pytest.warns(DeprecationWarning):
+                assert client.warmup(2) == 2
+        assert client.get("/get").status_code == 200
+        assert client.connection_stats()["connections_warmed"] == 2
+
+
+@pytest.mark.mock
+def test_warmup_is_capped_and_idempotent():
+    with EchoServer() as server:
+        client = APIClient(base_url=server.base_url, timeout=5, pool_maxsize=2)
+        assert client.warmup(10) == 2
+        # 已经建好的连接不会重复建
+        assert client.warmup(2) == 0
+        assert client.connection_stats()["connections_warmed"] == 2
+
+
+@pytest.mark.mock
+def test_warmup_failure_is_swallowed():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    client = APIClient(base_url=f"http://127.0.0.1:{port}", timeout=1)
+    assert client.warmup(2) == 0
+    assert client.connection_stats()["connections_warmed"] == 0
+
+
+@pytest.mark.mock
+def test_warmup_skipped_for_sender_and_replay(tmp_path):
+    assert APIClient(base_url="http://mock.local", sender=MockTransport(), metrics=None).warmup(2) == 0
+    replay = APIClient(base_url="http://127.0.0.1:9", cassette=Cassette(tmp_path / "c.jsonl", mode="replay"))
+    assert replay.warmup(2) == 0
+
+
+@pytest.mark.mock
+def test_dns_cache_ttl_and_failures():
+    clock = VirtualClock()
+    resolver = _CountingResolver()
+    cache = DNSCache(ttl=30, resolver=resolver, clock=clock)
+
+    cache.resolve("api.local", 80)
+    cache.resolve("api.local", 80)
+    assert resolver.calls == ["api.local"]
+    clock.advance(31)
+    cache.resolve("api.local", 80)
+    assert len(resolver.calls) == 2
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 2}
+
+    failing = DNSCache(resolver=_CountingResolver(fail=True))
+    for _ in range(2):
+        with pytest.raises(socket.gaierror):
+            failing.resolve("down.local", 80)
+    assert len(failing) == 0
+
+
+@pytest.mark.mock
+def test_dns_cache_evicts_least_recently_used():
+    cache = DNSCache(max_entries=2, resolver=_CountingResolver())
+    cache.resolve("a", 80)
+    cache.resolve("b", 80)
+    cache.resolve("a", 80)
+    cache.resolve("c", 80)
+    assert len(cache) == 2
+    cache.resolve("a", 80)
+    assert cache.stats()["hits"] == 2
+
+
+@pytest.mark.mock
+def test_clients_share_dns_cache():
+    resolver = _CountingResolver()
+    cache = DNSCache(resolver=resolver)
+    with EchoServer() as server:
+        base_url = f"http://localhost:{server.port}"
+        first = APIClient(base_url=base_url, timeout=5, dns_cache=cache)
+        second = APIClient(base_url=base_url, timeout=5, dns_cache=cache)
+        assert first.warmup(1) == 1
+        resp = second.get("/get")
+
+    assert resp.status_code == 200
+    assert resp.timing.reused is False  # second 自己的连接池：新建连接，但地址来自缓存
+    assert resolver.calls == ["localhost"]
+
+
+@pytest.mark.mock
+def test_shared_cache_ttl_can_be_configured():
+    cache = get_dns_cache()
+    ttl = cache.ttl
+    try:
+        assert get_dns_cache(5).ttl == 5
+        assert get_dns_cache() is cache
+    finally:
+        cache.ttl = ttl
@@ -0,0 +1,134 @@
+# tests/day44_json_path/test_json_path.py
+import time
+
+import pytest
+
+from autofw.utils.assertions import assert_each_value, assert_json_value, assert_path_count
+from autofw.utils.json_path import compile_path, find_path, get_path
+
+BODY = {
+    "json": {"user": {"id": 10086, "name": "Quintai-Li"}, "tags": ["api", "test"]},
+    "items": [
+        {"id": 1, "status": "active", "price": 10, "tags": ["a"]},
+        {"id": 2, "status": "inactive", "price": 0, "tags": []},
+        {"id": 3, "status": "active", "price": 25},
+    ],
+    "a.b": {"c": 1},
+    "0": "zero-key",
+}
+
+
+@pytest.mark.assertions
+@pytest.mark.parametrize("path, expected", [
+    ("json.user.id", 10086),
+    ("items.1.id", 2),
+    ("items.-1.id", 3),
+    ("items[-1].id", 3),
+    ("json.tags[0]", "api"),
+    ('["a.b"].c', 1),
+    ("0", "zero-key"),
+    ("items.*.id", [1, 2, 3]),
+    ("items[*].status", ["active", "inactive", "active"]),
+    ("items[0:2].id", [1, 2]),
+    ("items[::2].id", [1, 3]),
+    ('items[?status=="active"].id', [1, 3]),
+    ("items[?status=='inactive'].id", [2]),
+    ("items[?price>=10].id", [1, 3]),
+    ("items[?tags].id", [1]),
+    ("json.user.*", [10086, "Quintai-Li"]),
+])
+def test_get_path(path, expected):
+    assert get_path(BODY, path) == expected
+
+
+@pytest.mark.assertions
+def test_filter_on_item_itself_and_incomparable_values():
+    assert get_path({"nums": [1, 5, None, 7]}, "nums[?@>3]") == [5, 7]
+
+
+@pytest.mark.assertions
+def test_compiled_paths_are_cached():
+    assert compile_path("items.*.id") is compile_path("items.*.id")
+    assert compile_path("json.user.id").is_singular
+    assert not compile_path("items[?price>0].id").is_singular
+
+
+@pytest.mark.assertions
+def test_strict_errors_report_location():
+    with pytest.raises(AssertionError, match=r"items\[2\]: missing key 'tags'"):
+        get_path(BODY, "items.*.tags")
+    with pytest.raises(AssertionError, match="index 9 out of range"):
+        get_path(BODY, "items.9.id")
+    with pytest.raises(AssertionError, match="expects list index"):
+        get_path(BODY, "items.first")
+    with pytest.raises(AssertionError, match="cannot descend into int"):
+        get_path(BODY, "json.user.id.x")
+
+
+@pytest.mark.assertions
+def test_find_is_lenient():
+    assert find_path(BODY, "items.*.tags") == [["a"], []]
+    assert find_path(BODY, "missing.path") == []
+    assert compile_path("items.*.nope").first(BODY, "default") == "default"
+
+
+@pytest.mark.assertions
+@pytest.mark.parametrize("bad", [
+    "items[", "items[1:2:3:4]", "items[abc]", "items[?]", "items[+1]", "items[1_0]", "items[0:+2]",
+])
+def test_invalid_syntax(bad):
+    with pytest.raises(ValueError):
+        compile_path(bad)
+
+
+@pytest.mark.assertions
+@pytest.mark.parametrize("empty", ["", ".", ".."])
+def test_empty_path_is_rejected(empty):
+    # 不能悄悄返回整个 body
+    with pytest.raises(ValueError, match="empty path"):
+        compile_path(empty)
+    with pytest.raises(ValueError, match="empty path"):
+        assert_json_value(BODY, empty, BODY)
+
+
+@pytest.mark.assertions
+def test_star_segment_is_a_wildcard_quoted_star_is_a_key():
+    body = {"*": "star-key", "a*b": 1, "x": {"k": 2}}
+    assert get_path(body, "x.*") == [2]
+    assert get_path(body, '["*"]') == "star-key"
+    assert get_path(body, "a*b") == 1
+    assert_json_value(body, "*", ["star-key", 1, {"k": 2}])
+    assert_json_value(body, '["*"]', "star-key")
+
+
+@pytest.mark.assertions
+@pytest.mark.parametrize("key", ["1_000", " 1", "+1"])
+def test_only_plain_digits_are_list_indexes(key):
+    # int() 会接受这些写法；路径里它们只是普通 key
+    assert get_path({key: "k"}, key) == "k"
+    with pytest.raises(AssertionError, match="expects list index"):
+        get_path({"items": ["a", "b"]}, f"items.{key}")
+
+
+@pytest.mark.assertions
+def test_assertion_helpers():
+    assert_json_value(BODY, "items.*.id", [1, 2, 3])
+    assert assert_each_value(BODY, 'items[?status=="active"].status', "active") == 2
+    assert_each_value(BODY, "items.*.price", lambda v: v >= 0)
+    assert_path_count(BODY, "items[?price>0]", 2)
+
+    with pytest.raises(AssertionError, match=r"match #1.*actual=0"):
+        assert_each_value(BODY, "items.*.price", lambda v: v > 0)
+    with pytest.raises(AssertionError, match="expected at least 1"):
+        assert_each_value(BODY, 'items[?status=="gone"].id', 1)
+    with pytest.raises(AssertionError, match="matched 3 values, expected 1"):
+        assert_path_count(BODY, "items.*", 1)
+
+
+@pytest.mark.assertions
+def test_one_pass_over_large_list_is_fast():
+    body = {"items": [{"id": i, "status": "active"} for i in range(50_000)]}
+    start = time.perf_counter()
+    assert assert_each_value(body, "items.*.status", "active") == 50_000
+    assert len(get_path(body, "items.*.id")) == 50_000
+    assert time.perf_counter() - start < 1.0
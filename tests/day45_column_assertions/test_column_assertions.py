@@ -0,0 +1,177 @@
+# tests/day45_column_assertions/test_column_assertions.py
+import re
+import time
+
+import pytest
+
+from autofw.utils import columns
+from autofw.utils.assertions import (
+    assert_column_aggregate,
+    assert_column_in,
+    assert_column_in_range,
+    assert_column_sorted,
+    assert_column_unique,
+)
+from autofw.utils.columns import ColumnSet
+
+
+@pytest.fixture(params=["numpy", "array"])
+def backend(request, monkeypatch):
+    if request.param == "numpy" and columns.np is None:
+        pytest.skip("numpy not installed")
+    monkeypatch.setenv("AUTOFW_COLUMN_BACKEND", request.param)
+    return request.param
+
+
+def _records(n: int) -> list[dict]:
+    return [
+        {
+            "id": i,
+            "status": "active",
+            "amount": round(i * 0.25, 2),
+            "created_at": f"2026-01-01T00:{i // 60 % 60:02d}:{i % 60:02d}Z",
+            "user": {"id": i % 7},
+        }
+        for i in range(n)
+    ]
+
+
+@pytest.mark.assertions
+def test_all_checks_pass(backend):
+    items = _records(1000)
+    cols = ColumnSet(items)
+    assert cols.backend == backend
+
+    assert_column_unique(cols, "id")
+    assert_column_sorted(cols, "id", strict=True)
+    assert_column_sorted(items[:3600], "created_at")
+    assert_column_in(cols, "status", {"active"})
+    assert_column_in_range(cols, "amount", 0, 250)
+    assert_column_in(cols, "user.id", range(7))
+    assert assert_column_aggregate(cols, "amount", "sum", sum(r["amount"] for r in items)) > 0
+    assert assert_column_aggregate(cols, "id", "count", 1000) == 1000
+    assert_column_aggregate(cols, "id", "max", 999)
+    assert_column_aggregate(cols, "id", "mean", 499.5)
+
+
+@pytest.mark.assertions
+def test_failures_list_first_offending_rows(backend):
+    items = _records(100)
+    items[10]["id"] = 3
+    items[50]["id"] = 3
+    items[20]["status"] = "deleted"
+    items[30]["amount"] = -1
+    items[40]["amount"] = float("nan")
+    cols = ColumnSet(items)
+
+    with pytest.raises(AssertionError, match=r"2 of 100 rows are duplicates; first rows=\[10, 50\]"):
+        assert_column_unique(cols, "id")
+    with pytest.raises(AssertionError, match=r"2 of 100 rows break ascending order.*first rows=\[10, 50\]"):
+        assert_column_sorted(cols, "id")
+    with pytest.raises(AssertionError, match=r"rows=\[20\] values=\['deleted'\]"):
+        assert_column_in(cols, "status", ["active"])
+    with pytest.raises(AssertionError, match=r"2 of 100 rows outside \[0, 100\]; first rows=\[30, 40\]"):
+        assert_column_in_range(cols, "amount", 0, 100)
+    with pytest.raises(AssertionError, match="sum="):
+        assert_column_aggregate(cols, "id", "sum", 1)
+
+
+@pytest.mark.assertions
+def test_max_report_limits_rows(backend):
+    items = [{"v": 1} for _ in range(50)]
+    with pytest.raises(AssertionError) as excinfo:
+        assert_column_unique(items, "v", max_report=3)
+    assert "49 of 50 rows" in str(excinfo.value)
+    assert "first rows=[1, 2, 3]" in str(excinfo.value)
+
+
+@pytest.mark.assertions
+def test_descending_and_mixed_types(backend):
+    assert_column_sorted([{"t": 3}, {"t": 2}, {"t": 2}], "t", descending=True)
+    with pytest.raises(AssertionError, match=r"rows=\[2\]"):
+        assert_column_sorted([{"t": 3}, {"t": 2}, {"t": 2}], "t", descending=True, strict=True)
+
+    mixed = [{"v": 1}, {"v": None}, {"v": "x"}, {"v": {"a": 1}}, {"v": {"a": 1}}]
+    with pytest.raises(AssertionError, match=r"rows=\[4\]"):
+        assert_column_unique(mixed, "v")
+    with pytest.raises(AssertionError, match=r"rows=\[1, 2, 3, 4\]"):
+        assert_column_in_range(mixed, "v", 0, 10)
+    assert_column_in(mixed[:3], "v", [1, None, "x"])
+
+
+@pytest.mark.assertions
+def test_missing_field_is_reported(backend):
+    with pytest.raises(AssertionError, match=r"'status' missing in 1 of 3 rows; first rows=\[1\]"):
+        assert_column_in([{"status": "a"}, {}, {"status": "a"}], "status", ["a"])
+
+
+@pytest.mark.assertions
+def test_big_ints_fall_back_to_python(backend):
+    items = [{"id": 2**70}, {"id": 2**70 + 1}]
+    assert_column_unique(items, "id")
+    assert_column_sorted(items, "id", strict=True)
+
+
+@pytest.mark.assertions
+def test_nan_breaks_sort_order(backend):
+    nan = float("nan")
+    for values, bad in (([1.0, nan, 2.0], "[1, 2]"), ([nan, 1.0, 2.0], "[1]"), ([1.0, 2.0, nan], "[2]")):
+        with pytest.raises(AssertionError, match=re.escape(f"first rows={bad}")):
+            assert_column_sorted([{"v": v} for v in values], "v")
+    with pytest.raises(AssertionError, match=re.escape("first rows=[1, 2]")):
+        assert_column_sorted([{"v": 2.0}, {"v": nan}, {"v": 1.0}], "v", descending=True)
+
+
+@pytest.mark.assertions
+def test_int64_sum_does_not_wrap(backend):
+    big = 2**62
+    items = [{"v": big}, {"v": big}, {"v": big}]
+    col = ColumnSet(items).column("v")
+    assert col.aggregate("sum") == 3 * big
+    assert_column_aggregate(items, "v", "sum", 3 * big)
+    assert ColumnSet([{"v": -big}] * 3).column("v").aggregate("sum") == -3 * big
+    # 放得下的情况还是走向量化
+    assert ColumnSet(_records(10)).column("id").aggregate("sum") == 45
+
+
+@pytest.mark.assertions
+def test_aggregates_return_python_scalars(backend):
+    cols = ColumnSet([{"n": 1, "x": 0.5, "ok": True, "s": "b"}, {"n": 2, "x": 1.5, "ok": False, "s": "a"}])
+    for field, func, expected in (
+        ("n", "sum", 3), ("n", "max", 2), ("x", "mean", 1.0), ("x", "min", 0.5),
+        ("ok", "max", True), ("ok", "sum", 1), ("s", "min", "a"),
+    ):
+        value = cols.column(field).aggregate(func)
+        assert value == expected
+        assert type(value) is type(expected), (field, func, type(value))
+
+
+@pytest.mark.assertions
+def test_unsupported_aggregate_names_the_column(backend):
+    with pytest.raises(AssertionError, match=r"Column 's' \(str\) does not support mean"):
+        assert_column_aggregate([{"s": "a"}, {"s": "b"}], "s", "mean", 0)
+    with pytest.raises(AssertionError, match=r"Column 'v' \(object\) does not support max"):
+        ColumnSet([{"v": 1}, {"v": "x"}]).column("v").aggregate("max")
+
+
+@pytest.mark.assertions
+def test_invalid_backend_and_aggregate(monkeypatch):
+    monkeypatch.setenv("AUTOFW_COLUMN_BACKEND", "pandas")
+    with pytest.raises(ValueError):
+        ColumnSet([])
+    monkeypatch.delenv("AUTOFW_COLUMN_BACKEND")
+    with pytest.raises(ValueError, match="aggregate must be one of"):
+        assert_column_aggregate([{"v": 1}], "v", "median", 1)
+
+
+@pytest.mark.assertions
+def test_100k_records_are_checked_quickly(backend):
+    items = _records(100_000)
+    start = time.perf_counter()
+    cols = ColumnSet(items)
+    assert_column_unique(cols, "id")
+    assert_column_sorted(cols, "id", strict=True)
+    assert_column_in(cols, "status", {"active"})
+    assert_column_in_range(cols, "amount", 0, 25_000)
+    assert_column_aggregate(cols, "id", "sum", sum(range(100_000)))
+    assert time.perf_counter() - start < 2.0
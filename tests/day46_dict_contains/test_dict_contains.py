@@ -0,0 +1,148 @@
+# tests/day46_dict_contains/test_dict_contains.py
+import itertools
+import random
+import time
+
+import pytest
+
+from autofw.utils.assertions import assert_dict_contains
+from autofw.utils.subset import find_mismatches, short_repr
+
+
+def _nested(depth: int, leaf):
+    data = leaf
+    for _ in range(depth):
+        data = {"child": data}
+    return data
+
+
+@pytest.mark.assertions
+def test_default_semantics_unchanged():
+    actual = {"json": {"username": "u", "password": "p"}, "tags": [1, 2], "items": [{"id": 1, "x": 0}]}
+    assert_dict_contains(actual, {"json": {"username": "u"}, "tags": [1, 2]})
+
+    with pytest.raises(AssertionError, match=r"Key json\.email missing in actual dict"):
+        assert_dict_contains(actual, {"json": {"email": "e"}})
+    with pytest.raises(AssertionError, match=r"Value mismatch at json\.username: actual='u', expected='v'"):
+        assert_dict_contains(actual, {"json": {"username": "v"}})
+    # 默认 equal：列表长度 / 元素里的 dict 都要完全相等
+    with pytest.raises(AssertionError, match=r"Length mismatch at tags"):
+        assert_dict_contains(actual, {"tags": [1]})
+    with pytest.raises(AssertionError, match=r"Keys mismatch at items\[0\]: unexpected keys \['x'\]"):
+        assert_dict_contains(actual, {"items": [{"id": 1}]})
+
+
+@pytest.mark.assertions
+def test_equal_mode_keeps_list_tuple_distinction():
+    # 和原来的 != 一样：(1, 2) != [1, 2]，嵌套在列表元素里也一样
+    with pytest.raises(AssertionError, match=r"Type mismatch at tags: actual is tuple, expected list"):
+        assert_dict_contains({"tags": (1, 2)}, {"tags": [1, 2]})
+    with pytest.raises(AssertionError, match=r"Type mismatch at rows\[0\]: actual is list, expected tuple"):
+        assert_dict_contains({"rows": [[1, 2]]}, {"rows": [(1, 2)]})
+    # 只有 equal 看类型；ordered / prefix / contains 本来就是宽松比较
+    assert_dict_contains({"tags": (1, 2)}, {"tags": [1, 2]}, list_mode="ordered")
+    assert_dict_contains({"tags": (1, 2, 3)}, {"tags": [3, 1]}, list_mode="contains")
+
+
+@pytest.mark.assertions
+def test_list_modes():
+    actual = {"items": [{"id": 1, "n": "a"}, {"id": 2, "n": "b"}, {"id": 3, "n": "c"}]}
+
+    assert_dict_contains(actual, {"items": [{"id": 1}, {"id": 2}, {"id": 3}]}, list_mode="ordered")
+    assert_dict_contains(actual, {"items": [{"id": 1}, {"n": "b"}]}, list_mode="prefix")
+    assert_dict_contains(actual, {"items": [{"id": 3}, {"id": 1}]}, list_mode="contains")
+
+    with pytest.raises(AssertionError, match=r"Value mismatch at items\[1\]\.id: actual=2, expected=3"):
+        assert_dict_contains(actual, {"items": [{"id": 1}, {"id": 3}]}, list_mode="prefix")
+    with pytest.raises(AssertionError, match=r"Length mismatch at items.*list_mode=ordered"):
+        assert_dict_contains(actual, {"items": [{"id": 1}]}, list_mode="ordered")
+    # contains 不重复使用同一个元素
+    with pytest.raises(AssertionError, match=r"No element at items matches expected\[1\]=\{'id': 1\}"):
+        assert_dict_contains(actual, {"items": [{"id": 1}, {"id": 1}]}, list_mode="contains")
+    with pytest.raises(ValueError, match="list_mode"):
+        assert_dict_contains(actual, {}, list_mode="bag")
+
+
+@pytest.mark.assertions
+def test_contains_uses_maximum_matching():
+    # 贪心会把 {"a": 1} 先配给 {"a": 1, "b": 2}，然后误报第二个期望找不到
+    assert_dict_contains({"items": [{"a": 1, "b": 2}, {"a": 1}]},
+                         {"items": [{"a": 1}, {"a": 1, "b": 2}]}, list_mode="contains")
+    # 嵌套的 contains 列表同样按最大匹配
+    actual = {"groups": [{"tags": [{"k": 1, "v": 2}, {"k": 1}]}, {"tags": [{"k": 3}]}]}
+    assert_dict_contains(actual, {"groups": [{"tags": [{"k": 3}]}, {"tags": [{"k": 1}, {"k": 1, "v": 2}]}]},
+                         list_mode="contains")
+
+    mismatches = find_mismatches([{"a": 1, "b": 2}, {"c": 3}], [{"a": 1}, {"b": 2}, {"d": 4}],
+                                 list_mode="contains", max_mismatches=5)
+    assert [m.path for m in mismatches] == ["[1]", "[2]"]
+    assert "1 candidate(s) are taken by other expected elements" in mismatches[0].message
+    assert mismatches[1].message.endswith("(list_mode=contains)")
+
+
+@pytest.mark.assertions
+def test_contains_agrees_with_brute_force():
+    rng = random.Random(46)
+    for _ in range(300):
+        actual = [{k: rng.randint(0, 1) for k in rng.sample("abc", rng.randint(1, 3))} for _ in range(4)]
+        expected = [{k: rng.randint(0, 1) for k in rng.sample("abc", rng.randint(0, 2))}
+                    for _ in range(rng.randint(0, 4))]
+        brute = any(all(find_mismatches(actual[i], e) == [] for i, e in zip(perm, expected, strict=True))
+                    for perm in itertools.permutations(range(4), len(expected)))
+        assert (find_mismatches(actual, expected, list_mode="contains") == []) == brute, (actual, expected)
+
+
+@pytest.mark.assertions
+def test_collects_up_to_max_failures():
+    actual = {"a": 1, "b": 2, "c": {"d": 3}}
+    expected = {"a": 0, "b": 0, "c": {"d": 0}, "e": 0}
+
+    assert [m.path for m in find_mismatches(actual, expected, max_mismatches=10)] == ["a", "b", "c.d", "e"]
+    assert len(find_mismatches(actual, expected)) == 1
+
+    with pytest.raises(AssertionError) as exc:
+        assert_dict_contains(actual, expected, max_failures=3)
+    msg = str(exc.value)
+    assert msg.startswith("3 mismatches")
+    assert "Value mismatch at a" in msg and "Value mismatch at c.d" in msg
+    assert "Key e missing" not in msg
+
+
+@pytest.mark.assertions
+def test_deep_nesting_does_not_recurse():
+    depth = 5000
+    actual = _nested(depth, {"leaf": 1, "extra": True})
+    assert_dict_contains(actual, _nested(depth, {"leaf": 1}))
+
+    with pytest.raises(AssertionError, match=r"Value mismatch at (child\.){5000}leaf: actual=1, expected=2"):
+        assert_dict_contains(actual, _nested(depth, {"leaf": 2}))
+
+    # equal 模式下的深层列表也走显式栈，不靠 == 递归
+    deep_list = [[[]]]
+    for _ in range(depth):
+        deep_list = [deep_list]
+    assert_dict_contains({"x": deep_list}, {"x": deep_list})
+
+    # contains 模式下元素之间的比较也不递归
+    deep_bag = [1]
+    for _ in range(depth):
+        deep_bag = [0, deep_bag]
+    assert_dict_contains({"x": deep_bag}, {"x": deep_bag}, list_mode="contains")
+
+
+@pytest.mark.assertions
+def test_huge_values_are_truncated_quickly():
+    blob = "x" * 5_000_000
+    rows = list(range(1_000_000))
+    actual = {"blob": blob, "rows": rows}
+
+    start = time.perf_counter()
+    with pytest.raises(AssertionError) as exc:
+        assert_dict_contains(actual, {"rows": rows[:-1]})
+    with pytest.raises(AssertionError) as exc2:
+        assert_dict_contains(actual, {"blob": "y"})
+    assert time.perf_counter() - start < 1.0
+
+    assert len(str(exc.value)) < 400 and "..." in str(exc.value)
+    assert len(str(exc2.value)) < 400
+    assert len(short_repr(_nested(100, rows))) <= 203
@@ -0,0 +1,124 @@
+# tests/day47_soft_assertions/test_soft_assertions.py
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from autofw.utils.assertions import assert_status_code
+from autofw.utils.mock_transport import MockResponse
+from autofw.utils.soft_assertions import SoftAssertionError, SoftAssertions, check_case
+
+BODY = {
+    "json": {"username": "u", "role": "admin"},
+    "items": [{"id": 1}, {"id": 2}, {"id": 3}],
+}
+
+
+@pytest.mark.mock
+@pytest.mark.assertions
+def test_check_case_passes(mock_client, mock_transport):
+    mock_transport.add("POST", "/post", json=BODY)
+    resp = mock_client.post("/post", json={})
+
+    case = {
+        "name": "ok",
+        "expected_status": 200,
+        "expected_subset": {"json": {"username": "u"}, "items": [{"id": 3}]},
+        "list_mode": "contains",
+        "expected_paths": {"items.*.id": [1, 2, 3]},
+        "expected_lengths": {"items": 3, "json": 2},
+    }
+    result = check_case(resp, case)
+
+    assert result.ok, result.summary()
+    assert result.checks == 5
+    result.raise_if_failed()
+
+
+@pytest.mark.mock
+@pytest.mark.assertions
+def test_check_case_reports_every_failure_in_one_pass(mock_client, mock_transport):
+    mock_transport.add("GET", "/get", MockResponse(404, BODY))
+    resp = mock_client.get("/get")
+    assert mock_transport.call_count() == 1
+
+    case = {
+        "name": "broken env",
+        "expected_status": 200,
+        "expected_subset": {"json": {"username": "x", "role": "user", "email": "e"}},
+        "expected_paths": {"json.username": "x", "items.0.id": 1, "missing.path": 1},
+        "expected_lengths": {"items": 2, "json": 2, "items.0.id": 1},
+    }
+    result = check_case(resp, case)
+
+    checks = [f.check for f in result.failures]
+    assert checks == [
+        "status",
+        "subset", "subset", "subset",
+        "path:json.username", "path:missing.path",
+        "length:items", "length:items.0.id",
+    ]
+    assert result.checks == 8
+    assert "Key json.email missing" in result.failures[3].message
+    assert "has no length" in result.failures[-1].message
+
+    with pytest.raises(SoftAssertionError) as exc:
+        result.raise_if_failed()
+    assert isinstance(exc.value, AssertionError)
+    assert exc.value.result is result
+    assert str(exc.value).startswith("broken env: 8 failure(s) in 8 checks:")
+    assert result.as_dict()["failures"][0]["check"] == "status"
+
+
+@pytest.mark.mock
+@pytest.mark.assertions
+def test_check_case_non_json_body(mock_client, mock_transport):
+    mock_transport.add("GET", "/html", MockResponse(200, body="<html>oops</html>"))
+    resp = mock_client.get("/html")
+
+    result = check_case(resp, {"expected_status": 200, "expected_subset": {"a": 1}, "expected_paths": {"a": 1}})
+    assert [f.check for f in result.failures] == ["json"]
+    assert "<html>oops" in result.failures[0].message
+
+    # 只声明状态码时不解析 body
+    assert check_case(resp, {"expected_status": 200}).ok
+
+
+@pytest.mark.assertions
+def test_soft_assertions_collector(mock_client, mock_transport):
+    mock_transport.add("GET", "/get", 404)
+    resp = mock_client.get("/get")
+
+    with pytest.raises(SoftAssertionError) as exc:
+        with SoftAssertions("manual") as soft:
+            assert soft.check("status", assert_status_code, resp, 200) is False
+            assert soft.check("status-404", assert_status_code, resp, 404) is True
+            with soft.expect("header"):
+                assert resp.headers.get("X-Trace"), "missing X-Trace"
+    assert [f.check for f in exc.value.result.failures] == ["status", "header"]
+    assert "missing X-Trace" in str(exc.value)
+
+    # 非 AssertionError 不吞掉
+    soft = SoftAssertions()
+    with pytest.raises(KeyError):
+        with soft.expect("bug"):
+            {}["nope"]
+    assert soft.failures == []
+
+
+@pytest.mark.assertions
+def test_length_check_is_soft_under_python_O(pytestconfig):
+    # python -O 会去掉 assert 语句：“没有长度”必须照样记成一条失败，而不是 len() 抛 TypeError
+    script = textwrap.dedent("""
+        from autofw.utils.response_builder import build_response
+        from autofw.utils.soft_assertions import check_case
+
+        resp = build_response(200, {"items": 5})
+        result = check_case(resp, {"expected_lengths": {"items": 1}})
+        print([f.check for f in result.failures], "has no length" in result.failures[0].message)
+    """)
+    out = subprocess.run([sys.executable, "-O", "-c", script], capture_output=True, text=True, timeout=60,
+                         cwd=pytestconfig.rootpath)
+    assert out.returncode == 0, out.stderr
+    assert out.stdout.strip() == "['length:items'] True"
@@ -0,0 +1,238 @@
+# tests/day48_json_schema/test_json_schema.py
+import json
+import os
+import time
+
+import pytest
+
+from autofw.utils import json_schema
+from autofw.utils.assertions import assert_json_schema
+from autofw.utils.json_schema import clear_schema_cache, load_schema, schema_cache_info
+
+ORDER_SCHEMA = {
+    "type": "object",
+    "required": ["id", "status", "items"],
+    "additionalProperties": False,
+    "properties": {
+        "id": {"type": "integer", "minimum": 1},
+        "status": {"enum": ["new", "paid"]},
+        "note": {"type": ["string", "null"], "maxLength": 5},
+        "items": {"type": "array", "minItems": 1, "items": {"$ref": "#/$defs/item"}},
+    },
+    "$defs": {
+        "item": {
+            "type": "object",
+            "required": ["sku", "qty"],
+            "properties": {
+                "sku": {"type": "string", "pattern": "^SKU-"},
+                "qty": {"type": "integer", "exclusiveMinimum": 0},
+                "tags": {"type": "array", "uniqueItems": True},
+            },
+        },
+    },
+}
+
+
+def _order(n: int = 3) -> dict:
+    return {
+        "id": 1,
+        "status": "paid",
+        "note": None,
+        "items": [{"sku": f"SKU-{i}", "qty": i + 1, "tags": ["a"]} for i in range(n)],
+    }
+
+
+@pytest.fixture(params=json_schema.BACKENDS)
+def backend(request, monkeypatch):
+    if request.param == "jsonschema" and json_schema.jsonschema is None:
+        pytest.skip("jsonschema not installed")
+    monkeypatch.setenv("AUTOFW_SCHEMA_BACKEND", request.param)
+    return request.param
+
+
+@pytest.fixture
+def schema_file(tmp_path):
+    path = tmp_path / "order.json"
+    path.write_text(json.dumps(ORDER_SCHEMA), encoding="utf-8")
+    clear_schema_cache()
+    yield path
+    clear_schema_cache()
+
+
+@pytest.mark.assertions
+def test_valid_and_invalid_bodies(backend):
+    assert_json_schema(_order(), ORDER_SCHEMA)
+
+    bad = _order()
+    bad["id"] = 0
+    bad["status"] = "lost"
+    bad["extra"] = True
+    bad["items"][1]["sku"] = "X-1"
+    bad["items"][2]["qty"] = "3"
+    bad["items"][2]["tags"] = ["a", "a"]
+    del bad["items"][0]["qty"]
+
+    errors = load_schema(ORDER_SCHEMA).errors(bad, max_errors=50)
+    where = {e.split(":")[0] for e in errors}
+    assert where == {"<root>", "id", "status", "items[0]", "items[1].sku", "items[2].qty", "items[2].tags"}
+
+    with pytest.raises(AssertionError, match=r"mismatch \(truncated\):\n  - ") as exc:
+        assert_json_schema(bad, ORDER_SCHEMA, max_errors=2)
+    assert str(exc.value).count("\n  - ") == 2
+
+
+@pytest.mark.assertions
+def test_builtin_messages():
+    validator = load_schema(ORDER_SCHEMA, backend="builtin")
+    bad = _order()
+    bad["note"] = "too long"
+    bad["items"][1]["qty"] = True
+    assert validator.errors(bad) == [
+        "note: string length 8 > maxLength 5",
+        "items[1].qty: expected integer, got boolean",
+    ]
+    assert validator.is_valid(_order())
+    assert not validator.is_valid([])
+
+
+DRAFT4 = "http://json-schema.org/draft-04/schema#"
+DRAFT7 = "http://json-schema.org/draft-07/schema#"
+DRAFT2020 = "https://json-schema.org/draft/2020-12/schema"
+
+# (schema, 通过的值, 不通过的值)：两个后端结论必须一样
+STRICTNESS_CASES = [
+    ({"$schema": DRAFT4, "minimum": 0, "exclusiveMinimum": True, "maximum": 10, "exclusiveMaximum": True},
+     [0.5, 9], [0, 10, -1]),
+    ({"$schema": DRAFT4, "minimum": 0, "exclusiveMinimum": False}, [0, 3], [-1]),
+    ({"$schema": DRAFT2020, "exclusiveMinimum": 0, "maximum": 3}, [1, 3], [0, 4]),
+    ({"$schema": DRAFT2020, "$ref": "#/$defs/base", "required": ["b"],
+      "$defs": {"base": {"type": "object", "required": ["a"]}}},
+     [{"a": 1, "b": 2}], [{"a": 1}, {"b": 2}, []]),
+    ({"$schema": DRAFT2020, "type": "array", "contains": {"const": 5}}, [[5], [1, 5]], [[1, 2], []]),
+    ({"$schema": DRAFT2020, "contains": {"type": "integer"}, "minContains": 2, "maxContains": 3},
+     [[1, 2], ["x", 1, 2, 3]], [[1, "x"], [1, 2, 3, 4]]),
+    ({"$schema": DRAFT2020, "if": {"required": ["a"]}, "then": {"required": ["b"]}, "else": {"required": ["c"]}},
+     [{"a": 1, "b": 2}, {"c": 3}], [{"a": 1}, {"b": 2}]),
+    ({"$schema": DRAFT2020, "dependentRequired": {"a": ["b"]}}, [{"a": 1, "b": 2}, {"b": 2}], [{"a": 1}]),
+    ({"$schema": DRAFT2020, "dependentSchemas": {"a": {"required": ["b"]}}}, [{"a": 1, "b": 2}, {}], [{"a": 1}]),
+    ({"$schema": DRAFT7, "dependencies": {"a": ["b"], "c": {"properties": {"a": {"type": "string"}}}}},
+     [{"a": 1, "b": 2}, {"c": 1}], [{"a": 1}, {"a": 1, "b": 2, "c": 3}]),
+    ({"$schema": DRAFT2020, "propertyNames": {"maxLength": 1}}, [{"a": 1}, {}], [{"abc": 1}]),
+    ({"$schema": DRAFT7, "items": [{"type": "integer"}], "additionalItems": False}, [[1], []], [[1, 2], ["x"]]),
+    ({"$schema": DRAFT2020, "prefixItems": [{"type": "integer"}], "items": {"type": "string"}},
+     [[1, "x"]], [[1, 2]]),
+    ({"$schema": DRAFT2020, "uniqueItems": True},
+     [[1, True], [1, "1"], [[1], [True]], [{"a": 1}, {"a": True}], []],
+     [[1, 1.0], [True, True], [{"a": 1, "b": [1]}, {"b": [1], "a": 1}], [[0, None], [0, None]]]),
+]
+
+
+@pytest.mark.assertions
+@pytest.mark.parametrize("schema, good, bad", STRICTNESS_CASES)
+def test_never_looser_than_written(backend, schema, good, bad):
+    validator = load_schema(schema)
+    assert validator.backend == backend
+    assert [validator.is_valid(v) for v in good] == [True] * len(good)
+    assert [validator.is_valid(v) for v in bad] == [False] * len(bad)
+
+
+@pytest.mark.assertions
+def test_builtin_messages_for_bounds_and_ref_siblings():
+    draft4 = load_schema(STRICTNESS_CASES[0][0], backend="builtin")
+    assert draft4.errors(0) == ["<root>: 0 is not > 0"]
+    assert draft4.errors(10) == ["<root>: 10 is not < 10"]
+    with_ref = load_schema(STRICTNESS_CASES[3][0], backend="builtin")
+    assert with_ref.errors({}, max_errors=5) == [
+        "<root>: missing required property 'a'",
+        "<root>: missing required property 'b'",
+    ]
+
+    # 看不懂的边界写法直接报错，不悄悄放过
+    with pytest.raises(ValueError, match="invalid minimum"):
+        load_schema({"minimum": "5"}, backend="builtin")
+    with pytest.raises(ValueError, match="exclusiveMinimum: true requires minimum"):
+        load_schema({"exclusiveMinimum": True}, backend="builtin")
+
+
+@pytest.mark.assertions
+def test_builtin_unique_items_large_and_unhashable():
+    validator = load_schema({"uniqueItems": True}, backend="builtin")
+    big = list(range(10_000))
+    assert validator.is_valid(big)
+    assert validator.errors([*big, 9_999]) == ["<root>: duplicate item 9999 at index 10000 (uniqueItems)"]
+    # 哈希不了的值退回两两比较
+    assert not validator.is_valid([{1}, "x", {1}])
+    assert validator.is_valid([{1}, {2}])
+
+
+@pytest.mark.assertions
+@pytest.mark.parametrize("schema", [
+    {"unevaluatedProperties": False},
+    {"type": "array", "unevaluatedItems": False},
+    {"$dynamicRef": "#node"},
+    {"$recursiveRef": "#"},
+    {"properties": {"user": {"$ref": "https://example.com/user.json"}}},
+])
+def test_builtin_rejects_keywords_it_cannot_check(schema):
+    with pytest.raises(ValueError, match="not supported|only local"):
+        load_schema(schema, backend="builtin")
+
+
+@pytest.mark.assertions
+def test_jsonschema_backend_matches_builtin():
+    pytest.importorskip("jsonschema")
+    for schema, good, bad in STRICTNESS_CASES:
+        full = load_schema(schema, backend="jsonschema")
+        builtin = load_schema(schema, backend="builtin")
+        for value in [*good, *bad]:
+            assert full.is_valid(value) == builtin.is_valid(value), (schema, value)
+    assert load_schema(ORDER_SCHEMA, backend="jsonschema").is_valid(_order())
+
+
+@pytest.mark.assertions
+def test_compiled_once_per_path_and_mtime(schema_file, backend):
+    body = _order()
+    for _ in range(200):
+        assert_json_schema(body, schema_file)
+    info = schema_cache_info()
+    assert (info.misses, info.hits) == (1, 199)
+
+    # 改文件（新 mtime）-> 重新编译，用新规则
+    changed = dict(ORDER_SCHEMA, required=["id", "missing_field"])
+    schema_file.write_text(json.dumps(changed), encoding="utf-8")
+    st = schema_file.stat()
+    os.utime(schema_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    with pytest.raises(AssertionError, match="missing_field"):
+        assert_json_schema(body, schema_file)
+    assert schema_cache_info().misses == 2
+
+
+@pytest.mark.assertions
+def test_shallow_skips_deep_checks(schema_file):
+    big = _order(20_000)
+    big["items"][-1]["qty"] = -1
+
+    with pytest.raises(AssertionError, match=r"items\[19999\]\.qty"):
+        assert_json_schema(big, schema_file)
+
+    start = time.perf_counter()
+    for _ in range(50):
+        assert_json_schema(big, schema_file, shallow=True)
+    assert time.perf_counter() - start < 0.5
+    assert load_schema(schema_file, shallow=True).backend == "builtin"
+
+    # 顶层的问题 shallow 也能查出来
+    with pytest.raises(AssertionError, match="items: expected array, got object"):
+        assert_json_schema(dict(big, items={}), schema_file, shallow=True)
+    with pytest.raises(AssertionError, match="missing required property 'status'"):
+        assert_json_schema({"id": 1, "items": []}, schema_file, shallow=True)
+
+
+@pytest.mark.mock
+@pytest.mark.assertions
+def test_bundled_schema_against_local_echo(local_echo_service):
+    resp = local_echo_service.post_json({"user": {"id": 1}})
+    assert_json_schema(resp.json(), "echo_post.json")
+
+    with pytest.raises(FileNotFoundError):
+        assert_json_schema({}, "no_such_schema.json")
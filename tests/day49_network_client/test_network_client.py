@@ -0,0 +1,76 @@
+# tests/day49_network_client/test_network_client.py
+import dataclasses
+import socket
+
+import pytest
+import requests
+
+from autofw.api_client import APIClient
+from autofw.utils.cassette import Cassette, CassetteAdapter, CassetteMissError
+from autofw.utils.h2_adapter import HTTP2Adapter
+from autofw.utils.http_pool import PooledHTTPAdapter
+
+# network_client 只应该改这几个字段，其它（包括 metrics）全部和 client 一样
+PATIENT_FIELDS = {"timeout", "retries", "backoff"}
+
+
+@pytest.mark.mock
+def test_network_client_inherits_every_other_field(client, network_client):
+    assert network_client.session is client.session
+    assert network_client.timeout >= 30 and network_client.retries >= 3 and network_client.backoff >= 1.0
+    for f in dataclasses.fields(APIClient):
+        if f.name not in PATIENT_FIELDS:
+            assert getattr(network_client, f.name) == getattr(client, f.name), f.name
+    # 日志配置也要跟着 config 走（以前 network 层总是默认的 full 模式）
+    assert (network_client.log_mode, network_client.log_body_max) == (client.log_mode, client.log_body_max)
+
+
+@pytest.mark.mock
+def test_shared_session_keeps_existing_http2_adapter():
+    h2_client = APIClient(base_url="https://h2.local", transport="http2", metrics=None)
+    adapter = h2_client.session.get_adapter("https://")
+    assert isinstance(adapter, HTTP2Adapter)
+
+    # 默认 http1 的 client 共享这个 session：不再把 HTTP/2 adapter 换成连接池
+    APIClient(base_url="https://h2.local", session=h2_client.session, metrics=None)
+    assert h2_client.session.get_adapter("https://") is adapter
+
+    patient = dataclasses.replace(h2_client, timeout=30, retries=3, backoff=1.0)
+    assert patient.transport == "http2"
+    assert patient.session.get_adapter("https://") is adapter
+
+
+@pytest.mark.mock
+def test_default_adapter_still_replaced_by_pool():
+    client = APIClient(base_url="http://mock.local", session=requests.Session(), metrics=None)
+    assert isinstance(client.session.get_adapter("http://"), PooledHTTPAdapter)
+
+
+@pytest.mark.mock
+@pytest.mark.parametrize("transport", ["http1", "http2"])
+def test_network_client_replays_without_opening_connections(
+        transport, tmp_path, local_base_url, make_network_client, monkeypatch):
+    path = tmp_path / "network.jsonl"
+    recorder = APIClient(base_url=local_base_url, retries=0, metrics=None,
+                         cassette=Cassette(path, mode="record"))
+    assert recorder.get("/get").status_code == 200
+
+    # 和 AUTOFW_CASSETTE=replay 时 conftest 的 client -> network_client 一样的构造过程
+    replay_client = make_network_client(APIClient(
+        base_url=local_base_url, transport=transport, metrics=None, cassette=Cassette(path, mode="replay"),
+    ))
+    assert replay_client.retries >= 3
+    for prefix in ("http://", "https://"):
+        assert isinstance(replay_client.session.get_adapter(prefix), CassetteAdapter)
+
+    def no_network(*args, **kwargs):
+        raise AssertionError("replay mode must not open a real connection")
+
+    monkeypatch.setattr(socket.socket, "connect", no_network)
+    monkeypatch.setattr(socket, "create_connection", no_network)
+
+    resp = replay_client.get("/get")
+    assert resp.status_code == 200 and getattr(resp, "replayed", False)
+    with pytest.raises(CassetteMissError):
+        replay_client.get("/not-recorded")
+    assert replay_client.connection_stats().get("connections_opened", 0) == 0